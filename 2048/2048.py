@@ -3,11 +3,20 @@ environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
 import argparse
 import json
 import os
+import statistics
 import sys
 import time
+from functools import lru_cache
 import pygame
 import random
 
+# text_cache lives at the repository root, shared with the other games.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+import text_cache  # noqa: E402
+
 # Window size
 WINDOW_WIDTH = 400
 WINDOW_HEIGHT = 560
@@ -67,8 +76,58 @@ def save_progress(highest_milestone):
         pass
 
 
+@lru_cache(maxsize=1 << 16)
+def _slide_row(row):
+    """Slide one row (a tuple) left; returns ``(new_row, score_added)``."""
+    tiles = [v for v in row if v]
+    merged = []
+    score = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+            merged.append(tiles[i] * 2)
+            score += tiles[i] * 2
+            i += 2
+        else:
+            merged.append(tiles[i])
+            i += 1
+    return tuple(merged + [0] * (len(row) - len(merged))), score
+
+
+def simulate_move(grid, direction):
+    """Play ``direction`` on ``grid`` without touching it.
+
+    Returns ``(new_grid, score_added, moved)``; ``new_grid`` is a fresh list
+    of lists even when nothing moved.
+    """
+    if direction in ('UP', 'DOWN'):
+        lines = list(zip(*grid))
+    else:
+        lines = [tuple(row) for row in grid]
+    reverse = direction in ('RIGHT', 'DOWN')
+    score = 0
+    out = []
+    for line in lines:
+        if reverse:
+            slid, gained = _slide_row(line[::-1])
+            slid = slid[::-1]
+        else:
+            slid, gained = _slide_row(line)
+        out.append(slid)
+        score += gained
+    if direction in ('UP', 'DOWN'):
+        out = list(zip(*out))
+    new_grid = [list(row) for row in out]
+    return new_grid, score, new_grid != grid
+
+
 class Game:
-    def __init__(self):
+    def __init__(self, seed=None, headless=False):
+        # Spawns come from this game's own generator; --seed replays a game.
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        # Headless games print nothing and leave the saved personal best alone.
+        self.headless = headless
         self.grid = [[0 for _ in range(GAME_SIZE)] for _ in range(GAME_SIZE)]
         self.score = 0
         self.total_moves = 0  # Add moves counter
@@ -82,7 +141,7 @@ class Game:
         # Newly-unlocked milestone announcement (value, expires_at_ms).
         self.milestone_announce = None
         # Personal best across runs, loaded from disk.
-        self.personal_best = load_saved_progress()
+        self.personal_best = 0 if headless else load_saved_progress()
         # T-000114: monotonic timestamp at game start for milestone print
         self.start_time = time.monotonic()
         self.add_new_tile()
@@ -91,8 +150,9 @@ class Game:
     def add_new_tile(self):
         empty_cells = [(i, j) for i in range(GAME_SIZE) for j in range(GAME_SIZE) if self.grid[i][j] == 0]
         if empty_cells:
-            i, j = random.choice(empty_cells)
-            self.grid[i][j] = 2 if random.random() < 0.9 else 4
+            # Two draws per spawn, cell then tile, like game_2048.packed.draw_spawn.
+            i, j = empty_cells[int(self.rng.random() * len(empty_cells))]
+            self.grid[i][j] = 2 if self.rng.random() < 0.9 else 4
 
     def update_highest_tile(self):
         current_max = max(max(row) for row in self.grid)
@@ -104,11 +164,13 @@ class Game:
                 if current_max >= milestone and not self.milestones[milestone]:
                     self.milestones[milestone] = True
                     newly_unlocked.append(milestone)
+                    if self.headless:
+                        continue
                     print(f"Achievement Unlocked: {milestone}!")
                     # T-000114: terminal print with monotonic elapsed-from-start
                     elapsed = time.monotonic() - self.start_time
                     print(f"[2048] Milestone {milestone} reached in {elapsed:.2f}s", flush=True)
-            if newly_unlocked:
+            if newly_unlocked and not self.headless:
                 top = max(newly_unlocked)
                 # Current "level" tracks the highest milestone unlocked this run.
                 if top > self.current_level:
@@ -124,26 +186,9 @@ class Game:
                     save_progress(self.personal_best)
 
     def move(self, direction):
-        original_grid = [row[:] for row in self.grid]
-        moved = False
-
-        if direction in ['UP', 'DOWN']:
-            self.transpose()
-        if direction in ['RIGHT', 'DOWN']:
-            self.reverse()
-
-        self.compress()
-        score_added = self.merge()
-        self.compress()
-
-        if direction in ['RIGHT', 'DOWN']:
-            self.reverse()
-        if direction in ['UP', 'DOWN']:
-            self.transpose()
-
-        # Check if the grid changed
-        if original_grid != self.grid:
-            moved = True
+        new_grid, score_added, moved = simulate_move(self.grid, direction)
+        if moved:
+            self.grid = new_grid
             self.score += score_added
             self.total_moves += 1  # Increment moves counter
             self.add_new_tile()
@@ -152,32 +197,6 @@ class Game:
 
         return moved
 
-    def compress(self):
-        new_grid = [[0 for _ in range(GAME_SIZE)] for _ in range(GAME_SIZE)]
-        for i in range(GAME_SIZE):
-            pos = 0
-            for j in range(GAME_SIZE):
-                if self.grid[i][j] != 0:
-                    new_grid[i][pos] = self.grid[i][j]
-                    pos += 1
-        self.grid = new_grid
-
-    def merge(self):
-        score_added = 0
-        for i in range(GAME_SIZE):
-            for j in range(GAME_SIZE - 1):
-                if self.grid[i][j] != 0 and self.grid[i][j] == self.grid[i][j + 1]:
-                    self.grid[i][j] *= 2
-                    score_added += self.grid[i][j]
-                    self.grid[i][j + 1] = 0
-        return score_added
-
-    def reverse(self):
-        self.grid = [row[::-1] for row in self.grid]
-
-    def transpose(self):
-        self.grid = [[self.grid[j][i] for j in range(GAME_SIZE)] for i in range(GAME_SIZE)]
-
     def is_game_over(self):
         # Check for empty cells
         if any(0 in row for row in self.grid):
@@ -205,16 +224,14 @@ def draw_text(window, text, font_size, x, y, color):
     if len(str(text)) > 5:
         font_size = int(font_size * 0.7)
 
-    font = pygame.font.SysFont('Arial', font_size, bold=True)
-    text_surface = font.render(str(text), True, color)
+    text_surface = text_cache.render_text(text, font_size, color, face='Arial', bold=True)
     text_rect = text_surface.get_rect(center=(x, y))
     window.blit(text_surface, text_rect)
 
 
 def draw_text_left(window, text, font_size, x, y, color):
     """Render text with its left edge anchored at (x, y) (vertical center)."""
-    font = pygame.font.SysFont('Arial', font_size, bold=True)
-    text_surface = font.render(str(text), True, color)
+    text_surface = text_cache.render_text(text, font_size, color, face='Arial', bold=True)
     rect = text_surface.get_rect(midleft=(x, y))
     window.blit(text_surface, rect)
 
@@ -244,14 +261,12 @@ def draw_levels_panel(window, game, top_y):
         glyph = "v" if unlocked else "-"
         text_color = TEXT_DARK if (unlocked and m <= 4) else TEXT_LIGHT
         # Tile label
-        label_font = pygame.font.SysFont('Arial', 12, bold=True)
-        label_surf = label_font.render(str(m), True, text_color)
+        label_surf = text_cache.render_text(m, 12, text_color, face='Arial', bold=True)
         window.blit(label_surf,
                     label_surf.get_rect(center=(cx + (chip_w - 4) // 2,
                                                 chip_y + chip_h // 2 - 6)))
         # Status glyph
-        glyph_font = pygame.font.SysFont('Arial', 12, bold=True)
-        glyph_surf = glyph_font.render(glyph, True, text_color)
+        glyph_surf = text_cache.render_text(glyph, 12, text_color, face='Arial', bold=True)
         window.blit(glyph_surf,
                     glyph_surf.get_rect(center=(cx + (chip_w - 4) // 2,
                                                 chip_y + chip_h // 2 + 8)))
@@ -260,32 +275,57 @@ def _autoplay_pick_move(game):
     """Tiny heuristic move picker for --autoplay mode.
 
     Tries DOWN/LEFT/RIGHT/UP in that order and returns the first direction
-    that actually changes the board (computed via a cheap dry run). Falls
-    back to None if no direction changes anything (game over).
+    that actually changes the board (a dry run with simulate_move; the game
+    is never touched). Falls back to None if no direction changes anything
+    (game over).
     """
     for direction in ('DOWN', 'LEFT', 'RIGHT', 'UP'):
-        # Cheap dry run: copy grid, simulate compress+merge+compress in that
-        # direction, compare to original.
-        original = [row[:] for row in game.grid]
-        if direction in ('UP', 'DOWN'):
-            game.transpose()
-        if direction in ('RIGHT', 'DOWN'):
-            game.reverse()
-        game.compress()
-        game.merge()
-        game.compress()
-        if direction in ('RIGHT', 'DOWN'):
-            game.reverse()
-        if direction in ('UP', 'DOWN'):
-            game.transpose()
-        changed = original != game.grid
-        # Restore
-        game.grid = original
-        if changed:
+        if simulate_move(game.grid, direction)[2]:
             return direction
     return None
 
 
+def run_headless(games, seed=None):
+    """Play ``games`` autoplay rounds with no window, as fast as possible.
+
+    Round ``i`` uses seed ``seed + i`` when a seed is given, so a soak run
+    can be repeated exactly. Returns the outcome stats that get printed.
+    """
+    if seed is None:
+        seed = random.getrandbits(32)
+    scores = []
+    moves = []
+    max_tiles = {}
+    wins = 0
+    start = time.monotonic()
+    for i in range(games):
+        game = Game(seed + i, headless=True)
+        while not game.has_won():
+            direction = _autoplay_pick_move(game)
+            if direction is None:
+                break
+            game.move(direction)
+        wins += game.has_won()
+        scores.append(game.score)
+        moves.append(game.total_moves)
+        max_tiles[game.max_tile] = max_tiles.get(game.max_tile, 0) + 1
+    elapsed = time.monotonic() - start
+    return {
+        "games": games,
+        "first_seed": seed,
+        "wins": wins,
+        "losses": games - wins,
+        "mean_score": statistics.mean(scores) if scores else 0,
+        "median_score": statistics.median(scores) if scores else 0,
+        "best_score": max(scores, default=0),
+        "mean_moves": statistics.mean(moves) if moves else 0,
+        "max_tiles": {str(tile): max_tiles[tile] for tile in sorted(max_tiles)},
+        "seconds": round(elapsed, 3),
+        "games_per_min": round(games / elapsed * 60) if elapsed else None,
+        "moves_per_s": round(sum(moves) / elapsed) if elapsed else None,
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(description="2048 Extended")
     parser.add_argument(
@@ -295,15 +335,40 @@ def main():
         help="Run a built-in heuristic that picks moves until game over, "
              "then loops forever (ESC quits).",
     )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed the first game's spawns; later games in --autoplay use "
+             "seed+1, seed+2, ...",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        default=False,
+        help="Autoplay with no window at full speed, then print outcome stats "
+             "as JSON. Use with --games.",
+    )
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=100,
+        help="Rounds to play with --headless (default: 100).",
+    )
     args = parser.parse_args()
     autoplay = args.autoplay
+    seed = args.seed
+
+    if args.headless:
+        print(json.dumps(run_headless(args.games, seed), indent=2))
+        return
 
     pygame.init()
     window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption('2048 Extended')
     clock = pygame.time.Clock()
 
-    game = Game()
+    game = Game(seed)
     game_won = False
     # T-000117: monotonic round start so we can print outcome timing.
     round_start_time = time.monotonic()
@@ -428,7 +493,7 @@ def main():
         if autoplay and (game.is_game_over() or game.has_won()):
             outcome = "WIN" if game.has_won() else "LOSS"
             elapsed = time.monotonic() - round_start_time
-            print(f"[2048] {outcome} in {elapsed:.2f}s", flush=True)
+            print(f"[2048] {outcome} in {elapsed:.2f}s (seed {game.seed})", flush=True)
             restart_deadline = pygame.time.get_ticks() + 1000
             while pygame.time.get_ticks() < restart_deadline:
                 for event in pygame.event.get():
@@ -438,7 +503,9 @@ def main():
                         pygame.quit()
                         sys.exit(0)
                 clock.tick(60)
-            game = Game()
+            if seed is not None:
+                seed += 1
+            game = Game(seed)
             game_won = False
             round_start_time = time.monotonic()
             next_autoplay_move_ms = pygame.time.get_ticks()
@@ -1,65 +1,42 @@
-import requests
+import argparse
 import random
 import os
 import time
+from game_2048.client import Game2048Client as PooledGame2048Client
+from game_2048.recording import add_recording_arguments, recorder_from_args
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-class Game2048Client:
-    def __init__(self, server_url="http://127.0.0.1:5000"):
-        self.server_url = server_url
-        self.game_id = None
-        self.screenshot_count = 0
-        self.screenshot_folder = os.path.join(SCRIPT_DIR, "screenshots")
-
-        # Create the screenshots directory if it doesn't exist
-        os.makedirs(self.screenshot_folder, exist_ok=True)
+class Game2048Client(PooledGame2048Client):
+    def __init__(self, server_url="http://127.0.0.1:5000", recorder=None):
+        super().__init__(server_url, recorder=recorder)
 
     def start_game(self):
-        response = requests.post(f"{self.server_url}/start")
-        if response.status_code == 201:
-            data = response.json()
-            self.game_id = data["game_id"]
+        data = super().start_game()
+        if data is not None:
             print("New game started!")
             print("Game ID:", self.game_id)
             print("Initial State:")
             self.print_grid(data["state"])
         else:
             print("Failed to start a new game.")
-            print(response.json())
 
     def make_move(self, direction):
-        if self.game_id is None:
-            print("Please start a game first.")
-            return None
-        response = requests.post(
-            f"{self.server_url}/move",
-            params={"game_id": self.game_id},
-            json={"direction": direction},
-        )
-        if response.status_code == 200:
-            data = response.json()
+        data = super().make_move(direction)
+        if data is not None:
             print(f"Move: {direction}")
             self.print_grid(data["state"])
             print("Score:", data["score"])
             print("Status:", data["status"])
-            self.capture_screenshot()  # Capture screenshot after each move
             return data
         else:
             print("Failed to make a move.")
-            print(response.json())
             return None
 
-    def get_state(self):
-        if self.game_id is None:
-            print("Please start a game first.")
-            return None
-        response = requests.get(
-            f"{self.server_url}/state",
-            params={"game_id": self.game_id},
-        )
-        if response.status_code == 200:
-            data = response.json()
+    def get_state(self, refresh=False):
+        # The last /move response already carries the state; no round trip needed.
+        data = super().get_state(refresh)
+        if data is not None:
             print("Current Game State:")
             self.print_grid(data["state"])
             print("Score:", data["score"])
@@ -67,26 +44,8 @@ class Game2048Client:
             return data
         else:
             print("Failed to retrieve the game state.")
-            print(response.json())
             return None
 
-    def capture_screenshot(self):
-        """Fetches the screenshot from the server and saves it locally with an incremental filename."""
-        if self.game_id is None:
-            print("Please start a game first.")
-            return
-
-        response = requests.get(f"{self.server_url}/screenshot")
-        if response.status_code == 200:
-            screenshot_path = os.path.join(self.screenshot_folder, f"{self.game_id}_{self.screenshot_count}.png")
-            with open(screenshot_path, "wb") as f:
-                f.write(response.content)
-            print(f"Screenshot saved: {screenshot_path}")
-            self.screenshot_count += 1
-        else:
-            print("Failed to capture screenshot.")
-            print(response.json())
-
     def print_grid(self, grid):
         for row in grid:
             print("\t".join(str(cell) if cell != 0 else "." for cell in row))
@@ -94,7 +53,10 @@ class Game2048Client:
 
 # Example usage
 if __name__ == "__main__":
-    client = Game2048Client()
+    parser = argparse.ArgumentParser(description="Play random moves against the 2048 server")
+    add_recording_arguments(parser)
+    args = parser.parse_args()
+    client = Game2048Client(recorder=recorder_from_args(args, os.path.join(SCRIPT_DIR, "screenshots")))
     client.start_game()
 
     # Create a list of moves
@@ -128,3 +90,5 @@ if __name__ == "__main__":
         # sleep for a while to see the game
         
         time.sleep(0.5)
+
+    client.close()
@@ -1,11 +1,24 @@
 from os import environ
 environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
+import argparse
+import os
+import sys
 import pygame
 import random
 from flask import Flask, jsonify, request, send_file
 import uuid
 import threading
 import io
+from game_2048.api import apply_moves, parse_directions
+from game_2048.packed import draw_spawn
+from game_2048.sessions import SessionRegistry
+
+# text_cache lives at the repository root, shared with the other games.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+import text_cache  # noqa: E402
 
 # Pygame Window setup
 WINDOW_WIDTH = 400
@@ -39,11 +52,15 @@ app = Flask(__name__)
 
 # Game class
 class Game:
-    def __init__(self):
+    def __init__(self, seed=None):
+        # Spawns come from this game's own generator; a seed replays them.
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
         self.grid = [[0 for _ in range(GAME_SIZE)] for _ in range(GAME_SIZE)]
         self.score = 0
         self.total_moves = 0  # Initialize total moves counter
         self.game_id = str(uuid.uuid4())
+        self.last_spawn = None
         self.add_new_tile()
         self.add_new_tile()
         self.game_won = False
@@ -63,8 +80,9 @@ class Game:
     def add_new_tile(self):
         empty_cells = [(i, j) for i in range(GAME_SIZE) for j in range(GAME_SIZE) if self.grid[i][j] == 0]
         if empty_cells:
-            i, j = random.choice(empty_cells)
-            self.grid[i][j] = 2 if random.random() < 0.9 else 4
+            (i, j), tile = draw_spawn(self.rng, empty_cells)
+            self.grid[i][j] = tile
+            self.last_spawn = (i, j, self.grid[i][j])
 
     def move(self, direction):
         original_grid = [row[:] for row in self.grid]
@@ -146,59 +164,93 @@ class Game:
         return max(max(row) for row in self.grid)
 
 # API Endpoints
-game_instance = Game()
+# One game per game_id; replaced in main() once the CLI limits are known.
+sessions = SessionRegistry(Game)
+sessions.create()
+
+def display_game():
+    """The game shown in the window: the most recently started session."""
+    session = sessions.latest()
+    return session.game if session else None
+
+def request_session():
+    game_id = request.args.get("game_id")
+    if game_id is None:
+        payload = request.get_json(silent=True) or {}
+        game_id = payload.get("game_id")
+    return sessions.get(game_id)
+
+def game_state(game):
+    status = "won" if game.game_won else "over" if game.game_over else "ongoing"
+    return {
+        "game_id": game.game_id,
+        "state": game.grid,
+        "score": game.score,
+        "total_moves": game.total_moves,  # Include total moves in response
+        "seed": game.seed,
+        "status": status
+    }
 
 @app.route('/start', methods=['POST'])
 def start_game():
-    global game_instance
-    game_instance = Game()
-    return jsonify({"game_id": game_instance.game_id, "state": game_instance.grid, "score": game_instance.score, "total_moves": game_instance.total_moves, "status": "ongoing"}), 201
+    seed = (request.get_json(silent=True) or {}).get("seed")
+    try:
+        session = sessions.create(None if seed is None else int(seed))
+    except (TypeError, ValueError):
+        return jsonify({"error": "seed must be an integer"}), 400
+    return jsonify(game_state(session.game)), 201
 
 @app.route('/move', methods=['POST'])
 def make_move():
-    game_id = request.args.get("game_id")
-    if game_id is not None and game_id != game_instance.game_id:
+    session = request_session()
+    if session is None:
         return jsonify({"error": "Unknown game_id"}), 404
 
-    direction = request.json.get("direction")
+    direction = (request.get_json(silent=True) or {}).get("direction")
     if direction not in ["UP", "DOWN", "LEFT", "RIGHT"]:
         return jsonify({"error": "Invalid move direction"}), 400
 
-    moved = game_instance.move(direction)
-    status = "won" if game_instance.game_won else "over" if game_instance.game_over else "ongoing"
+    with session.lock:
+        moved = session.game.move(direction)
+        state = game_state(session.game)
+    return jsonify({**state, "moved": moved})
+
+@app.route('/moves', methods=['POST'])
+def make_moves():
+    """Apply a list of directions in one round trip; see api.apply_moves."""
+    session = request_session()
+    if session is None:
+        return jsonify({"error": "Unknown game_id"}), 404
 
-    return jsonify({
-        "game_id": game_instance.game_id,
-        "state": game_instance.grid,
-        "score": game_instance.score,
-        "total_moves": game_instance.total_moves,  # Include total moves in response
-        "status": status,
-        "moved": moved
-    })
+    directions, error = parse_directions(request.get_json(silent=True) or {})
+    if error:
+        return jsonify({"error": error}), 400
+
+    with session.lock:
+        result = apply_moves(session.game, directions)
+        state = game_state(session.game)
+    return jsonify({**state, **result})
 
 @app.route('/state', methods=['GET'])
 def get_state():
-    game_id = request.args.get("game_id")
-    if game_id is not None and game_id != game_instance.game_id:
+    session = request_session()
+    if session is None:
         return jsonify({"error": "Unknown game_id"}), 404
 
-    status = "won" if game_instance.game_won else "over" if game_instance.game_over else "ongoing"
-    return jsonify({
-        "game_id": game_instance.game_id,
-        "state": game_instance.grid,
-        "score": game_instance.score,
-        "total_moves": game_instance.total_moves,  # Include total moves in response
-        "status": status
-    })
+    with session.lock:
+        return jsonify(game_state(session.game))
 
 @app.route('/screenshot', methods=['GET'])
 def screenshot():
-    """Capture the game screen and return it as a PNG image."""
-    if not pygame.display.get_surface():
-        return jsonify({"error": "Game window not initialized"}), 500
+    """Render the requested game and return it as a PNG image."""
+    session = request_session()
+    if session is None:
+        return jsonify({"error": "Unknown game_id"}), 404
 
-    # Capture the screen to a byte stream
-    screenshot_image = pygame.display.get_surface()
+    # Draw into a private surface so the window keeps showing its own game
+    screenshot_image = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    with session.lock:
+        draw_game(screenshot_image, session.game)
     img_bytes = io.BytesIO()
     pygame.image.save(screenshot_image, img_bytes, "PNG")  # Explicitly save as PNG
     img_bytes.seek(0)  # Reset stream pointer to the start
@@ -217,8 +269,7 @@ def draw_text(window, text, font_size, x, y, color):
     if len(str(text)) > 5:
         font_size = int(font_size * 0.7)
     
-    font = pygame.font.SysFont('Arial', font_size, bold=True)
-    text_surface = font.render(str(text), True, color)
+    text_surface = text_cache.render_text(text, font_size, color, face='Arial', bold=True)
     text_rect = text_surface.get_rect(center=(x, y))
     window.blit(text_surface, text_rect)
 
@@ -228,7 +279,76 @@ def reset_screen(window, game_id):
     draw_text(window, f"Game ID: {game_id}", 36, WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2, TEXT_DARK)
     pygame.display.update()
 
+def draw_game(surface, game):
+    """Draw ``game`` onto ``surface`` (the window or an off-screen Surface)."""
+    # Draw background
+    surface.fill(BACKGROUND)
+    pygame.draw.rect(surface, EMPTY_CELL, (10, 10, WINDOW_WIDTH - 20, 60), border_radius=5)
+
+    # Display score and total moves at the top
+    draw_text(surface, f"Score: {game.score} | Moves: {game.total_moves} | Max: {game.max_tile}", 24, WINDOW_WIDTH // 2, 40, TEXT_DARK)
+
+    # Draw grid
+    for i in range(GAME_SIZE):
+        for j in range(GAME_SIZE):
+            x = j * (WINDOW_WIDTH // GAME_SIZE)
+            y = i * (WINDOW_WIDTH // GAME_SIZE) + 100
+            value = game.grid[i][j]
+            pygame.draw.rect(surface, TILE_COLORS.get(value, EMPTY_CELL), (x + 5, y + 5, WINDOW_WIDTH // GAME_SIZE - 10, WINDOW_WIDTH // GAME_SIZE - 10), border_radius=5)
+            if value != 0:
+                # Dynamic font sizing based on number length
+                if value <= 4:
+                    font_size = 48
+                elif value <= 512:
+                    font_size = 36
+                elif value <= 16384:
+                    font_size = 24
+                else:
+                    font_size = 20
+
+                text_color = TEXT_DARK if value <= 4 else TEXT_LIGHT
+                draw_text(surface, value, font_size, x + WINDOW_WIDTH // GAME_SIZE // 2, y + WINDOW_WIDTH // GAME_SIZE // 2, text_color)
+
+    if game.game_over:
+        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        overlay.fill((0, 0, 0))
+        overlay.set_alpha(128)
+        surface.blit(overlay, (0, 0))
+        draw_text(surface, f"Game Over! Max: {game.max_tile}", 64, WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2, TEXT_LIGHT)
+    elif game.game_won:
+        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        overlay.fill((255, 223, 0))
+        overlay.set_alpha(128)
+        surface.blit(overlay, (0, 0))
+        draw_text(surface, "65536 Achieved!", 64, WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2, TEXT_DARK)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="2048 Extended solver server")
+    parser.add_argument(
+        "--max-sessions", type=int, default=64,
+        help="Maximum concurrent games before the least recently used is evicted.",
+    )
+    parser.add_argument(
+        "--session-ttl", type=float, default=3600.0,
+        help="Seconds a game may sit idle before it is evicted.",
+    )
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="Open no window; /screenshot renders the requested game off-screen.",
+    )
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args()
+    sessions.max_sessions = args.max_sessions
+    sessions.ttl_seconds = args.session_ttl
+
+    if args.headless:
+        # No display and no redraw loop: fonts are all /screenshot needs.
+        pygame.font.init()
+        run_flask()
+        return
+
     pygame.init()
     window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption('2048 Extended')
@@ -237,7 +357,7 @@ def main():
     threading.Thread(target=run_flask).start()
 
     # Display initial game reset screen
-    reset_screen(window, game_instance.game_id)
+    reset_screen(window, display_game().game_id)
     # Non-blocking wait so the window stays responsive
     _reset_deadline = pygame.time.get_ticks() + 1000
     while pygame.time.get_ticks() < _reset_deadline:
@@ -247,67 +367,36 @@ def main():
                 return
         clock.tick(30)
 
+    shown = None
     while True:
+        session = sessions.latest()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 return
-            elif event.type == pygame.KEYDOWN and not game_instance.game_over:
-                moved = False
-                if event.key == pygame.K_UP:
-                    moved = game_instance.move('UP')
-                elif event.key == pygame.K_DOWN:
-                    moved = game_instance.move('DOWN')
-                elif event.key == pygame.K_LEFT:
-                    moved = game_instance.move('LEFT')
-                elif event.key == pygame.K_RIGHT:
-                    moved = game_instance.move('RIGHT')
-                
-                if moved:
-                    pygame.display.set_caption(f'2048 - Max Tile: {game_instance.max_tile}')
+            elif event.type == pygame.VIDEOEXPOSE:
+                shown = None
+            elif event.type == pygame.KEYDOWN and session and not session.game.game_over:
+                direction = {
+                    pygame.K_UP: 'UP',
+                    pygame.K_DOWN: 'DOWN',
+                    pygame.K_LEFT: 'LEFT',
+                    pygame.K_RIGHT: 'RIGHT',
+                }.get(event.key)
+                if direction is None:
+                    continue
+                with session.lock:
+                    moved = session.game.move(direction)
 
-        # Draw background
-        window.fill(BACKGROUND)
-        pygame.draw.rect(window, EMPTY_CELL, (10, 10, WINDOW_WIDTH - 20, 60), border_radius=5)
-
-        # Display score and total moves at the top
-        draw_text(window, f"Score: {game_instance.score} | Moves: {game_instance.total_moves} | Max: {game_instance.max_tile}", 24, WINDOW_WIDTH // 2, 40, TEXT_DARK)
-
-        # Draw grid
-        for i in range(GAME_SIZE):
-            for j in range(GAME_SIZE):
-                x = j * (WINDOW_WIDTH // GAME_SIZE)
-                y = i * (WINDOW_WIDTH // GAME_SIZE) + 100
-                value = game_instance.grid[i][j]
-                pygame.draw.rect(window, TILE_COLORS.get(value, EMPTY_CELL), (x + 5, y + 5, WINDOW_WIDTH // GAME_SIZE - 10, WINDOW_WIDTH // GAME_SIZE - 10), border_radius=5)
-                if value != 0:
-                    # Dynamic font sizing based on number length
-                    if value <= 4:
-                        font_size = 48
-                    elif value <= 512:
-                        font_size = 36
-                    elif value <= 16384:
-                        font_size = 24
-                    else:
-                        font_size = 20
-                    
-                    text_color = TEXT_DARK if value <= 4 else TEXT_LIGHT
-                    draw_text(window, value, font_size, x + WINDOW_WIDTH // GAME_SIZE // 2, y + WINDOW_WIDTH // GAME_SIZE // 2, text_color)
-
-        if game_instance.game_over:
-            overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-            overlay.fill((0, 0, 0))
-            overlay.set_alpha(128)
-            window.blit(overlay, (0, 0))
-            draw_text(window, f"Game Over! Max: {game_instance.max_tile}", 64, WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2, TEXT_LIGHT)
-        elif game_instance.game_won:
-            overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-            overlay.fill((255, 223, 0))
-            overlay.set_alpha(128)
-            window.blit(overlay, (0, 0))
-            draw_text(window, "65536 Achieved!", 64, WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2, TEXT_DARK)
-
-        pygame.display.update()
+                if moved:
+                    pygame.display.set_caption(f'2048 - Max Tile: {session.game.max_tile}')
+
+        # Redraw only when the displayed game changes, not every frame
+        frame = (session.game.game_id, session.game.total_moves) if session else None
+        if session is not None and frame != shown:
+            draw_game(window, session.game)
+            pygame.display.update()
+            shown = frame
         clock.tick(60)
 
 if __name__ == "__main__":
@@ -0,0 +1,50 @@
+"""Request helpers shared by the 2048 HTTP servers."""
+from typing import Dict, List, Optional, Tuple
+
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+
+# Upper bound on one POST /moves batch so a single request cannot hold a
+# session lock indefinitely.
+MAX_BATCH_MOVES = 1024
+
+
+def parse_directions(payload: Dict) -> Tuple[Optional[List[str]], Optional[str]]:
+    """Validate a ``POST /moves`` body; returns ``(directions, error)``."""
+    directions = payload.get("directions")
+    if not isinstance(directions, list) or not directions:
+        return None, "Expected a non-empty 'directions' list"
+    if len(directions) > MAX_BATCH_MOVES:
+        return None, f"At most {MAX_BATCH_MOVES} directions per request"
+    for direction in directions:
+        if direction not in DIRECTIONS:
+            return None, f"Invalid move direction: {direction}"
+    return directions, None
+
+
+def apply_moves(game, directions: List[str]) -> Dict:
+    """Play ``directions`` in order on ``game``.
+
+    Stops at the first move that does not change the board, or before a
+    move once the game is over or won. Returns one step per applied move
+    (direction, score gained, running score and the spawned tile as
+    ``[row, col, value]``) plus ``stop_reason``: ``None`` if every move was applied, otherwise
+    ``"illegal_move"``, ``"over"`` or ``"won"``.
+    """
+    steps = []
+    stop_reason = None
+    for direction in directions:
+        if game.game_over or game.game_won:
+            stop_reason = "won" if game.game_won else "over"
+            break
+        score_before = game.score
+        if not game.move(direction):
+            stop_reason = "illegal_move"
+            break
+        spawn = game.last_spawn
+        steps.append({
+            "direction": direction,
+            "score_gained": game.score - score_before,
+            "score": game.score,
+            "spawn": list(spawn) if spawn else None,
+        })
+    return {"applied": len(steps), "steps": steps, "stop_reason": stop_reason}
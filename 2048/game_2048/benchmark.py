@@ -0,0 +1,375 @@
+"""Throughput and strength benchmarks for the 2048 engines and solvers.
+
+``engines`` plays random moves on each board size for a fixed time and
+reports moves per second. Every engine uses the same policy: try the
+directions in a random order and play the first one that changes the board.
+
+* ``packed``: the NxN engine in :mod:`game_2048.packed`, any size;
+* ``bitboard``: the 4x4 engine in :mod:`game_2048.bitboard`;
+* ``game``: :class:`~game_2048.game.Game2048`, with its list grid, spawns
+  and milestone tracking.
+
+``solvers`` runs each solver, named by a ``"module:Class"`` spec as in
+:mod:`game_2048.selfplay`, in a fresh process. Each solver gets:
+
+* a fixed corpus of seeded positions, timing every move;
+* a set of seeded full games, the same seeds for every solver.
+
+It reports search nodes per second, p50/p95/p99 move latency, the
+process's peak RSS and how often the games reached 2048, 4096 and 8192.
+The results are JSON, so runs can be diffed across commits.
+
+Solvers count nodes differently. Each result's ``node_source`` says which
+count was used:
+
+* ``nodes``: the solver's own ``nodes`` counter;
+* ``last_playouts``: Monte Carlo playouts per move;
+* a method name: calls to that search method;
+* ``null``: nothing to count.
+
+Run from the ``2048`` directory::
+
+    python -m game_2048.benchmark engines --sizes 3 4 5 6 7 8 --seconds 2
+    python -m game_2048.benchmark solvers 2048_solver_nxn:NxNExpectimaxSolver \\
+        2048-solver-claude:Advanced2048Solver --positions 50 --games 5 --output bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from game_2048 import bitboard, packed
+from game_2048.constants import GAME_SIZE, MAX_SIZE, MIN_SIZE
+from game_2048.game import Game2048
+from game_2048.selfplay import GameEngine, load_solver_class
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ENGINE_NAMES = ("packed", "bitboard", "game")
+
+
+def _play_packed(size: int, rng: random.Random, deadline: float):
+    moves = games = 0
+    directions = list(packed.DIRECTIONS)
+    while time.perf_counter() < deadline:
+        board = packed.add_random_tile(bytes(size * size), rng)
+        board = packed.add_random_tile(board, rng)
+        while time.perf_counter() < deadline:
+            rng.shuffle(directions)
+            for direction in directions:
+                new_board, _ = packed.move(board, direction)
+                if new_board != board:
+                    board = packed.add_random_tile(new_board, rng)
+                    moves += 1
+                    break
+            else:
+                games += 1
+                break
+    return moves, games
+
+
+def _play_bitboard(size: int, rng: random.Random, deadline: float):
+    moves = games = 0
+    directions = list(packed.DIRECTIONS)
+    while time.perf_counter() < deadline:
+        board = bitboard.add_random_tile(bitboard.add_random_tile(0, rng), rng)
+        while time.perf_counter() < deadline:
+            rng.shuffle(directions)
+            for direction in directions:
+                new_board, _ = bitboard.move(board, direction)
+                if new_board != board:
+                    board = bitboard.add_random_tile(new_board, rng)
+                    moves += 1
+                    break
+            else:
+                games += 1
+                break
+    return moves, games
+
+
+def _play_game(size: int, rng: random.Random, deadline: float):
+    moves = games = 0
+    directions = list(packed.DIRECTIONS)
+    while time.perf_counter() < deadline:
+        game = Game2048(size, seed=rng.getrandbits(32))
+        while time.perf_counter() < deadline:
+            if game.is_game_over():
+                games += 1
+                break
+            rng.shuffle(directions)
+            for direction in directions:
+                if game.move(direction):
+                    moves += 1
+                    break
+    return moves, games
+
+
+_PLAYERS = {
+    "packed": _play_packed,
+    "bitboard": _play_bitboard,
+    "game": _play_game,
+}
+
+
+def engine_throughput(engine: str, size: int, seconds: float = 1.0, seed: int = 0) -> Dict:
+    """Random play on ``engine`` for ``seconds``.
+
+    ``games`` counts only the games that ended in time. On big boards a
+    random game can outlast the whole run.
+    """
+    if engine == "bitboard" and size != 4:
+        raise ValueError("The bitboard engine only plays 4x4")
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    moves, games = _PLAYERS[engine](size, rng, start + seconds)
+    elapsed = time.perf_counter() - start
+    return {
+        "engine": engine,
+        "size": size,
+        "games": games,
+        "moves": moves,
+        "seconds": round(elapsed, 3),
+        "moves_per_s": round(moves / elapsed),
+    }
+
+
+def run_engines(sizes: List[int], engines: List[str], seconds: float, seed: int) -> List[Dict]:
+    results = []
+    for size in sizes:
+        for engine in engines:
+            if engine == "bitboard" and size != 4:
+                continue
+            results.append(engine_throughput(engine, size, seconds, seed))
+    return results
+
+
+REACH_TILES = (2048, 4096, 8192)
+
+# Recursive search methods counted as nodes, for solvers with no counter.
+NODE_METHODS = ("_expectimax_node", "expectimax", "_iterate")
+
+
+def percentile(values: Sequence[float], p: float) -> Optional[float]:
+    """The ``p``-th percentile of ``values``, interpolating between ranks."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def position_corpus(count: int, seed: int = 0, size: int = GAME_SIZE) -> List[List[List[int]]]:
+    """``count`` seeded positions taken from random-play games, never terminal ones.
+
+    Position ``i`` depends only on ``seed + i``, so a bigger corpus extends
+    a smaller one.
+    """
+    corpus = []
+    for i in range(count):
+        rng = random.Random(seed + i)
+        game = Game2048(size, seed=seed + i)
+        grids = []
+        directions = list(packed.DIRECTIONS)
+        while not game.is_game_over():
+            grids.append([row[:] for row in game.grid])
+            rng.shuffle(directions)
+            for direction in directions:
+                if game.move(direction):
+                    break
+        corpus.append(grids[rng.randrange(len(grids))])
+    return corpus
+
+
+class NodeCounter:
+    """Counts a solver's search nodes across :meth:`get_best_move` calls."""
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.calls = 0
+        if isinstance(getattr(solver, "nodes", None), int):
+            self.source = "nodes"
+        elif isinstance(getattr(solver, "last_playouts", None), int):
+            self.source = "last_playouts"
+        else:
+            self.source = next((m for m in NODE_METHODS if callable(getattr(solver, m, None))), None)
+            if self.source is not None:
+                # An instance attribute shadows the method, recursive calls included.
+                method = getattr(solver, self.source)
+
+                def counted(*args, **kwargs):
+                    self.calls += 1
+                    return method(*args, **kwargs)
+
+                setattr(solver, self.source, counted)
+
+    def best_move(self, grid):
+        """``(direction, nodes)`` for one search."""
+        if self.source == "nodes":
+            before = self.solver.nodes
+            direction = self.solver.get_best_move(grid)
+            return direction, self.solver.nodes - before
+        before = self.calls
+        direction = self.solver.get_best_move(grid)
+        if self.source == "last_playouts":
+            return direction, self.solver.last_playouts
+        return direction, self.calls - before if self.source else None
+
+
+def _latency_summary(latencies: List[float]) -> Dict:
+    return {
+        f"p{p}_ms": round(percentile(latencies, p) * 1000, 3) if latencies else None
+        for p in (50, 95, 99)
+    }
+
+
+def _max_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    # KB on Linux, bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if platform.system() == "Darwin" else rss
+
+
+def benchmark_solver(spec: str, options: Optional[Dict] = None, positions: int = 50,
+                     games: int = 5, seed: int = 0, max_moves: Optional[int] = None) -> Dict:
+    """Time ``spec`` on the position corpus and on seeded full games."""
+    solver = load_solver_class(spec)(**(options or {}))
+    counter = NodeCounter(solver)
+    nodes = 0
+
+    latencies = []
+    for grid in position_corpus(positions, seed):
+        start = time.perf_counter()
+        _, searched = counter.best_move(grid)
+        latencies.append(time.perf_counter() - start)
+        nodes += searched or 0
+
+    game_latencies = []
+    results = []
+    for game_seed in range(seed, seed + games):
+        engine = GameEngine(game_seed)
+        moves = 0
+        while not engine.is_over() and (max_moves is None or moves < max_moves):
+            start = time.perf_counter()
+            direction, searched = counter.best_move(engine.grid)
+            game_latencies.append(time.perf_counter() - start)
+            nodes += searched or 0
+            if not direction or not engine.move(direction):
+                break
+            moves += 1
+        results.append({"seed": game_seed, "max_tile": engine.max_tile,
+                        "score": engine.score, "moves": moves})
+
+    search_time = sum(latencies) + sum(game_latencies)
+    max_tiles = [r["max_tile"] for r in results]
+    return {
+        "solver": spec,
+        "options": options or {},
+        "node_source": counter.source,
+        "nodes": nodes if counter.source else None,
+        "nodes_per_s": round(nodes / search_time) if counter.source and search_time else None,
+        "positions": {"count": len(latencies), **_latency_summary(latencies)},
+        "games": {
+            "count": len(results),
+            **_latency_summary(game_latencies),
+            "mean_score": sum(r["score"] for r in results) / len(results) if results else None,
+            "reach": {
+                str(tile): sum(t >= tile for t in max_tiles) / len(results) if results else None
+                for tile in REACH_TILES
+            },
+            "results": results,
+        },
+        "max_rss_kb": _max_rss_kb(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_solvers(specs: List[str], options: Optional[Dict] = None, positions: int = 50,
+                games: int = 5, seed: int = 0, max_moves: Optional[int] = None,
+                isolate: bool = True) -> Dict:
+    """Benchmark each solver; with ``isolate``, each in its own fresh process.
+
+    A fresh process per solver keeps one solver's warm caches and memory
+    out of the next one's numbers.
+    """
+    results = []
+    for spec in specs:
+        args = (spec, options, positions, games, seed, max_moves)
+        if isolate:
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                results.append(executor.submit(benchmark_solver, *args).result())
+        else:
+            results.append(benchmark_solver(*args))
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "settings": {"positions": positions, "games": games, "seed": seed, "max_moves": max_moves},
+        "solvers": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the 2048 engines and solvers")
+    commands = parser.add_subparsers(dest="command", required=True)
+    engines = commands.add_parser("engines", help="random-play moves per second per board size")
+    engines.add_argument("--sizes", type=int, nargs="+", default=list(range(MIN_SIZE, MAX_SIZE + 1)))
+    engines.add_argument("--engines", nargs="+", choices=ENGINE_NAMES, default=list(ENGINE_NAMES))
+    engines.add_argument("--seconds", type=float, default=1.0, help="time per engine and size")
+    engines.add_argument("--seed", type=int, default=0)
+    engines.add_argument("--json", action="store_true", help="print results as JSON")
+    solvers = commands.add_parser("solvers", help="speed and strength of solver classes")
+    solvers.add_argument("specs", nargs="+", metavar="solver",
+                         help="solver spec, e.g. 2048_solver_nxn:NxNExpectimaxSolver")
+    solvers.add_argument("--options", default="{}", help="JSON keyword arguments for every solver")
+    solvers.add_argument("--positions", type=int, default=50, help="size of the position corpus")
+    solvers.add_argument("--games", type=int, default=5, help="full games per solver")
+    solvers.add_argument("--seed", type=int, default=0, help="seed of the corpus and first game")
+    solvers.add_argument("--max-moves", type=int, default=None, help="cap on moves per game")
+    solvers.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "solvers":
+        report = run_solvers(args.specs, json.loads(args.options), args.positions,
+                             args.games, args.seed, args.max_moves)
+        text = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        return
+    results = run_engines(args.sizes, args.engines, args.seconds, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'size':>4}  {'engine':<9} {'moves/s':>10} {'games':>6}")
+    for r in results:
+        print(f"{r['size']:>4}  {r['engine']:<9} {r['moves_per_s']:>10} {r['games']:>6}")
+
+
+if __name__ == "__main__":
+    main()
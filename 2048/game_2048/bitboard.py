@@ -0,0 +1,251 @@
+"""64-bit bitboard engine for the 4x4 board.
+
+The board is packed into a single int, four bits per cell holding the tile
+exponent (0 = empty, 1 = 2, 2 = 4, ... 15 = 32768). Cell ``(row, col)``
+lives at nibble ``4 * row + col``, so row ``r`` is ``(board >> 16 * r) & 0xFFFF``
+with column 0 in the low nibble.
+
+LEFT/RIGHT are applied with 65,536-entry row tables and UP/DOWN with column
+tables of the transposed board. The tables, and the merge-score table, are
+built once at import.
+
+Exponents are capped at 15: two 32768 tiles are treated as unmergeable.
+Callers that can reach 65536 (``Game2048``) fall back to the list-based
+move once a 32768 tile is on the board.
+"""
+from typing import List, Tuple
+
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+
+ROW_MASK = 0xFFFF
+COL_MASK = 0x000F000F000F000F
+MAX_EXPONENT = 15
+MAX_TILE = 1 << MAX_EXPONENT
+
+
+def _reverse_row(row: int) -> int:
+    return (
+        ((row & 0x000F) << 12)
+        | ((row & 0x00F0) << 4)
+        | ((row & 0x0F00) >> 4)
+        | ((row & 0xF000) >> 12)
+    )
+
+
+def _unpack_col(row: int) -> int:
+    """Spread a 16-bit row down column 0 of an otherwise empty board."""
+    return (row | (row << 12) | (row << 24) | (row << 36)) & COL_MASK
+
+
+def _slide_left(row: int) -> Tuple[int, int]:
+    line = [(row >> (4 * i)) & 0xF for i in range(4)]
+    tiles = [x for x in line if x]
+    merged = []
+    score = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1] and tiles[i] < MAX_EXPONENT:
+            merged.append(tiles[i] + 1)
+            score += 1 << (tiles[i] + 1)
+            i += 2
+        else:
+            merged.append(tiles[i])
+            i += 1
+    result = 0
+    for i, exponent in enumerate(merged):
+        result |= exponent << (4 * i)
+    return result, score
+
+
+def _build_tables():
+    row_left = [0] * 65536
+    row_right = [0] * 65536
+    col_up = [0] * 65536
+    col_down = [0] * 65536
+    row_score = [0] * 65536
+    for row in range(65536):
+        left, score = _slide_left(row)
+        row_left[row] = left
+        row_score[row] = score
+    for row in range(65536):
+        right = _reverse_row(row_left[_reverse_row(row)])
+        row_right[row] = right
+        col_up[row] = _unpack_col(row_left[row])
+        col_down[row] = _unpack_col(right)
+    return row_left, row_right, col_up, col_down, row_score
+
+
+ROW_LEFT, ROW_RIGHT, COL_UP, COL_DOWN, ROW_SCORE = _build_tables()
+
+
+def transpose(board: int) -> int:
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _row_score(board: int) -> int:
+    return (
+        ROW_SCORE[board & ROW_MASK]
+        + ROW_SCORE[(board >> 16) & ROW_MASK]
+        + ROW_SCORE[(board >> 32) & ROW_MASK]
+        + ROW_SCORE[(board >> 48) & ROW_MASK]
+    )
+
+
+def move_left(board: int) -> Tuple[int, int]:
+    new_board = (
+        ROW_LEFT[board & ROW_MASK]
+        | (ROW_LEFT[(board >> 16) & ROW_MASK] << 16)
+        | (ROW_LEFT[(board >> 32) & ROW_MASK] << 32)
+        | (ROW_LEFT[(board >> 48) & ROW_MASK] << 48)
+    )
+    return new_board, _row_score(board)
+
+
+def move_right(board: int) -> Tuple[int, int]:
+    new_board = (
+        ROW_RIGHT[board & ROW_MASK]
+        | (ROW_RIGHT[(board >> 16) & ROW_MASK] << 16)
+        | (ROW_RIGHT[(board >> 32) & ROW_MASK] << 32)
+        | (ROW_RIGHT[(board >> 48) & ROW_MASK] << 48)
+    )
+    # Merge scores are symmetric under reversal, so the left table applies.
+    return new_board, _row_score(board)
+
+
+def move_up(board: int) -> Tuple[int, int]:
+    t = transpose(board)
+    new_board = (
+        COL_UP[t & ROW_MASK]
+        | (COL_UP[(t >> 16) & ROW_MASK] << 4)
+        | (COL_UP[(t >> 32) & ROW_MASK] << 8)
+        | (COL_UP[(t >> 48) & ROW_MASK] << 12)
+    )
+    return new_board, _row_score(t)
+
+
+def move_down(board: int) -> Tuple[int, int]:
+    t = transpose(board)
+    new_board = (
+        COL_DOWN[t & ROW_MASK]
+        | (COL_DOWN[(t >> 16) & ROW_MASK] << 4)
+        | (COL_DOWN[(t >> 32) & ROW_MASK] << 8)
+        | (COL_DOWN[(t >> 48) & ROW_MASK] << 12)
+    )
+    return new_board, _row_score(t)
+
+
+MOVES = {
+    "UP": move_up,
+    "DOWN": move_down,
+    "LEFT": move_left,
+    "RIGHT": move_right,
+}
+
+
+def move(board: int, direction: str) -> Tuple[int, int]:
+    """Apply ``direction`` and return ``(new_board, score_gained)``.
+
+    The move is legal iff ``new_board != board``.
+    """
+    return MOVES[direction](board)
+
+
+def from_grid(grid: List[List[int]]) -> int:
+    """Pack a 4x4 grid of tile values into a bitboard."""
+    board = 0
+    shift = 0
+    for row in grid:
+        for value in row:
+            if value:
+                exponent = value.bit_length() - 1
+                if exponent > MAX_EXPONENT:
+                    raise ValueError(f"Tile {value} does not fit in a bitboard")
+                board |= exponent << shift
+            shift += 4
+    return board
+
+
+def to_grid(board: int) -> List[List[int]]:
+    """Unpack a bitboard into a 4x4 grid of tile values."""
+    grid = []
+    for r in range(4):
+        row = []
+        for c in range(4):
+            exponent = (board >> (16 * r + 4 * c)) & 0xF
+            row.append(1 << exponent if exponent else 0)
+        grid.append(row)
+    return grid
+
+
+def get_cell(board: int, index: int) -> int:
+    """Exponent stored at cell ``index`` (``4 * row + col``)."""
+    return (board >> (4 * index)) & 0xF
+
+
+def set_cell(board: int, index: int, exponent: int) -> int:
+    shift = 4 * index
+    return (board & ~(0xF << shift)) | (exponent << shift)
+
+
+def empty_cells(board: int) -> List[int]:
+    return [i for i in range(16) if not (board >> (4 * i)) & 0xF]
+
+
+def add_random_tile(board: int, rng) -> int:
+    """Spawn a 2 (90%) or 4 (10%) on a random empty cell, drawing from ``rng``."""
+    cells = empty_cells(board)
+    if not cells:
+        return board
+    # Same two draws as game_2048.packed.draw_spawn: the cell, then the tile.
+    cell = cells[int(rng.random() * len(cells))]
+    exponent = 1 if rng.random() < 0.9 else 2
+    return board | (exponent << (4 * cell))
+
+
+def count_empty(board: int) -> int:
+    # Fold each nibble onto its low bit, then count the nibbles that stayed 0.
+    x = board | ((board >> 2) & 0x3333333333333333)
+    x |= (x >> 1)
+    return (~x & 0x1111111111111111).bit_count()
+
+
+def max_exponent(board: int) -> int:
+    best = 0
+    while board:
+        exponent = board & 0xF
+        if exponent > best:
+            best = exponent
+        board >>= 4
+    return best
+
+
+def can_move(board: int) -> bool:
+    if count_empty(board):
+        return True
+    return any(MOVES[d](board)[0] != board for d in DIRECTIONS)
+
+
+def legal_moves(board: int) -> List[Tuple[str, int, int]]:
+    """List ``(direction, new_board, score)`` for every move that changes the board."""
+    moves = []
+    for direction in DIRECTIONS:
+        new_board, score = MOVES[direction](board)
+        if new_board != board:
+            moves.append((direction, new_board, score))
+    return moves
+
+
+def move_grid(grid: List[List[int]], direction: str) -> Tuple[List[List[int]], int, bool]:
+    """Drop-in for the solvers' ``move_grid``: returns ``(new_grid, score, moved)``."""
+    board = from_grid(grid)
+    new_board, score = MOVES[direction](board)
+    if new_board == board:
+        return [row[:] for row in grid], 0, False
+    return to_grid(new_board), score, True
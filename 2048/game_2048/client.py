@@ -0,0 +1,207 @@
+"""HTTP clients for the 2048 solver server.
+
+:class:`Game2048Client` keeps one pooled ``requests.Session`` for its whole
+life, so moves reuse a keep-alive connection instead of opening a new TCP
+connection per call. It also remembers the state returned by ``/start``,
+``/move`` and ``/moves``, so solvers can read ``client.state`` rather than
+paying for a ``GET /state`` before every move. Pass a
+:class:`~game_2048.recording.GameRecorder` to save sampled frames or a move
+log as the game is played.
+
+:class:`AsyncGame2048Client` is the asyncio equivalent. It is built on
+aiohttp, which is optional (``pip install aiohttp``). Use :func:`play_games`
+to drive many games concurrently from one process.
+"""
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from game_2048.recording import GameRecorder
+
+DEFAULT_SERVER_URL = "http://127.0.0.1:5000"
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+
+
+class Game2048Client:
+    def __init__(self, server_url: str = DEFAULT_SERVER_URL, timeout: float = 5,
+                 pool_size: int = 4, session: Optional[requests.Session] = None,
+                 recorder: Optional[GameRecorder] = None):
+        self.server_url = server_url
+        self.timeout = timeout
+        self.recorder = recorder
+        self.game_id = None
+        # Last state seen from the server, refreshed by every call.
+        self.state: Optional[Dict] = None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def start_game(self, **options) -> Optional[Dict]:
+        data = self._request("post", "/start", 201, json=options or None)
+        if data is not None:
+            self.game_id = data["game_id"]
+            self.state = data
+            if self.recorder is not None:
+                self.recorder.start(self.game_id, data)
+        return data
+
+    def make_move(self, direction: str) -> Optional[Dict]:
+        if direction not in DIRECTIONS:
+            print(f"Invalid move direction: {direction}")
+            return None
+        data = self._game_request("post", "/move", json={"direction": direction})
+        if data is not None and self.recorder is not None:
+            self.recorder.record(direction, data)
+        return data
+
+    def make_moves(self, directions: List[str]) -> Optional[Dict]:
+        """Apply several moves in one round trip via ``POST /moves``."""
+        previous = self.state
+        data = self._game_request("post", "/moves", json={"directions": list(directions)})
+        if data is not None and self.recorder is not None and previous is not None:
+            self.recorder.record_batch(previous, data)
+        return data
+
+    def get_state(self, refresh: bool = False) -> Optional[Dict]:
+        """Return the last known state; only hits the server when asked to."""
+        if self.state is not None and not refresh:
+            return self.state
+        return self._game_request("get", "/state")
+
+    def get_screenshot(self) -> Optional[bytes]:
+        if self.game_id is None:
+            print("Please start a game first.")
+            return None
+        try:
+            response = self.session.get(
+                f"{self.server_url}/screenshot",
+                params={"game_id": self.game_id},
+                timeout=self.timeout,
+            )
+        except requests.exceptions.RequestException as e:
+            print(f"Connection error: {e}")
+            return None
+        if response.status_code != 200:
+            print("Failed to capture screenshot.")
+            return None
+        return response.content
+
+    def close(self) -> None:
+        if self.recorder is not None:
+            self.recorder.close()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _game_request(self, method: str, path: str, **kwargs) -> Optional[Dict]:
+        if self.game_id is None:
+            print("Please start a game first.")
+            return None
+        data = self._request(method, path, 200, params={"game_id": self.game_id}, **kwargs)
+        if data is not None:
+            self.state = data
+        return data
+
+    def _request(self, method: str, path: str, expected_status: int, **kwargs) -> Optional[Dict]:
+        try:
+            response = self.session.request(
+                method, f"{self.server_url}{path}", timeout=self.timeout, **kwargs
+            )
+        except requests.exceptions.RequestException as e:
+            print(f"Connection error: {e}")
+            return None
+        if response.status_code != expected_status:
+            print(f"Request {method.upper()} {path} failed: {response.text}")
+            return None
+        return response.json()
+
+
+def _require_aiohttp():
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise ImportError(
+            "AsyncGame2048Client needs aiohttp: pip install aiohttp"
+        ) from e
+    return aiohttp
+
+
+class AsyncGame2048Client:
+    """asyncio client for one game; many can share one aiohttp session."""
+
+    def __init__(self, session, server_url: str = DEFAULT_SERVER_URL):
+        self.session = session
+        self.server_url = server_url
+        self.game_id = None
+        self.state: Optional[Dict] = None
+
+    async def start_game(self, **options) -> Dict:
+        data = await self._request("POST", "/start", json=options or None)
+        self.game_id = data["game_id"]
+        self.state = data
+        return data
+
+    async def make_move(self, direction: str) -> Dict:
+        return await self._game_request("POST", "/move", json={"direction": direction})
+
+    async def make_moves(self, directions: List[str]) -> Dict:
+        return await self._game_request("POST", "/moves", json={"directions": list(directions)})
+
+    async def get_state(self, refresh: bool = False) -> Dict:
+        if self.state is not None and not refresh:
+            return self.state
+        return await self._game_request("GET", "/state")
+
+    async def _game_request(self, method: str, path: str, **kwargs) -> Dict:
+        if self.game_id is None:
+            raise RuntimeError("Please start a game first.")
+        self.state = await self._request(method, path, params={"game_id": self.game_id}, **kwargs)
+        return self.state
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict:
+        async with self.session.request(method, f"{self.server_url}{path}", **kwargs) as response:
+            response.raise_for_status()
+            return await response.json()
+
+
+async def play_game(client: AsyncGame2048Client, choose_move: Callable[[List[List[int]]], str],
+                    max_moves: Optional[int] = None) -> Dict:
+    """Play one game to the end, asking ``choose_move(grid)`` for each move.
+
+    ``choose_move`` runs in the default executor so a CPU-bound search does
+    not stall the other games sharing the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    state = await client.start_game()
+    moves = 0
+    while state["status"] == "ongoing" and (max_moves is None or moves < max_moves):
+        direction = await loop.run_in_executor(None, choose_move, state["state"])
+        if not direction:
+            break
+        state = await client.make_move(direction)
+        if not state.get("moved", True):
+            break
+        moves += 1
+    return state
+
+
+async def play_games(choose_move: Callable[[List[List[int]]], str], n_games: int,
+                     server_url: str = DEFAULT_SERVER_URL, max_connections: int = 32,
+                     max_moves: Optional[int] = None) -> List[Dict]:
+    """Play ``n_games`` concurrently over one pooled aiohttp session."""
+    aiohttp = _require_aiohttp()
+    connector = aiohttp.TCPConnector(limit=max_connections)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        clients = [AsyncGame2048Client(session, server_url) for _ in range(n_games)]
+        return await asyncio.gather(
+            *(play_game(client, choose_move, max_moves) for client in clients)
+        )
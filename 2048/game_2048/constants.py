@@ -1,4 +1,10 @@
 GAME_SIZE = 4
+# Board sizes the packed NxN engine supports.
+MIN_SIZE = 3
+MAX_SIZE = 8
+# (tile, probability) pairs a new tile is drawn from.
+DEFAULT_SPAWN = ((2, 0.9), (4, 0.1))
+
 WINDOW_WIDTH = 400
 WINDOW_HEIGHT = 500
 
@@ -1,18 +1,62 @@
 import random
-from typing import List, Tuple, Dict
-from game_2048.constants import GAME_SIZE
+from typing import Dict, List, Optional
+from game_2048 import bitboard, packed
+from game_2048.constants import DEFAULT_SPAWN, GAME_SIZE, MAX_SIZE, MIN_SIZE
 
 class Game2048:
-    def __init__(self):
-        self.grid = [[0 for _ in range(GAME_SIZE)] for _ in range(GAME_SIZE)]
+    """One game on a ``size`` x ``size`` board.
+
+    Spawns are drawn from ``rng``: a :class:`random.Random`, a NumPy
+    ``Generator``, or anything else with a ``random()`` method. Without one,
+    the game makes its own ``random.Random(seed)``. Without a seed either,
+    the seed is drawn from the global generator and kept in ``self.seed``,
+    so any game can be replayed.
+
+    The empty cells, the top tile and whether any move is left are tracked
+    as the game is played. So :meth:`is_game_over` and :meth:`get_state`
+    never scan the board. To set up a position, assign a whole new
+    ``grid``. Assignment re-derives the tracked state; editing cells in
+    place does not.
+    """
+
+    def __init__(self, size: int = GAME_SIZE, spawn=DEFAULT_SPAWN,
+                 seed: Optional[int] = None, rng=None):
+        if not MIN_SIZE <= size <= MAX_SIZE:
+            raise ValueError(f"Board size must be between {MIN_SIZE} and {MAX_SIZE}")
+        if rng is None:
+            if seed is None:
+                seed = random.getrandbits(32)
+            rng = random.Random(seed)
+        self.seed = seed
+        self.rng = rng
+        self.size = size
+        # (tile, probability) pairs; see game_2048.packed.normalize_spawn.
+        self.spawn = packed.normalize_spawn(spawn)
+        self.grid = [[0 for _ in range(size)] for _ in range(size)]
         self.score = 0
         self.total_moves = 0
         self.highest_tile = 0
         self.max_tile = 2
         self.milestones = {2048: False, 4096: False, 8192: False, 
                           16384: False, 32768: False, 65536: False}
+        # (row, col, value) of the most recent spawn, for move logs/batches.
+        self.last_spawn = None
         self.add_new_tile()
         self.add_new_tile()
+        self._update_can_move()
+
+    @property
+    def grid(self) -> List[List[int]]:
+        return self._grid
+
+    @grid.setter
+    def grid(self, grid: List[List[int]]) -> None:
+        self._grid = grid
+        # Flat row-major indices, in order, so seeded spawns pick the same cells.
+        self._empty = [i * self.size + j for i, row in enumerate(grid)
+                       for j, value in enumerate(row) if not value]
+        self._top = max(max(row) for row in grid)
+        self._update_can_move()
 
     def get_state(self) -> Dict:
         return {
@@ -26,15 +70,18 @@ class Game2048:
         }
 
     def add_new_tile(self) -> None:
-        empty_cells = [(i, j) for i in range(GAME_SIZE) 
-                      for j in range(GAME_SIZE) if self.grid[i][j] == 0]
-        if empty_cells:
-            i, j = random.choice(empty_cells)
-            self.grid[i][j] = 2 if random.random() < 0.9 else 4
+        if self._empty:
+            index, tile = packed.draw_spawn(self.rng, self._empty, self.spawn)
+            self._empty.remove(index)
+            i, j = divmod(index, self.size)
+            self._grid[i][j] = tile
+            self.last_spawn = (i, j, tile)
+            if tile > self._top:
+                self._top = tile
             self.update_highest_tile()
 
     def update_highest_tile(self) -> None:
-        current_max = max(max(row) for row in self.grid)
+        current_max = self._top
         if current_max > self.highest_tile:
             self.highest_tile = current_max
             self.max_tile = current_max
@@ -43,75 +90,43 @@ class Game2048:
                     self.milestones[milestone] = True
 
     def move(self, direction: str) -> bool:
-        original_grid = [row[:] for row in self.grid]
-        
-        if direction in ['UP', 'DOWN']:
-            self.transpose()
-        if direction in ['RIGHT', 'DOWN']:
-            self.reverse()
-
-        moved = False
-        score_added = 0
-        
-        # Compress and merge
-        self.compress()
-        score_added = self.merge()
-        self.compress()
-
-        if direction in ['RIGHT', 'DOWN']:
-            self.reverse()
-        if direction in ['UP', 'DOWN']:
-            self.transpose()
-
-        # Check if grid changed
-        if original_grid != self.grid:
-            moved = True
-            self.score += score_added
-            self.total_moves += 1
-            self.add_new_tile()
-
-        return moved
-
-    def compress(self) -> None:
-        new_grid = [[0 for _ in range(GAME_SIZE)] for _ in range(GAME_SIZE)]
-        for i in range(GAME_SIZE):
-            pos = 0
-            for j in range(GAME_SIZE):
-                if self.grid[i][j] != 0:
-                    new_grid[i][pos] = self.grid[i][j]
-                    pos += 1
-        self.grid = new_grid
-
-    def merge(self) -> int:
-        score = 0
-        for i in range(GAME_SIZE):
-            for j in range(GAME_SIZE-1):
-                if self.grid[i][j] == self.grid[i][j+1] and self.grid[i][j] != 0:
-                    self.grid[i][j] *= 2
-                    self.grid[i][j+1] = 0
-                    score += self.grid[i][j]
-        return score
+        # The bitboard tables cap tiles at 32768 and only fit 4x4; everything
+        # else goes through the packed engine, which has no tile cap.
+        if self.size == 4 and self._top < bitboard.MAX_TILE:
+            engine = bitboard
+        else:
+            engine = packed
+        board = engine.from_grid(self._grid)
+        new_board, score_added = engine.move(board, direction)
+        if new_board == board:
+            return False
 
-    def reverse(self) -> None:
-        self.grid = [row[::-1] for row in self.grid]
+        self._grid = engine.to_grid(new_board)
+        self._empty = engine.empty_cells(new_board)
+        # A new top tile takes a merge of two top tiles, worth 2 * top points.
+        if score_added >= 2 * self._top:
+            self._top = 1 << engine.max_exponent(new_board)
+            self.update_highest_tile()
+        self.score += score_added
+        self.total_moves += 1
+        self.add_new_tile()
+        self._update_can_move()
+        return True
 
-    def transpose(self) -> None:
-        self.grid = [[self.grid[j][i] for j in range(GAME_SIZE)] 
-                    for i in range(GAME_SIZE)]
+    def _update_can_move(self) -> None:
+        if self._empty:
+            self._can_move = True
+            return
+        # A full board: only a merge between neighbours is left.
+        grid = self._grid
+        n = self.size
+        self._can_move = any(
+            grid[i][j] == grid[i][j + 1] or grid[j][i] == grid[j + 1][i]
+            for i in range(n) for j in range(n - 1)
+        )
 
     def is_game_over(self) -> bool:
-        # Check for empty cells
-        if any(0 in row for row in self.grid):
-            return False
-
-        # Check for possible merges
-        for i in range(GAME_SIZE):
-            for j in range(GAME_SIZE-1):
-                if self.grid[i][j] == self.grid[i][j+1]:
-                    return False
-                if self.grid[j][i] == self.grid[j+1][i]:
-                    return False
-        return True
+        return not self._can_move
 
     def has_won(self) -> bool:
         return self.highest_tile >= 65536
@@ -0,0 +1,353 @@
+"""Compact binary game logs: a header, then one small record per move.
+
+A log holds everything needed to replay a game exactly. Each move records
+its spawn, so a replay needs neither the seed nor the RNG, and the seed
+saved in the header is there to re-run the same game with a different
+solver. A 1,000-move game takes about 3 KB, against a megabyte or more of
+per-move PNGs.
+
+Layout, little-endian::
+
+    header
+        magic       4s   b"G2KL"
+        version     u8   1
+        size        u8   board side, 3..8
+        flags       u8   bit 0: seed present
+        seed        u64  0 when absent
+        n_spawn     u8   spawn distribution entries
+        spawn       n_spawn x (exponent u8, probability f64)
+        config_len  u32
+        config      config_len bytes of UTF-8 JSON (solver settings, game id, ...)
+        board       size*size u8 tile exponents of the opening position
+    move record, repeated
+        byte 0      bits 0-1 direction (UP, DOWN, LEFT, RIGHT), bits 2-7 spawn cell
+        byte 1      spawn exponent, 0 when nothing spawned
+        score delta unsigned LEB128 varint
+
+The log is append-only: :class:`GameLogWriter` writes the header once and
+then one record per move. A reader ignores a trailing partial record, so
+a log cut off by a crash still replays up to its last complete move.
+
+Work with logs from the ``2048`` directory::
+
+    python -m game_2048.gamelog stats logs/*.g2048
+    python -m game_2048.gamelog verify logs/<game>.g2048
+    python -m game_2048.gamelog render logs/<game>.g2048 frames/ --every 50
+"""
+import argparse
+import csv
+import json
+import os
+import struct
+import sys
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from game_2048 import packed
+from game_2048.constants import DEFAULT_SPAWN
+
+MAGIC = b"G2KL"
+VERSION = 1
+EXTENSION = ".g2048"
+
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+_DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+_HEADER = struct.Struct("<4sBBBQB")
+_SPAWN_ENTRY = struct.Struct("<Bd")
+_CONFIG_LEN = struct.Struct("<I")
+
+
+class GameLogError(ValueError):
+    """A log that is malformed or does not replay consistently."""
+
+
+class MoveRecord(NamedTuple):
+    direction: str
+    cell: int
+    exponent: int
+    score_delta: int
+
+
+def _encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+class GameLogWriter:
+    """Streams one game to ``target`` (a path or a binary file).
+
+    Records go through the file's buffer. Call :meth:`flush` to push them
+    out early, and :meth:`close` when the game ends.
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], grid: List[List[int]],
+                 spawn=DEFAULT_SPAWN, seed: Optional[int] = None,
+                 config: Optional[Dict] = None):
+        self.size = len(grid)
+        self.moves = 0
+        self._owns_file = isinstance(target, str)
+        self.file = open(target, "wb") if self._owns_file else target
+        spawn = packed.normalize_spawn(spawn)
+        config_bytes = json.dumps(config or {}, sort_keys=True).encode("utf-8")
+        parts = [_HEADER.pack(MAGIC, VERSION, self.size, 1 if seed is not None else 0,
+                              seed or 0, len(spawn))]
+        parts += [_SPAWN_ENTRY.pack(tile.bit_length() - 1, p) for tile, p in spawn]
+        parts += [_CONFIG_LEN.pack(len(config_bytes)), config_bytes, packed.from_grid(grid)]
+        self.file.write(b"".join(parts))
+
+    @classmethod
+    def for_game(cls, target: Union[str, BinaryIO], game, seed: Optional[int] = None,
+                 config: Optional[Dict] = None) -> "GameLogWriter":
+        """Start a log from a :class:`~game_2048.game.Game2048`'s current position."""
+        return cls(target, game.grid, game.spawn, seed, config)
+
+    def append(self, direction: str, spawn: Optional[Sequence[int]], score_delta: int) -> None:
+        """Record one move; ``spawn`` is ``(row, col, value)`` or ``None``."""
+        if spawn is None:
+            cell = exponent = 0
+        else:
+            row, col, value = spawn
+            cell = row * self.size + col
+            exponent = value.bit_length() - 1
+        self.file.write(
+            bytes((_DIRECTION_CODES[direction] | (cell << 2), exponent))
+            + _encode_varint(score_delta)
+        )
+        self.moves += 1
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class GameLog:
+    def __init__(self, size: int, seed: Optional[int], spawn: Tuple[Tuple[int, float], ...],
+                 config: Dict, initial: bytes, moves: List[MoveRecord], truncated: bool = False):
+        self.size = size
+        self.seed = seed
+        self.spawn = spawn
+        self.config = config
+        self.initial = initial
+        self.moves = moves
+        # True when the file ended part-way through a move record.
+        self.truncated = truncated
+
+    def positions(self) -> Iterator[Tuple[bytes, int]]:
+        """Re-simulate the game: yields ``(board, score)`` for the opening and after every move.
+
+        Each move is replayed with :mod:`game_2048.packed` and checked
+        against the log. Raises :class:`GameLogError` if a move does not
+        change the board, scores differently, or spawns on an occupied cell.
+        """
+        board = self.initial
+        score = 0
+        yield board, score
+        for i, record in enumerate(self.moves):
+            new_board, delta = packed.move(board, record.direction)
+            if new_board == board:
+                raise GameLogError(f"Move {i + 1} ({record.direction}) does not change the board")
+            if delta != record.score_delta:
+                raise GameLogError(
+                    f"Move {i + 1} scores {delta}, but the log says {record.score_delta}"
+                )
+            if record.exponent:
+                if new_board[record.cell]:
+                    raise GameLogError(f"Move {i + 1} spawns on occupied cell {record.cell}")
+                new_board = packed.set_cell(new_board, record.cell, record.exponent)
+            board = new_board
+            score += delta
+            yield board, score
+
+    def replay(self) -> Tuple[bytes, int]:
+        """Final ``(board, score)``, verifying every move on the way."""
+        final = None
+        for final in self.positions():
+            pass
+        return final
+
+    def stats(self) -> Dict:
+        board, score = self.replay()
+        directions = {direction: 0 for direction in DIRECTIONS}
+        spawns: Dict[int, int] = {}
+        for record in self.moves:
+            directions[record.direction] += 1
+            if record.exponent:
+                tile = 1 << record.exponent
+                spawns[tile] = spawns.get(tile, 0) + 1
+        max_exponent = packed.max_exponent(board)
+        return {
+            "size": self.size,
+            "seed": self.seed,
+            "config": self.config,
+            "moves": len(self.moves),
+            "score": score,
+            "max_tile": 1 << max_exponent if max_exponent else 0,
+            "game_over": not packed.can_move(board),
+            "truncated": self.truncated,
+            "directions": directions,
+            "spawns": {str(tile): count for tile, count in sorted(spawns.items())},
+        }
+
+
+def parse_game_log(data: bytes) -> GameLog:
+    try:
+        magic, version, size, flags, seed, n_spawn = _HEADER.unpack_from(data, 0)
+    except struct.error:
+        raise GameLogError("Too short to be a game log")
+    if magic != MAGIC:
+        raise GameLogError("Not a 2048 game log")
+    if version != VERSION:
+        raise GameLogError(f"Unsupported game log version {version}")
+    try:
+        offset = _HEADER.size
+        spawn = []
+        for _ in range(n_spawn):
+            exponent, probability = _SPAWN_ENTRY.unpack_from(data, offset)
+            spawn.append((1 << exponent, probability))
+            offset += _SPAWN_ENTRY.size
+        (config_len,) = _CONFIG_LEN.unpack_from(data, offset)
+        offset += _CONFIG_LEN.size
+        config = json.loads(data[offset:offset + config_len].decode("utf-8"))
+        offset += config_len
+    except (struct.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise GameLogError(f"Corrupt game log header: {e}")
+    initial = bytes(data[offset:offset + size * size])
+    if len(initial) != size * size:
+        raise GameLogError("Game log ends inside its header")
+    offset += size * size
+
+    moves = []
+    end = len(data)
+    truncated = False
+    while offset < end:
+        if offset + 2 >= end:
+            truncated = True
+            break
+        first, exponent = data[offset], data[offset + 1]
+        pos = offset + 2
+        delta = shift = 0
+        while pos < end:
+            byte = data[pos]
+            pos += 1
+            delta |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        else:
+            truncated = True
+            break
+        moves.append(MoveRecord(DIRECTIONS[first & 0x3], first >> 2, exponent, delta))
+        offset = pos
+    return GameLog(size, seed if flags & 1 else None, tuple(spawn), config, initial, moves, truncated)
+
+
+def read_game_log(path: str) -> GameLog:
+    with open(path, "rb") as f:
+        return parse_game_log(f.read())
+
+
+def render_frames(log: GameLog, output_folder: str, every: int = 1,
+                  frames: Optional[Sequence[int]] = None) -> int:
+    """Render positions of ``log`` to ``<move>.png`` files; returns how many were written.
+
+    ``frames`` picks move numbers (0 is the opening, negative counts from
+    the end). Otherwise every ``every``-th position is rendered, plus the
+    final one.
+    """
+    from game_2048.gui import FrameRenderer
+    from game_2048.recording import GameSnapshot
+
+    if frames is None and every < 1:
+        raise ValueError(f"every must be at least 1, got {every}")
+    last = len(log.moves)
+    if frames is not None:
+        wanted = {f % (last + 1) for f in frames}
+    else:
+        wanted = set(range(0, last + 1, every)) | {last}
+    os.makedirs(output_folder, exist_ok=True)
+    renderer = FrameRenderer()
+    written = 0
+    for move, (board, score) in enumerate(log.positions()):
+        if move not in wanted:
+            continue
+        status = "over" if move == last and not packed.can_move(board) else "ongoing"
+        snapshot = GameSnapshot(packed.to_grid(board), score, move, status)
+        renderer.save_png(snapshot, os.path.join(output_folder, f"{move:05d}.png"))
+        written += 1
+    return written
+
+
+STATS_FIELDS = ("path", "size", "seed", "moves", "score", "max_tile", "game_over", "truncated")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and replay 2048 game logs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    stats = commands.add_parser("stats", help="replay logs and print per-game stats")
+    stats.add_argument("logs", nargs="+")
+    stats.add_argument("--csv", action="store_true", help="one CSV row per log instead of JSON")
+    verify = commands.add_parser("verify", help="replay logs and report the first inconsistency")
+    verify.add_argument("logs", nargs="+")
+    render = commands.add_parser("render", help="render positions of one log to PNG frames")
+    render.add_argument("log")
+    render.add_argument("output")
+    render.add_argument("--every", type=int, default=1, help="render every Nth position")
+    render.add_argument("--frames", type=int, nargs="+",
+                        help="render only these move numbers (negative counts from the end)")
+    args = parser.parse_args(argv)
+    if args.command == "render" and args.every < 1:
+        parser.error("--every must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "render":
+        written = render_frames(read_game_log(args.log), args.output, args.every, args.frames)
+        print(f"Wrote {written} frames to {args.output}")
+        return 0
+
+    failures = 0
+    rows = []
+    for path in args.logs:
+        try:
+            log = read_game_log(path)
+            if args.command == "verify":
+                log.replay()
+                note = " (truncated)" if log.truncated else ""
+                print(f"{path}: ok, {len(log.moves)} moves{note}")
+            else:
+                rows.append({"path": path, **log.stats()})
+        except (OSError, GameLogError) as e:
+            failures += 1
+            print(f"{path}: {e}", file=sys.stderr)
+    if args.command == "stats":
+        if args.csv:
+            writer = csv.DictWriter(sys.stdout, fieldnames=STATS_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            print(json.dumps(rows, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
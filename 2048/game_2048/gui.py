@@ -1,8 +1,17 @@
+import os
+import sys
 from os import environ
 environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
 import pygame
-from game_2048.game import Game2048
-from game_2048.constants import (
+
+# text_cache lives at the repository root, shared with the other games.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+import text_cache  # noqa: E402
+from game_2048.game import Game2048  # noqa: E402
+from game_2048.constants import (  # noqa: E402
     BACKGROUND,
     EMPTY_CELL,
     GAME_SIZE,
@@ -21,8 +30,7 @@ class TextRenderer:
         if len(str(text)) > 5:
             font_size = int(font_size * 0.7)
         
-        font = pygame.font.SysFont('Arial', font_size, bold=True)
-        text_surface = font.render(str(text), True, color)
+        text_surface = text_cache.render_text(text, font_size, color, face='Arial', bold=True)
         text_rect = text_surface.get_rect(center=(x, y))
         window.blit(text_surface, text_rect)
 
@@ -33,7 +41,9 @@ class GameGUI:
         pygame.display.set_caption('2048 Extended')
         self.clock = pygame.time.Clock()
         self.game = Game2048()
-        
+        self._init_layout()
+
+    def _init_layout(self):
         # Calculate grid measurements
         self.grid_padding = 10
         self.grid_top = 100
@@ -60,41 +70,49 @@ class GameGUI:
         return True
 
     def draw(self):
-        self.window.fill(BACKGROUND)
-        self._draw_score()
-        self._draw_grid()
-        self._draw_game_state()
+        self.render(self.window, self.game)
         pygame.display.update()
 
-    def _draw_score(self):
-        pygame.draw.rect(self.window, EMPTY_CELL, (10, 10, WINDOW_WIDTH - 20, 60), border_radius=5)
+    def render(self, surface, game):
+        """Draw ``game`` onto ``surface``; needs no display when off-screen."""
+        surface.fill(BACKGROUND)
+        self._draw_score(surface, game)
+        self._draw_grid(surface, game)
+        self._draw_game_state(surface, game)
+
+    def _draw_score(self, surface, game):
+        pygame.draw.rect(surface, EMPTY_CELL, (10, 10, WINDOW_WIDTH - 20, 60), border_radius=5)
         TextRenderer.draw_text(
-            self.window,
-            f"Score: {self.game.score} | Moves: {self.game.total_moves} | Max: {self.game.max_tile}",
+            surface,
+            f"Score: {game.score} | Moves: {game.total_moves} | Max: {game.max_tile}",
             24, WINDOW_WIDTH // 2, 40, TEXT_DARK
         )
 
-    def _draw_grid(self):
-        for i in range(GAME_SIZE):
-            for j in range(GAME_SIZE):
-                x = j * (self.tile_size + self.grid_padding) + self.grid_padding
-                y = i * (self.tile_size + self.grid_padding) + self.grid_top
+    def _draw_grid(self, surface, game):
+        size = len(game.grid)
+        tile_size = (WINDOW_WIDTH - self.grid_padding * (size + 1)) // size
+        # Font sizes below suit a 4x4 tile; scale them for other boards.
+        scale = tile_size / self.tile_size
+        for i in range(size):
+            for j in range(size):
+                x = j * (tile_size + self.grid_padding) + self.grid_padding
+                y = i * (tile_size + self.grid_padding) + self.grid_top
 
                 # Draw tile background
                 pygame.draw.rect(
-                    self.window,
+                    surface,
                     EMPTY_CELL,
-                    (x, y, self.tile_size, self.tile_size),
+                    (x, y, tile_size, tile_size),
                     border_radius=5
                 )
 
                 # Draw tile value
-                value = self.game.grid[i][j]
+                value = game.grid[i][j]
                 if value != 0:
                     pygame.draw.rect(
-                        self.window,
+                        surface,
                         TILE_COLORS.get(value, TILE_COLORS[2048]),
-                        (x, y, self.tile_size, self.tile_size),
+                        (x, y, tile_size, tile_size),
                         border_radius=5
                     )
 
@@ -105,31 +123,31 @@ class GameGUI:
                         font_size = 48
 
                     TextRenderer.draw_text(
-                        self.window,
+                        surface,
                         str(value),
-                        font_size,
-                        x + self.tile_size // 2,
-                        y + self.tile_size // 2,
+                        int(font_size * scale),
+                        x + tile_size // 2,
+                        y + tile_size // 2,
                         TEXT_DARK if value <= 4 else TEXT_LIGHT
                     )
 
-    def _draw_game_state(self):
-        if self.game.is_game_over() or self.game.has_won():
+    def _draw_game_state(self, surface, game):
+        if game.is_game_over() or game.has_won():
             # Create semi-transparent overlay
             overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-            overlay.fill((0, 0, 0) if self.game.is_game_over() else (255, 223, 0))
+            overlay.fill((0, 0, 0) if game.is_game_over() else (255, 223, 0))
             overlay.set_alpha(128)
-            self.window.blit(overlay, (0, 0))
+            surface.blit(overlay, (0, 0))
 
-            if self.game.is_game_over():
-                message = f"Game Over! Max: {self.game.max_tile}"
+            if game.is_game_over():
+                message = f"Game Over! Max: {game.max_tile}"
                 color = TEXT_LIGHT
             else:
                 message = "65536 Achieved!"
                 color = TEXT_DARK
 
             TextRenderer.draw_text(
-                self.window,
+                surface,
                 message,
                 64,
                 WINDOW_WIDTH // 2,
@@ -138,9 +156,9 @@ class GameGUI:
             )
 
             # Display final stats
-            stats = f"Final Score: {self.game.score} | Moves: {self.game.total_moves}"
+            stats = f"Final Score: {game.score} | Moves: {game.total_moves}"
             TextRenderer.draw_text(
-                self.window,
+                surface,
                 stats,
                 32,
                 WINDOW_WIDTH // 2,
@@ -155,3 +173,17 @@ class GameGUI:
             self.draw()
             self.clock.tick(60)
         pygame.quit()
+
+
+class FrameRenderer(GameGUI):
+    """Renders games to image files without opening a window."""
+
+    def __init__(self):
+        pygame.font.init()
+        self.window = None
+        self._init_layout()
+
+    def save_png(self, game, path):
+        surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.render(surface, game)
+        pygame.image.save(surface, path)
@@ -0,0 +1,335 @@
+"""N-tuple network evaluator for 2048, trained by TD learning.
+
+An n-tuple network scores a board by summing lookup-table weights. Each
+tuple is a fixed list of cells; the exponents found in those cells, read
+as a base-16 number, index that tuple's table. Every tuple is applied under
+all 8 rotations and reflections of the board, sharing one table, so the
+value is symmetric.
+
+The network estimates the value of an *afterstate* (the board after a move,
+before the spawn): the score still to come. :func:`train` learns it by
+TD(0) self-play, the afterstate scheme of Szubert & Jaskowski (2014).
+
+Weights live in one ``(n_tuples, 16 ** tuple_len)`` float32 array saved
+with :meth:`NTupleNetwork.save`. :meth:`NTupleNetwork.load` memory-maps it
+read-only by default, so many solver processes share one copy of the pages.
+
+The kernels are compiled with numba when it is installed (the ``solvers``
+extra); without it they run as plain Python.
+
+Train from the ``2048`` directory::
+
+    python -m game_2048.ntuple --games 100000 --output ntuple.npy
+"""
+import argparse
+import os
+import time
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba comes with the optional "solvers" extra
+    def njit(func):
+        """Run the kernels uncompiled: same results, far slower."""
+        return func
+
+from game_2048 import bitboard
+
+# Cell indices are 4 * row + col, matching game_2048.bitboard.
+PATTERNS = {
+    # Four 6-tuples (Yeh et al.); 4 x 16.7M weights, about 270 MB.
+    "standard": [
+        (0, 1, 2, 3, 4, 5),
+        (4, 5, 6, 7, 8, 9),
+        (0, 1, 2, 4, 5, 6),
+        (4, 5, 6, 8, 9, 10),
+    ],
+    # Rows, columns and squares as 4-tuples; 5 x 65536 weights, about 1.3 MB.
+    "small": [
+        (0, 1, 2, 3),
+        (4, 5, 6, 7),
+        (0, 1, 4, 5),
+        (1, 2, 5, 6),
+        (5, 6, 9, 10),
+    ],
+}
+
+_ROW_LEFT = np.array(bitboard.ROW_LEFT, dtype=np.uint64)
+_ROW_RIGHT = np.array(bitboard.ROW_RIGHT, dtype=np.uint64)
+_ROW_SCORE = np.array(bitboard.ROW_SCORE, dtype=np.int64)
+
+_U4 = np.uint64(4)
+_U16 = np.uint64(16)
+_NIBBLE = np.uint64(0xF)
+_ROW = np.uint64(0xFFFF)
+
+
+def _symmetries(cell: int) -> List[int]:
+    """Where ``cell`` lands under each of the 8 board symmetries."""
+    r, c = divmod(cell, 4)
+    result = []
+    for _ in range(4):
+        result.append(4 * r + c)
+        result.append(4 * r + (3 - c))
+        r, c = c, 3 - r
+    return result
+
+
+def expand_tuples(tuples: Sequence[Sequence[int]]) -> np.ndarray:
+    """``(n_tuples, 8, tuple_len)`` bit shifts of every tuple under every symmetry."""
+    return np.array(
+        [[[4 * _symmetries(cell)[s] for cell in t] for s in range(8)] for t in tuples],
+        dtype=np.uint64,
+    )
+
+
+@njit
+def _transpose(x):
+    a1 = x & np.uint64(0xF0F00F0FF0F00F0F)
+    a2 = x & np.uint64(0x0000F0F00000F0F0)
+    a3 = x & np.uint64(0x0F0F00000F0F0000)
+    a = a1 | (a2 << np.uint64(12)) | (a3 >> np.uint64(12))
+    b1 = a & np.uint64(0xFF00FF0000FF00FF)
+    b2 = a & np.uint64(0x00FF00FF00000000)
+    b3 = a & np.uint64(0x00000000FF00FF00)
+    return b1 | (b2 >> np.uint64(24)) | (b3 << np.uint64(24))
+
+
+@njit
+def _move_rows(board, table):
+    out = np.uint64(0)
+    score = 0
+    for r in range(4):
+        shift = np.uint64(16 * r)
+        row = (board >> shift) & _ROW
+        out |= table[row] << shift
+        score += _ROW_SCORE[row]
+    return out, score
+
+
+@njit
+def _move(board, direction):
+    """Directions are numbered as in ``bitboard.DIRECTIONS`` (UP, DOWN, LEFT, RIGHT)."""
+    if direction == 2:
+        return _move_rows(board, _ROW_LEFT)
+    if direction == 3:
+        return _move_rows(board, _ROW_RIGHT)
+    table = _ROW_LEFT if direction == 0 else _ROW_RIGHT
+    moved, score = _move_rows(_transpose(board), table)
+    return _transpose(moved), score
+
+
+@njit
+def _spawn(board):
+    empty = 0
+    for i in range(16):
+        if (board >> np.uint64(4 * i)) & _NIBBLE == 0:
+            empty += 1
+    if empty == 0:
+        return board
+    k = np.random.randint(empty)
+    exponent = np.uint64(1) if np.random.random() < 0.9 else np.uint64(2)
+    for i in range(16):
+        if (board >> np.uint64(4 * i)) & _NIBBLE == 0:
+            if k == 0:
+                return board | (exponent << np.uint64(4 * i))
+            k -= 1
+    return board
+
+
+@njit
+def _index(board, shifts):
+    idx = np.uint64(0)
+    for k in range(shifts.shape[0]):
+        idx = (idx << _U4) | ((board >> shifts[k]) & _NIBBLE)
+    return idx
+
+
+@njit
+def _value(weights, shifts, board):
+    total = 0.0
+    for t in range(shifts.shape[0]):
+        for s in range(8):
+            total += weights[t, _index(board, shifts[t, s])]
+    return total
+
+
+@njit
+def _update(weights, shifts, board, delta):
+    for t in range(shifts.shape[0]):
+        for s in range(8):
+            weights[t, _index(board, shifts[t, s])] += delta
+
+
+@njit
+def _best_move(weights, shifts, board):
+    """Greedy move by ``reward + V(afterstate)``; returns (direction, after, reward, value)."""
+    best_direction = -1
+    best_after = board
+    best_reward = 0
+    best_value = -np.inf
+    for d in range(4):
+        after, reward = _move(board, d)
+        if after == board:
+            continue
+        value = reward + _value(weights, shifts, after)
+        if value > best_value:
+            best_direction = d
+            best_after = after
+            best_reward = reward
+            best_value = value
+    return best_direction, best_after, best_reward, best_value
+
+
+@njit
+def _state_values(weights, shifts, boards):
+    out = np.empty(boards.shape[0])
+    for i in range(boards.shape[0]):
+        d, _, _, value = _best_move(weights, shifts, boards[i])
+        out[i] = value if d >= 0 else 0.0
+    return out
+
+
+@njit
+def _train_games(weights, shifts, n_games, alpha, seed, scores, max_exponents):
+    np.random.seed(seed)
+    for g in range(n_games):
+        board = _spawn(_spawn(np.uint64(0)))
+        score = 0
+        prev_after = np.uint64(0)
+        have_prev = False
+        while True:
+            d, after, reward, target = _best_move(weights, shifts, board)
+            if d < 0:
+                break
+            if have_prev:
+                delta = alpha * (target - _value(weights, shifts, prev_after))
+                _update(weights, shifts, prev_after, delta)
+            prev_after = after
+            have_prev = True
+            score += reward
+            board = _spawn(after)
+        if have_prev:
+            _update(weights, shifts, prev_after, -alpha * _value(weights, shifts, prev_after))
+        best = 0
+        for i in range(16):
+            e = (board >> np.uint64(4 * i)) & _NIBBLE
+            if e > best:
+                best = e
+        scores[g] = score
+        max_exponents[g] = best
+
+
+class NTupleNetwork:
+    def __init__(self, tuples: Sequence[Sequence[int]], weights: Optional[np.ndarray] = None):
+        self.tuples = np.array(tuples, dtype=np.int64)
+        n_tuples, tuple_len = self.tuples.shape
+        if weights is None:
+            weights = np.zeros((n_tuples, 16 ** tuple_len), dtype=np.float32)
+        if weights.shape != (n_tuples, 16 ** tuple_len):
+            raise ValueError(
+                f"Weights of shape {weights.shape} do not fit {n_tuples} {tuple_len}-tuples"
+            )
+        self.weights = weights
+        self._shifts = expand_tuples(self.tuples)
+
+    @classmethod
+    def from_pattern(cls, name: str = "standard") -> "NTupleNetwork":
+        if name not in PATTERNS:
+            raise ValueError(f"Unknown pattern {name!r}; choose from {sorted(PATTERNS)}")
+        return cls(PATTERNS[name])
+
+    def evaluate(self, board: int) -> float:
+        """Expected score still to come from afterstate ``board``."""
+        return float(_value(self.weights, self._shifts, np.uint64(board)))
+
+    def evaluate_state(self, board: int) -> float:
+        """Value of a board about to be moved: best ``reward + evaluate(afterstate)``.
+
+        0 when no move is left.
+        """
+        d, _, _, value = _best_move(self.weights, self._shifts, np.uint64(board))
+        return float(value) if d >= 0 else 0.0
+
+    def evaluate_states(self, boards: np.ndarray) -> np.ndarray:
+        """:meth:`evaluate_state` over a uint64 array of boards in one compiled call."""
+        return _state_values(self.weights, self._shifts, np.asarray(boards, dtype=np.uint64))
+
+    def best_move(self, board: int) -> str:
+        d, _, _, _ = _best_move(self.weights, self._shifts, np.uint64(board))
+        return bitboard.DIRECTIONS[d] if d >= 0 else ""
+
+    def get_best_move(self, grid: List[List[int]]) -> str:
+        """Greedy one-ply player, so a network can be used as a solver on its own."""
+        return self.best_move(bitboard.from_grid(grid))
+
+    def save(self, path: str) -> None:
+        """Write the weights to ``path`` and the tuples next to it (``*.tuples.npy``)."""
+        np.save(path, self.weights)
+        np.save(_tuples_path(path), self.tuples)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "NTupleNetwork":
+        """Load saved weights, memory-mapped read-only unless ``mmap=False``."""
+        weights = np.load(path, mmap_mode="r" if mmap else None)
+        return cls(np.load(_tuples_path(path)), weights)
+
+
+def _tuples_path(path: str) -> str:
+    root, _ = os.path.splitext(path)
+    return root + ".tuples.npy"
+
+
+def train(network: NTupleNetwork, games: int, alpha: float = 0.0025, seed: int = 0,
+          report_every: int = 1000, log: Optional[Callable[[str], None]] = print) -> np.ndarray:
+    """TD(0)-train ``network`` in place over ``games`` self-play games.
+
+    ``alpha`` is the step applied to each of the ``8 * n_tuples`` weights a
+    board touches. Returns every game's final score.
+    """
+    if not network.weights.flags.writeable:
+        raise ValueError("Weights are read-only; load with mmap=False to train")
+    scores = np.zeros(games, dtype=np.int64)
+    max_exponents = np.zeros(games, dtype=np.int64)
+    start = time.perf_counter()
+    for first in range(0, games, report_every):
+        n = min(report_every, games - first)
+        _train_games(network.weights, network._shifts, n, np.float32(alpha), seed + first,
+                     scores[first:first + n], max_exponents[first:first + n])
+        if log is not None:
+            chunk = max_exponents[first:first + n]
+            log(
+                f"games {first + n}/{games}: mean score {scores[first:first + n].mean():.0f}, "
+                f"2048 rate {(chunk >= 11).mean():.1%}, "
+                f"{time.perf_counter() - start:.0f}s"
+            )
+    return scores
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train an n-tuple network by TD self-play")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--alpha", type=float, default=0.0025)
+    parser.add_argument("--pattern", choices=sorted(PATTERNS), default="standard")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report-every", type=int, default=1000)
+    parser.add_argument("--resume", help="continue training from these saved weights")
+    parser.add_argument("--output", default="ntuple.npy", help="where to save the weights")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.resume:
+        network = NTupleNetwork.load(args.resume, mmap=False)
+    else:
+        network = NTupleNetwork.from_pattern(args.pattern)
+    train(network, args.games, args.alpha, args.seed, args.report_every)
+    network.save(args.output)
+    print(f"Saved weights to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Packed engine for NxN boards, 3x3 to 8x8.
+
+A board is a ``bytes`` object of ``size * size`` tile exponents in row-major
+order (0 = empty, 1 = 2, 2 = 4, ...), so cell ``(row, col)`` is byte
+``size * row + col``. Like a bitboard it is immutable and hashable, so it can
+key transposition tables. One byte per cell leaves room for every tile an
+8x8 board can reach.
+
+A move slides each line: a row for LEFT/RIGHT, a column for UP/DOWN. Full
+line tables as in :mod:`game_2048.bitboard` would need ``16 ** size``
+entries. Instead, each distinct line is slid once and the result remembered,
+so the tables fill in with only the lines that games actually produce.
+
+Spawns follow a configurable distribution: pairs of ``(tile, probability)``,
+``((2, 0.9), (4, 0.1))`` by default. Every spawn takes exactly two
+``rng.random()`` draws (see :func:`draw_spawn`). So two games on the same
+seed see the same spawn draws move for move, whatever the solver does, and
+``rng`` can be a :class:`random.Random` or a NumPy ``Generator``.
+"""
+from typing import Dict, List, Sequence, Tuple, Union
+
+from game_2048.constants import DEFAULT_SPAWN, MAX_SIZE, MIN_SIZE
+
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+
+# Board length -> side, for every supported size.
+_SIDES = {size * size: size for size in range(MIN_SIZE, MAX_SIZE + 1)}
+
+# Once a line table grows past this many entries it is emptied and refilled.
+MAX_CACHED_LINES = 1 << 20
+
+Spawn = Tuple[Tuple[int, float], ...]
+
+
+def normalize_spawn(spawn: Union[Dict, Sequence[Tuple[int, float]]]) -> Spawn:
+    """Validate a spawn distribution and return it as ``((tile, probability), ...)``.
+
+    Accepts a mapping or a sequence of pairs. Tiles must be powers of two
+    (``"4"`` is fine, for JSON keys). Probabilities must be positive and
+    sum to 1.
+    """
+    pairs = spawn.items() if isinstance(spawn, dict) else spawn
+    result = []
+    for tile, probability in pairs:
+        tile = int(tile)
+        probability = float(probability)
+        if tile < 2 or tile & (tile - 1):
+            raise ValueError(f"Spawn tile {tile} is not a power of two")
+        if probability <= 0:
+            raise ValueError(f"Spawn probability for {tile} must be positive")
+        result.append((tile, probability))
+    if not result:
+        raise ValueError("Spawn distribution is empty")
+    if abs(sum(p for _, p in result) - 1.0) > 1e-6:
+        raise ValueError("Spawn probabilities must sum to 1")
+    return tuple(sorted(result))
+
+
+def pick_spawn(spawn: Spawn, r: float) -> int:
+    """The tile drawn by ``r`` in ``[0, 1)``.
+
+    Takes the first tile whose cumulative probability exceeds ``r``, so the
+    default distribution gives ``2 if r < 0.9 else 4``.
+    """
+    cumulative = 0.0
+    for tile, probability in spawn:
+        cumulative += probability
+        if r < cumulative:
+            return tile
+    return spawn[-1][0]
+
+
+def draw_spawn(rng, cells: Sequence[int], spawn: Spawn = DEFAULT_SPAWN) -> Tuple[int, int]:
+    """Pick ``(cell, tile)`` for a spawn: the cell from ``cells``, the tile from ``spawn``.
+
+    Always two ``rng.random()`` draws, the cell first. ``rng.choice`` would
+    use a varying number of draws, so seeded games would drift apart as
+    soon as two solvers left different numbers of empty cells.
+    """
+    cell = cells[int(rng.random() * len(cells))]
+    return cell, pick_spawn(spawn, rng.random())
+
+
+def spawn_outcomes(spawn: Spawn) -> List[Tuple[int, float]]:
+    """``(exponent, probability)`` for each tile ``spawn`` can produce."""
+    return [(tile.bit_length() - 1, probability) for tile, probability in spawn]
+
+
+def size_of(board: bytes) -> int:
+    return _SIDES[len(board)]
+
+
+def _slide(line: bytes) -> Tuple[bytes, int]:
+    tiles = [x for x in line if x]
+    merged = []
+    score = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+            merged.append(tiles[i] + 1)
+            score += 1 << (tiles[i] + 1)
+            i += 2
+        else:
+            merged.append(tiles[i])
+            i += 1
+    merged.extend([0] * (len(line) - len(merged)))
+    return bytes(merged), score
+
+
+def _slide_back(line: bytes) -> Tuple[bytes, int]:
+    moved, score = _slide(line[::-1])
+    return moved[::-1], score
+
+
+# line -> (moved line, merge score), towards index 0 and away from it.
+_FORWARD: Dict[bytes, Tuple[bytes, int]] = {}
+_BACKWARD: Dict[bytes, Tuple[bytes, int]] = {}
+
+
+def _lookup(table, slide, line: bytes) -> Tuple[bytes, int]:
+    result = table.get(line)
+    if result is None:
+        if len(table) >= MAX_CACHED_LINES:
+            table.clear()
+        result = table[line] = slide(line)
+    return result
+
+
+def _move_rows(board: bytes, table, slide) -> Tuple[bytes, int]:
+    n = _SIDES[len(board)]
+    out = bytearray(len(board))
+    score = 0
+    for start in range(0, n * n, n):
+        end = start + n
+        line = board[start:end]
+        result = table.get(line)
+        if result is None:
+            result = _lookup(table, slide, line)
+        out[start:end] = result[0]
+        score += result[1]
+    return bytes(out), score
+
+
+def _move_cols(board: bytes, table, slide) -> Tuple[bytes, int]:
+    n = _SIDES[len(board)]
+    out = bytearray(len(board))
+    score = 0
+    for col in range(n):
+        line = board[col::n]
+        result = table.get(line)
+        if result is None:
+            result = _lookup(table, slide, line)
+        out[col::n] = result[0]
+        score += result[1]
+    return bytes(out), score
+
+
+def move_left(board: bytes) -> Tuple[bytes, int]:
+    return _move_rows(board, _FORWARD, _slide)
+
+
+def move_right(board: bytes) -> Tuple[bytes, int]:
+    return _move_rows(board, _BACKWARD, _slide_back)
+
+
+def move_up(board: bytes) -> Tuple[bytes, int]:
+    return _move_cols(board, _FORWARD, _slide)
+
+
+def move_down(board: bytes) -> Tuple[bytes, int]:
+    return _move_cols(board, _BACKWARD, _slide_back)
+
+
+MOVES = {
+    "UP": move_up,
+    "DOWN": move_down,
+    "LEFT": move_left,
+    "RIGHT": move_right,
+}
+
+
+def move(board: bytes, direction: str) -> Tuple[bytes, int]:
+    """Apply ``direction`` and return ``(new_board, score_gained)``.
+
+    The move is legal iff ``new_board != board``.
+    """
+    return MOVES[direction](board)
+
+
+def from_grid(grid: List[List[int]]) -> bytes:
+    """Pack a square grid of tile values."""
+    if len(grid) * len(grid) not in _SIDES:
+        raise ValueError(f"Board size {len(grid)} is outside {MIN_SIZE}..{MAX_SIZE}")
+    return bytes(value.bit_length() - 1 if value else 0 for row in grid for value in row)
+
+
+def to_grid(board: bytes) -> List[List[int]]:
+    n = _SIDES[len(board)]
+    values = [1 << exponent if exponent else 0 for exponent in board]
+    return [values[start:start + n] for start in range(0, n * n, n)]
+
+
+def empty_cells(board: bytes) -> List[int]:
+    return [i for i, exponent in enumerate(board) if not exponent]
+
+
+def count_empty(board: bytes) -> int:
+    return board.count(0)
+
+
+def max_exponent(board: bytes) -> int:
+    return max(board)
+
+
+def set_cell(board: bytes, index: int, exponent: int) -> bytes:
+    return board[:index] + bytes((exponent,)) + board[index + 1:]
+
+
+def add_random_tile(board: bytes, rng, spawn: Spawn = DEFAULT_SPAWN) -> bytes:
+    """Spawn a tile from ``spawn`` on a random empty cell, drawing from ``rng``."""
+    cells = empty_cells(board)
+    if not cells:
+        return board
+    cell, tile = draw_spawn(rng, cells, spawn)
+    return set_cell(board, cell, tile.bit_length() - 1)
+
+
+def can_move(board: bytes) -> bool:
+    if 0 in board:
+        return True
+    return any(MOVES[d](board)[0] != board for d in DIRECTIONS)
+
+
+def legal_moves(board: bytes) -> List[Tuple[str, bytes, int]]:
+    """List ``(direction, new_board, score)`` for every move that changes the board."""
+    moves = []
+    for direction in DIRECTIONS:
+        new_board, score = MOVES[direction](board)
+        if new_board != board:
+            moves.append((direction, new_board, score))
+    return moves
+
+
+def move_grid(grid: List[List[int]], direction: str) -> Tuple[List[List[int]], int, bool]:
+    """Same contract as :func:`game_2048.bitboard.move_grid`, for any supported size."""
+    board = from_grid(grid)
+    new_board, score = MOVES[direction](board)
+    if new_board == board:
+        return [row[:] for row in grid], 0, False
+    return to_grid(new_board), score, True
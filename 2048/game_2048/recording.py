@@ -0,0 +1,271 @@
+"""Client-side recording of 2048 games: sampled frames and compact move logs.
+
+Frames are rendered locally from the state every ``/move`` response already
+carries, so recording costs the server nothing. Each frame is a PNG named by
+move number (``0042.png``). Rendering, PNG encoding and the file write all
+happen on one background thread fed by a bounded queue. When the writer
+falls behind, ``record`` blocks instead of letting the backlog grow.
+
+A move log is a small text file with one line per move. It holds the
+direction, the board after the spawn, and the score. The game's final line
+also carries its status:
+
+    # 2048 move log v1 game_id=<id>
+    0 - 1000000000001000 0
+    1 L 2000000000000010 4
+    ...
+    812 D 1234a7b65432... 15820 over
+
+The board is written as one character per cell, row by row. Each
+character is the tile's exponent in base 32, with ``0`` for empty. Use
+:func:`render_move_log` to turn a log into frames later, offline.
+"""
+import argparse
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from game_2048 import packed
+
+MOVE_LOG_HEADER = "# 2048 move log v1"
+_EXPONENT_DIGITS = "0123456789abcdefghijklmnopqrstuv"
+_DIRECTION_CODES = {"UP": "U", "DOWN": "D", "LEFT": "L", "RIGHT": "R"}
+
+
+class GameSnapshot:
+    """The parts of a server state dict the renderer needs."""
+
+    def __init__(self, grid: List[List[int]], score: int, total_moves: int,
+                 status: str = "ongoing"):
+        self.grid = [row[:] for row in grid]
+        self.score = score
+        self.total_moves = total_moves
+        self.status = status
+        self.max_tile = max(max(row) for row in grid)
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "GameSnapshot":
+        return cls(state["state"], state["score"], state["total_moves"], state.get("status", "ongoing"))
+
+    def is_game_over(self) -> bool:
+        return self.status == "over"
+
+    def has_won(self) -> bool:
+        return self.status == "won"
+
+
+def encode_grid(grid: List[List[int]]) -> str:
+    return "".join(
+        _EXPONENT_DIGITS[value.bit_length() - 1 if value else 0] for row in grid for value in row
+    )
+
+
+def decode_grid(text: str) -> List[List[int]]:
+    values = [1 << _EXPONENT_DIGITS.index(ch) if ch != "0" else 0 for ch in text]
+    size = int(len(values) ** 0.5)
+    return [values[r * size:(r + 1) * size] for r in range(size)]
+
+
+class FrameWriter:
+    """Background thread that renders snapshots and saves them as PNGs."""
+
+    def __init__(self, max_queue: int = 64):
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self.written = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name="frame-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: str, snapshot: GameSnapshot) -> None:
+        self.queue.put((path, snapshot))
+
+    def close(self) -> None:
+        """Write everything still queued, then stop the thread."""
+        self.queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        renderer = None
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            path, snapshot = item
+            try:
+                if renderer is None:
+                    # pygame is only needed once a frame is actually written.
+                    from game_2048.gui import FrameRenderer
+                    renderer = FrameRenderer()
+                renderer.save_png(snapshot, path)
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Failed to write frame {path}: {e}")
+
+
+class GameRecorder:
+    """Records frames and/or a move log for each game a client plays.
+
+    ``every``: save a frame every N moves (0 = only when ``terminal``).
+    ``terminal``: save the final position when the game ends.
+    ``move_log``: write ``moves.log`` for offline rendering.
+    Each game gets its own timestamped folder under ``folder``.
+    """
+
+    def __init__(self, folder: str, every: int = 0, terminal: bool = True,
+                 move_log: bool = False, max_queue: int = 64):
+        self.folder = folder
+        self.every = every
+        self.terminal = terminal
+        self.move_log = move_log
+        self.max_queue = max_queue
+        self.session_folder: Optional[str] = None
+        self.moves = 0
+        self._log = None
+        self._writer: Optional[FrameWriter] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.every or self.terminal or self.move_log)
+
+    def start(self, game_id: str, state: Dict) -> None:
+        self._close_log()
+        self.moves = 0
+        if not self.enabled:
+            return
+        session_folder_name = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.session_folder = os.path.join(self.folder, session_folder_name)
+        os.makedirs(self.session_folder, exist_ok=True)
+        if self.move_log:
+            self._log = open(os.path.join(self.session_folder, "moves.log"), "w")
+            self._log.write(f"{MOVE_LOG_HEADER} game_id={game_id}\n")
+            self._write_log_line("-", state)
+        if self.every:
+            self._submit_frame(state)
+
+    def record(self, direction: str, state: Dict) -> None:
+        """Note one move; ``state`` is the server's response to it."""
+        if self.session_folder is None or not state.get("moved", True):
+            return
+        self.moves += 1
+        if self._log is not None:
+            self._write_log_line(_DIRECTION_CODES[direction], state)
+        final = state.get("status", "ongoing") != "ongoing"
+        if (self.every and self.moves % self.every == 0) or (final and self.terminal):
+            self._submit_frame(state)
+        if final:
+            self._close_log()
+
+    def record_batch(self, previous_state: Dict, response: Dict) -> None:
+        """Note every move of a ``POST /moves`` batch.
+
+        The response only carries the final board, so the boards in between
+        are rebuilt from ``previous_state`` and each step's direction and spawn.
+        """
+        grid = previous_state["state"]
+        steps = response.get("steps", [])
+        for i, step in enumerate(steps):
+            grid, _, _ = packed.move_grid(grid, step["direction"])
+            if step["spawn"]:
+                row, col, value = step["spawn"]
+                grid[row][col] = value
+            last = i == len(steps) - 1
+            self.record(step["direction"], {
+                "state": response["state"] if last else grid,
+                "score": step["score"],
+                "total_moves": previous_state["total_moves"] + i + 1,
+                "status": response["status"] if last else "ongoing",
+            })
+
+    def close(self) -> None:
+        self._close_log()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _submit_frame(self, state: Dict) -> None:
+        if self._writer is None:
+            self._writer = FrameWriter(self.max_queue)
+        path = os.path.join(self.session_folder, f"{self.moves:04d}.png")
+        self._writer.submit(path, GameSnapshot.from_state(state))
+
+    def _write_log_line(self, code: str, state: Dict) -> None:
+        line = f"{self.moves} {code} {encode_grid(state['state'])} {state['score']}"
+        status = state.get("status", "ongoing")
+        if status != "ongoing":
+            line += f" {status}"
+        self._log.write(line + "\n")
+
+    def _close_log(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+def read_move_log(path: str) -> List[GameSnapshot]:
+    """Every position in a move log, starting with the opening one."""
+    snapshots = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            moves, _code, board, score, *status = line.split()
+            snapshots.append(GameSnapshot(
+                decode_grid(board), int(score), int(moves), status[0] if status else "ongoing"
+            ))
+    return snapshots
+
+
+def render_move_log(path: str, output_folder: str, every: int = 1) -> int:
+    """Render every ``every``-th position of a move log, plus the last one.
+
+    Returns the number of frames written.
+    """
+    from game_2048.gui import FrameRenderer
+
+    os.makedirs(output_folder, exist_ok=True)
+    snapshots = read_move_log(path)
+    renderer = FrameRenderer()
+    written = 0
+    for i, snapshot in enumerate(snapshots):
+        if i % every == 0 or i == len(snapshots) - 1:
+            renderer.save_png(snapshot, os.path.join(output_folder, f"{snapshot.total_moves:04d}.png"))
+            written += 1
+    return written
+
+
+def add_recording_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the ``--screenshot-every/--screenshot-final/--move-log`` flags to a client CLI."""
+    parser.add_argument("--screenshot-every", type=int, default=0, metavar="N",
+                        help="save a frame every N moves (default: never)")
+    parser.add_argument("--screenshot-final", action="store_true",
+                        help="save a frame of the final position")
+    parser.add_argument("--move-log", action="store_true",
+                        help="write a compact move log for offline rendering")
+
+
+def recorder_from_args(args, folder: str) -> Optional[GameRecorder]:
+    """The recorder asked for by :func:`add_recording_arguments` flags, if any."""
+    recorder = GameRecorder(folder, every=args.screenshot_every,
+                            terminal=args.screenshot_final, move_log=args.move_log)
+    return recorder if recorder.enabled else None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render a 2048 move log to PNG frames")
+    parser.add_argument("log", help="moves.log written by GameRecorder")
+    parser.add_argument("output", help="folder for the frames")
+    parser.add_argument("--every", type=int, default=1, help="render every Nth position")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    written = render_move_log(args.log, args.output, args.every)
+    print(f"Wrote {written} frames to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""Offline self-play: run a solver against an in-process engine, no HTTP.
+
+A solver is anything with ``get_best_move(grid) -> direction``. It is named
+by a ``"module:Class"`` spec, where ``module`` may be one of the scripts in
+``2048/solver`` (hyphens and all), e.g.
+``2048-solver-october2025-gpt5-codex:OptimizedSolver2048``. Specs, rather
+than classes, are what get sent to worker processes, so each worker builds
+its own solver once and reuses it (and any warm caches) for every game it
+plays.
+
+Games are seeded, and a seed fixes every spawn draw (see
+:func:`game_2048.packed.draw_spawn`). Give several solvers and each plays
+the same seeds, so their per-seed differences come from the solvers, not
+from luck.
+
+Run from the ``2048`` directory::
+
+    python -m game_2048.selfplay 2048-solver-october2025-gpt5-codex:OptimizedSolver2048 \\
+        --games 100 --workers 8 --output results.csv
+    python -m game_2048.selfplay solver-a:Solver solver-b:Solver --games 200 --engine game
+"""
+import argparse
+import csv
+import importlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from game_2048 import bitboard, packed
+from game_2048.constants import DEFAULT_SPAWN, GAME_SIZE
+from game_2048.game import Game2048
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "solver")
+
+RECORD_FIELDS = ("seed", "solver", "engine", "status", "max_tile", "score", "moves", "wall_time")
+
+
+def load_solver_class(spec: str):
+    """Resolve a ``"module:Class"`` spec, looking in ``2048/solver`` too."""
+    module_name, _, class_name = spec.partition(":")
+    if not module_name or not class_name:
+        raise ValueError(f"Solver spec must look like 'module:Class', got {spec!r}")
+    if SOLVER_DIR not in sys.path:
+        sys.path.append(SOLVER_DIR)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class GameEngine:
+    """The full :class:`Game2048` rules, milestones and all."""
+
+    def __init__(self, seed: int, size: int = GAME_SIZE, spawn=DEFAULT_SPAWN):
+        self.game = Game2048(size, spawn, seed)
+
+    @property
+    def grid(self) -> List[List[int]]:
+        return self.game.grid
+
+    @property
+    def score(self) -> int:
+        return self.game.score
+
+    @property
+    def max_tile(self) -> int:
+        return self.game.highest_tile
+
+    def move(self, direction: str) -> bool:
+        return self.game.move(direction)
+
+    def is_over(self) -> bool:
+        return self.game.is_game_over()
+
+
+class BitboardEngine:
+    """Bare bitboard game; faster, but tiles stop at 32768."""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.board = bitboard.add_random_tile(0, self.rng)
+        self.board = bitboard.add_random_tile(self.board, self.rng)
+        self.score = 0
+
+    @property
+    def grid(self) -> List[List[int]]:
+        return bitboard.to_grid(self.board)
+
+    @property
+    def max_tile(self) -> int:
+        return 1 << bitboard.max_exponent(self.board)
+
+    def move(self, direction: str) -> bool:
+        new_board, score = bitboard.move(self.board, direction)
+        if new_board == self.board:
+            return False
+        self.board = new_board
+        self.score += score
+        self.board = bitboard.add_random_tile(self.board, self.rng)
+        return True
+
+    def is_over(self) -> bool:
+        return not bitboard.can_move(self.board)
+
+
+class PackedEngine:
+    """Bare packed NxN game with a configurable spawn distribution."""
+
+    def __init__(self, seed: int, size: int = GAME_SIZE, spawn=DEFAULT_SPAWN):
+        self.rng = random.Random(seed)
+        self.spawn = packed.normalize_spawn(spawn)
+        self.board = packed.add_random_tile(bytes(size * size), self.rng, self.spawn)
+        self.board = packed.add_random_tile(self.board, self.rng, self.spawn)
+        self.score = 0
+
+    @property
+    def grid(self) -> List[List[int]]:
+        return packed.to_grid(self.board)
+
+    @property
+    def max_tile(self) -> int:
+        return 1 << packed.max_exponent(self.board)
+
+    def move(self, direction: str) -> bool:
+        new_board, score = packed.move(self.board, direction)
+        if new_board == self.board:
+            return False
+        self.score += score
+        self.board = packed.add_random_tile(new_board, self.rng, self.spawn)
+        return True
+
+    def is_over(self) -> bool:
+        return not packed.can_move(self.board)
+
+
+ENGINES = {
+    "game": GameEngine,
+    "bitboard": BitboardEngine,
+    "packed": PackedEngine,
+}
+
+
+def play_game(solver, engine, max_moves: Optional[int] = None) -> Dict:
+    """Play one game to the end and summarise it.
+
+    ``status`` is ``"over"`` when no move is left, ``"stuck"`` when the
+    solver returned nothing or an illegal move, and ``"max_moves"`` when the
+    move limit was hit first.
+    """
+    start = time.perf_counter()
+    moves = 0
+    status = "over"
+    while not engine.is_over():
+        if max_moves is not None and moves >= max_moves:
+            status = "max_moves"
+            break
+        direction = solver.get_best_move(engine.grid)
+        if not direction or not engine.move(direction):
+            status = "stuck"
+            break
+        moves += 1
+    return {
+        "status": status,
+        "max_tile": engine.max_tile,
+        "score": engine.score,
+        "moves": moves,
+        "wall_time": round(time.perf_counter() - start, 6),
+    }
+
+
+# Solvers built in this process, keyed by (spec, options), reused across games.
+_solvers: Dict = {}
+
+
+def _get_solver(spec: str, options: Dict):
+    key = (spec, json.dumps(options, sort_keys=True))
+    if key not in _solvers:
+        _solvers[key] = load_solver_class(spec)(**options)
+    return _solvers[key]
+
+
+def _play_seed(spec: str, options: Dict, engine_name: str, engine_options: Dict,
+               seed: int, max_moves: Optional[int]) -> Dict:
+    solver = _get_solver(spec, options)
+    record = {"seed": seed, "solver": spec, "engine": engine_name}
+    record.update(play_game(solver, ENGINES[engine_name](seed, **engine_options), max_moves))
+    return record
+
+
+class SelfPlayRunner:
+    """Plays seeded games of one solver on one engine.
+
+    ``engine_options`` go to the engine; the ``game`` and ``packed`` engines
+    take ``size`` and ``spawn``, the ``bitboard`` engine takes none.
+    """
+
+    def __init__(self, solver_spec: str, solver_options: Optional[Dict] = None,
+                 engine: str = "bitboard", workers: int = 1, max_moves: Optional[int] = None,
+                 engine_options: Optional[Dict] = None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; choose from {sorted(ENGINES)}")
+        if engine == "bitboard" and engine_options:
+            raise ValueError("The bitboard engine is 4x4 only and takes no options; "
+                             "use the game or packed engine")
+        self.solver_spec = solver_spec
+        self.solver_options = solver_options or {}
+        self.engine = engine
+        self.engine_options = engine_options or {}
+        self.workers = workers
+        self.max_moves = max_moves
+
+    def run(self, seeds: Iterable[int], output: Optional[str] = None) -> List[Dict]:
+        """Play one game per seed; records come back in seed order.
+
+        With ``output`` set, each record is also written (CSV or JSONL,
+        picked by extension) as soon as its game finishes.
+        """
+        writer = RecordWriter(output) if output else None
+        try:
+            return self._run(seeds, writer)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def _run(self, seeds: Iterable[int], writer: Optional["RecordWriter"]) -> List[Dict]:
+        seeds = list(seeds)
+        args = (self.solver_spec, self.solver_options, self.engine, self.engine_options)
+        records = []
+        if self.workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = [
+                    executor.submit(_play_seed, *args, seed, self.max_moves) for seed in seeds
+                ]
+                for future in futures:
+                    records.append(self._emit(writer, future.result()))
+        else:
+            for seed in seeds:
+                records.append(self._emit(writer, _play_seed(*args, seed, self.max_moves)))
+        return records
+
+    @staticmethod
+    def _emit(writer, record: Dict) -> Dict:
+        if writer is not None:
+            writer.write(record)
+        return record
+
+
+class RecordWriter:
+    """Append records to a ``.csv`` or ``.jsonl`` file, flushing each one."""
+
+    def __init__(self, path: str):
+        self.format = os.path.splitext(path)[1].lower()
+        if self.format not in (".csv", ".jsonl"):
+            raise ValueError(f"Output must be .csv or .jsonl, got {path!r}")
+        self.file = open(path, "w", newline="")
+        self._csv = None
+        if self.format == ".csv":
+            self._csv = csv.DictWriter(self.file, fieldnames=RECORD_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, record: Dict) -> None:
+        if self._csv is not None:
+            self._csv.writerow(record)
+        else:
+            self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def compare_solvers(solver_specs: List[str], seeds: Iterable[int], output: Optional[str] = None,
+                    **runner_options) -> Dict[str, List[Dict]]:
+    """Play every solver on the same seeds; returns ``{spec: records}``.
+
+    ``runner_options`` go to each :class:`SelfPlayRunner`. With ``output``
+    set, all the records go to one file, told apart by their ``solver``.
+    """
+    seeds = list(seeds)
+    writer = RecordWriter(output) if output else None
+    results = {}
+    try:
+        for spec in solver_specs:
+            results[spec] = SelfPlayRunner(spec, **runner_options)._run(seeds, writer)
+    finally:
+        if writer is not None:
+            writer.close()
+    return results
+
+
+def paired_difference(baseline: List[Dict], other: List[Dict]) -> Dict:
+    """Compare two solvers' records seed by seed; positive means ``other`` scored more."""
+    by_seed = {r["seed"]: r for r in baseline}
+    diffs = [r["score"] - by_seed[r["seed"]]["score"] for r in other if r["seed"] in by_seed]
+    if not diffs:
+        return {"games": 0}
+    return {
+        "games": len(diffs),
+        "mean_score_diff": sum(diffs) / len(diffs),
+        "better": sum(d > 0 for d in diffs),
+        "worse": sum(d < 0 for d in diffs),
+        "tied": sum(d == 0 for d in diffs),
+    }
+
+
+def summarize(records: List[Dict]) -> Dict:
+    games = len(records)
+    if not games:
+        return {"games": 0}
+    max_tiles = [r["max_tile"] for r in records]
+    return {
+        "games": games,
+        "mean_score": sum(r["score"] for r in records) / games,
+        "best_tile": max(max_tiles),
+        "reached_2048": sum(t >= 2048 for t in max_tiles) / games,
+        "mean_moves": sum(r["moves"] for r in records) / games,
+        "wall_time": sum(r["wall_time"] for r in records),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play 2048 solvers offline")
+    parser.add_argument("solvers", nargs="+", metavar="solver",
+                        help="solver spec, e.g. 2048-solver-claude:Advanced2048Solver; "
+                             "give several to compare them on the same seeds")
+    parser.add_argument("--options", default="{}", help="JSON keyword arguments for every solver")
+    parser.add_argument("--engine", choices=sorted(ENGINES),
+                        help="default: bitboard, or packed when --size is given")
+    parser.add_argument("--size", type=int, help="board size for the game and packed engines")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-moves", type=int, default=None)
+    parser.add_argument("--output", help="write per-game records to this .csv or .jsonl file")
+    args = parser.parse_args(argv)
+    if args.engine is None:
+        args.engine = "packed" if args.size else "bitboard"
+    elif args.engine == "bitboard" and args.size:
+        parser.error("--size needs the game or packed engine; the bitboard engine is 4x4 only")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = compare_solvers(
+        args.solvers, range(args.seed, args.seed + args.games), args.output,
+        solver_options=json.loads(args.options), engine=args.engine,
+        workers=args.workers, max_moves=args.max_moves,
+        engine_options={"size": args.size} if args.size else None,
+    )
+    if len(results) == 1:
+        print(json.dumps(summarize(results[args.solvers[0]]), indent=2))
+        return
+    baseline = results[args.solvers[0]]
+    report = {}
+    for spec, records in results.items():
+        report[spec] = summarize(records)
+        if records is not baseline:
+            report[spec]["vs_" + args.solvers[0]] = paired_difference(baseline, records)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
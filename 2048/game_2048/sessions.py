@@ -0,0 +1,106 @@
+"""Registry of concurrent games for the 2048 HTTP servers.
+
+Each ``POST /start`` creates a new :class:`Session` keyed by its game's
+``game_id`` instead of replacing a single global game, so many solver
+clients can share one server. Sessions are kept in least-recently-used
+order; the registry evicts the oldest once ``max_sessions`` is exceeded and
+drops any session idle for longer than ``ttl_seconds``. ``on_evict`` is
+called with each session that leaves the registry, evicted or removed, so
+the server can release what the game holds (its game log, for instance).
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+
+class Session:
+    def __init__(self, game, now: float):
+        self.game = game
+        self.game_id = game.game_id
+        # Serializes moves/reads on this game; other sessions are unaffected.
+        self.lock = threading.Lock()
+        self.created_at = now
+        self.last_access = now
+
+
+class SessionRegistry:
+    def __init__(self, game_factory: Callable, max_sessions: int = 64,
+                 ttl_seconds: Optional[float] = 3600.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 on_evict: Optional[Callable[[Session], None]] = None):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.game_factory = game_factory
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.on_evict = on_evict
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._latest_id: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def create(self, *args, **kwargs) -> Session:
+        """Start a new game and register it as the latest session."""
+        game = self.game_factory(*args, **kwargs)
+        with self._lock:
+            now = self.clock()
+            self._evict_expired(now)
+            session = Session(game, now)
+            self._sessions[session.game_id] = session
+            self._latest_id = session.game_id
+            while len(self._sessions) > self.max_sessions:
+                self._evicted(self._sessions.popitem(last=False)[1])
+            return session
+
+    def get(self, game_id: Optional[str] = None) -> Optional[Session]:
+        """Look up a session and mark it as recently used.
+
+        ``game_id=None`` resolves to the most recently started game, which
+        keeps single-game clients that never send a ``game_id`` working.
+        """
+        with self._lock:
+            now = self.clock()
+            self._evict_expired(now)
+            if game_id is None:
+                game_id = self._latest_id
+            session = self._sessions.get(game_id) if game_id else None
+            if session is not None:
+                session.last_access = now
+                self._sessions.move_to_end(game_id)
+            return session
+
+    def latest(self) -> Optional[Session]:
+        """Most recently started session, without touching its LRU position."""
+        with self._lock:
+            return self._sessions.get(self._latest_id) if self._latest_id else None
+
+    def remove(self, game_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(game_id, None)
+            if session is None:
+                return False
+            self._evicted(session)
+            return True
+
+    def game_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def _evict_expired(self, now: float) -> None:
+        if self.ttl_seconds is None:
+            return
+        # Sessions are in LRU order, so expired ones are all at the front.
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_access <= self.ttl_seconds:
+                break
+            self._evicted(self._sessions.popitem(last=False)[1])
+
+    def _evicted(self, session: Session) -> None:
+        if self.on_evict is not None:
+            self.on_evict(session)
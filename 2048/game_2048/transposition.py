@@ -0,0 +1,95 @@
+"""Fixed-capacity transposition table for the expectimax solvers.
+
+Entries are keyed by an exact integer key, normally the 64-bit bitboard
+from :mod:`game_2048.bitboard` with a node-type bit appended (see
+:func:`node_key`). A multiplicative hash of the key picks a bucket of two
+slots:
+
+* slot 0 is depth-preferred: it keeps the deepest search seen for the
+  bucket and is only overwritten by an equal or deeper one, and
+* slot 1 is always-replace: it takes whatever did not win slot 0.
+
+Either way a key's entry is never replaced by a shallower search of the
+same key.
+
+A probe hits when the stored key matches and the stored search depth is
+at least the requested depth, so deeper results answer shallower probes.
+Memory use is fixed by ``size_bits``; nothing ever needs pruning.
+"""
+from typing import Optional
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15  # 2**64 / phi, for Fibonacci hashing
+_EMPTY = -1
+
+MAX_NODE = 0
+CHANCE_NODE = 1
+
+
+def node_key(board: int, node_type: int) -> int:
+    """Combine a bitboard with the node type so max/chance entries never clash."""
+    return (board << 1) | node_type
+
+
+class TranspositionTable:
+    def __init__(self, size_bits: int = 18):
+        buckets = 1 << size_bits
+        self.size_bits = size_bits
+        self._shift = 64 - size_bits
+        self.keys = [_EMPTY] * (2 * buckets)
+        self.depths = [0] * (2 * buckets)
+        self.values = [0.0] * (2 * buckets)
+        self.probes = 0
+        self.hits = 0
+
+    def _slot(self, key: int) -> int:
+        return (((key * _GOLDEN) & _MASK64) >> self._shift) << 1
+
+    def probe(self, key: int, depth: int) -> Optional[float]:
+        """Value stored for ``key`` from a search at least ``depth`` deep."""
+        self.probes += 1
+        slot = self._slot(key)
+        keys = self.keys
+        if keys[slot] == key and self.depths[slot] >= depth:
+            self.hits += 1
+            return self.values[slot]
+        slot += 1
+        if keys[slot] == key and self.depths[slot] >= depth:
+            self.hits += 1
+            return self.values[slot]
+        return None
+
+    def store(self, key: int, depth: int, value: float) -> None:
+        slot = self._slot(key)
+        keys, depths, values = self.keys, self.depths, self.values
+        if keys[slot] == key:
+            if depth >= depths[slot]:
+                depths[slot] = depth
+                values[slot] = value
+            return
+        if keys[slot + 1] == key and depth < depths[slot + 1]:
+            return
+        if keys[slot] == _EMPTY or depth >= depths[slot]:
+            # Demote the previous deep entry rather than dropping it outright.
+            keys[slot + 1] = keys[slot]
+            depths[slot + 1] = depths[slot]
+            values[slot + 1] = values[slot]
+            keys[slot] = key
+            depths[slot] = depth
+            values[slot] = value
+        else:
+            keys[slot + 1] = key
+            depths[slot + 1] = depth
+            values[slot + 1] = value
+
+    def clear(self) -> None:
+        n = len(self.keys)
+        self.keys = [_EMPTY] * n
+        self.depths = [0] * n
+        self.values = [0.0] * n
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
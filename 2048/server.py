@@ -1,14 +1,20 @@
 # server.py
 from os import environ
 environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
+import argparse
+import os
 import threading
 import uuid
 import io
 from flask import Flask, jsonify, request, send_file
+from game_2048.api import apply_moves, parse_directions
 from game_2048.game import Game2048
+from game_2048.gamelog import EXTENSION, GameLogWriter
 from game_2048.gui import GameGUI, TextRenderer
+from game_2048.sessions import SessionRegistry
 from game_2048.constants import (
     BACKGROUND,
+    DEFAULT_SPAWN,
     GAME_SIZE,
     TEXT_DARK,
     WINDOW_HEIGHT,
@@ -17,17 +23,50 @@ from game_2048.constants import (
 import pygame
 
 class ServerGame(Game2048):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, size=GAME_SIZE, spawn=DEFAULT_SPAWN, seed=None, record_dir=None):
+        super().__init__(size, spawn, seed)
+        # A seed the client asked for is replayed by reset(); a drawn one is not.
+        self.start_seed = seed
         self.game_id = str(uuid.uuid4())
         self.game_won = False
         self.game_over = False
+        # When set, the game is streamed to <record_dir>/<game_id>.g2048.
+        self.record_dir = record_dir
+        # Optional GameLogWriter; every accepted move is appended to it.
+        self.log = None
+        self.open_log()
 
     def reset(self):
-        super().__init__()
+        self.close_log()
+        super().__init__(self.size, self.spawn, self.start_seed)
         self.game_id = str(uuid.uuid4())
         self.game_won = False
         self.game_over = False
+        self.open_log()
+
+    def move(self, direction):
+        score = self.score
+        moved = super().move(direction)
+        if moved:
+            self.game_over = self.is_game_over()
+            self.game_won = self.has_won()
+            if self.log is not None:
+                self.log.append(direction, self.last_spawn, self.score - score)
+                if self.game_over or self.game_won:
+                    self.close_log()
+        return moved
+
+    def open_log(self):
+        if self.record_dir:
+            path = os.path.join(self.record_dir, self.game_id + EXTENSION)
+            self.log = GameLogWriter.for_game(
+                path, self, seed=self.seed, config={"game_id": self.game_id}
+            )
+
+    def close_log(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
 
     def get_state_dict(self):
         status = "won" if self.game_won else "over" if self.game_over else "ongoing"
@@ -37,24 +76,28 @@ class ServerGame(Game2048):
             "score": self.score,
             "total_moves": self.total_moves,
             "max_tile": self.max_tile,
+            "seed": self.seed,
             "status": status
         }
 
 class ServerGUI(GameGUI):
-    def __init__(self, server_game):
-        pygame.init()
-        self.window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption('2048 Extended Server')
+    def __init__(self, server_game, headless=False):
+        self.headless = headless
+        if headless:
+            # No display at all: only fonts are needed to render screenshots.
+            pygame.font.init()
+            self.window = None
+        else:
+            pygame.init()
+            self.window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+            pygame.display.set_caption('2048 Extended Server')
         self.clock = pygame.time.Clock()
         self.game = server_game
-        
-        # Calculate grid measurements
-        self.grid_padding = 10
-        self.grid_top = 100
-        self.tile_size = (WINDOW_WIDTH - (self.grid_padding * 5)) // GAME_SIZE
-        self.grid_size = self.tile_size * GAME_SIZE + self.grid_padding * (GAME_SIZE + 1)
+        self._init_layout()
 
     def reset_screen(self):
+        if self.headless:
+            return
         self.window.fill(BACKGROUND)
         TextRenderer.draw_text(
             self.window,
@@ -66,53 +109,124 @@ class ServerGUI(GameGUI):
         )
         pygame.display.update()
 
-    def capture_screenshot(self):
-        if pygame.display.get_surface():
-            img_bytes = io.BytesIO()
-            pygame.image.save(pygame.display.get_surface(), img_bytes, "PNG")
-            img_bytes.seek(0)
-            return img_bytes
-        return None
+    def capture_screenshot(self, game):
+        """Render ``game`` to an off-screen surface and return PNG bytes.
+
+        Works the same with or without a window, and never disturbs the
+        game the window is showing.
+        """
+        surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.render(surface, game)
+        img_bytes = io.BytesIO()
+        pygame.image.save(surface, img_bytes, "PNG")
+        img_bytes.seek(0)
+        return img_bytes
 
 class FlaskServer:
-    def __init__(self):
+    def __init__(self, max_sessions=64, session_ttl=3600.0, headless=False, record_dir=None):
         self.app = Flask(__name__)
-        self.game = ServerGame()
-        self.gui = ServerGUI(self.game)
+        self.headless = headless
+        # When set, every game is streamed to <record_dir>/<game_id>.g2048.
+        self.record_dir = record_dir
+        if record_dir:
+            os.makedirs(record_dir, exist_ok=True)
+        self.sessions = SessionRegistry(
+            self._new_game, max_sessions=max_sessions, ttl_seconds=session_ttl,
+            on_evict=lambda session: session.game.close_log(),
+        )
+        # The window always shows the most recently started game.
+        self.game = self.sessions.create().game
+        self.gui = ServerGUI(self.game, headless=headless)
         self.setup_routes()
         self._running = True
 
+    def _new_game(self, size=GAME_SIZE, spawn=DEFAULT_SPAWN, seed=None):
+        return ServerGame(size, spawn, seed, record_dir=self.record_dir)
+
+    def _request_session(self):
+        game_id = request.args.get("game_id")
+        if game_id is None:
+            payload = request.get_json(silent=True) or {}
+            game_id = payload.get("game_id")
+        return self.sessions.get(game_id)
+
     def setup_routes(self):
         @self.app.route('/start', methods=['POST'])
         def start_game():
-            self.game.reset()
+            payload = request.get_json(silent=True) or {}
+            try:
+                seed = payload.get("seed")
+                if seed is not None:
+                    seed = int(seed)
+                    if not 0 <= seed < 1 << 64:
+                        raise ValueError("seed must be between 0 and 2**64 - 1")
+                session = self.sessions.create(
+                    size=int(payload.get("size", GAME_SIZE)),
+                    spawn=payload.get("spawn", DEFAULT_SPAWN),
+                    seed=seed,
+                )
+            except (TypeError, ValueError) as e:
+                return jsonify({"error": str(e)}), 400
+            self.game = self.gui.game = session.game
             self.gui.reset_screen()
-            return jsonify(self.game.get_state_dict()), 201
+            return jsonify(session.game.get_state_dict()), 201
 
         @self.app.route('/move', methods=['POST'])
         def make_move():
+            session = self._request_session()
+            if session is None:
+                return jsonify({"error": "Unknown game_id"}), 404
+
             payload = request.get_json(silent=True) or {}
             direction = payload.get("direction")
             if direction not in ["UP", "DOWN", "LEFT", "RIGHT"]:
                 return jsonify({"error": "Invalid move direction"}), 400
 
-            moved = self.game.move(direction)
-            if moved:
-                self.gui.draw()
-            return jsonify({**self.game.get_state_dict(), "moved": moved})
+            with session.lock:
+                moved = session.game.move(direction)
+                state = session.game.get_state_dict()
+            return jsonify({**state, "moved": moved})
+
+        @self.app.route('/moves', methods=['POST'])
+        def make_moves():
+            session = self._request_session()
+            if session is None:
+                return jsonify({"error": "Unknown game_id"}), 404
+
+            directions, error = parse_directions(request.get_json(silent=True) or {})
+            if error:
+                return jsonify({"error": error}), 400
+
+            with session.lock:
+                result = apply_moves(session.game, directions)
+                state = session.game.get_state_dict()
+            return jsonify({**state, **result})
 
         @self.app.route('/state', methods=['GET'])
         def get_state():
-            return jsonify(self.game.get_state_dict())
+            session = self._request_session()
+            if session is None:
+                return jsonify({"error": "Unknown game_id"}), 404
+            with session.lock:
+                return jsonify(session.game.get_state_dict())
 
         @self.app.route('/screenshot', methods=['GET'])
         def screenshot():
-            img_bytes = self.gui.capture_screenshot()
+            session = self._request_session()
+            if session is None:
+                return jsonify({"error": "Unknown game_id"}), 404
+            with session.lock:
+                img_bytes = self.gui.capture_screenshot(session.game)
             if img_bytes:
                 return send_file(img_bytes, mimetype='image/png')
             return jsonify({"error": "Screenshot failed"}), 500
 
     def run(self):
+        if self.headless:
+            # Nothing to draw, so Flask gets the main thread to itself.
+            self.app.run(debug=False, use_reloader=False)
+            return
+
         # Start Flask in a separate thread
         flask_thread = threading.Thread(
             target=lambda: self.app.run(debug=False, use_reloader=False)
@@ -123,20 +237,55 @@ class FlaskServer:
         # Main game loop
         try:
             self.gui.reset_screen()
+            shown = None
             while self._running:
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         self._running = False
+                    elif event.type == pygame.VIDEOEXPOSE:
+                        shown = None
 
-                self.gui.draw()
+                # Redraw only when the displayed game changes, not every frame
+                game = self.gui.game
+                frame = (game.game_id, game.total_moves)
+                if frame != shown:
+                    self.gui.draw()
+                    shown = frame
                 self.gui.clock.tick(60)
         except Exception as e:
             print(f"Error in game loop: {e}")
         finally:
             pygame.quit()
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="2048 Extended solver server")
+    parser.add_argument(
+        "--max-sessions", type=int, default=64,
+        help="Maximum concurrent games before the least recently used is evicted.",
+    )
+    parser.add_argument(
+        "--session-ttl", type=float, default=3600.0,
+        help="Seconds a game may sit idle before it is evicted.",
+    )
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="Open no window; /screenshot renders the requested game off-screen.",
+    )
+    parser.add_argument(
+        "--record-dir",
+        help="Stream every game to a compact binary log in this folder "
+             "(inspect with python -m game_2048.gamelog).",
+    )
+    return parser.parse_args(argv)
+
 def main():
-    server = FlaskServer()
+    args = parse_args()
+    server = FlaskServer(
+        max_sessions=args.max_sessions,
+        session_ttl=args.session_ttl,
+        headless=args.headless,
+        record_dir=args.record_dir,
+    )
     try:
         server.run()
     except KeyboardInterrupt:
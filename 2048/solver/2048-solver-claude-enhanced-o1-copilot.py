@@ -1,11 +1,12 @@
+import argparse
 import copy
 from typing import List, Tuple
 import random
 import numpy as np
 import requests
 import os
+import sys
 import time
-from datetime import datetime
 import math
 
 # Import Numba for JIT compilation
@@ -13,22 +14,31 @@ from numba import njit, prange
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Make the shared ``game_2048`` package importable when this script is run
+# directly (``python3 2048/solver/<file>.py``).
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from game_2048 import bitboard  # noqa: E402
+from game_2048.transposition import (  # noqa: E402
+    CHANCE_NODE, MAX_NODE, TranspositionTable, node_key,
+)
+from game_2048.recording import add_recording_arguments, recorder_from_args  # noqa: E402
+
 class Game2048Client:
-    def __init__(self, server_url="http://127.0.0.1:5000"):
+    def __init__(self, server_url="http://127.0.0.1:5000", recorder=None):
         self.server_url = server_url
         self.game_id = None
-        self.screenshot_count = 0
-        self.screenshot_folder = os.path.join(SCRIPT_DIR, "screenshots")
+        self.recorder = recorder
 
     def start_game(self):
         response = requests.post(f"{self.server_url}/start")
         if response.status_code == 201:
             data = response.json()
             self.game_id = data["game_id"]
-            session_folder_name = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.session_folder = os.path.join(self.screenshot_folder, session_folder_name)
-            os.makedirs(self.session_folder, exist_ok=True)
-            self.screenshot_count = 0
+            if self.recorder is not None:
+                self.recorder.start(self.game_id, data)
             print("New game started!")
             print("Game ID:", self.game_id)
         else:
@@ -39,10 +49,15 @@ class Game2048Client:
         if self.game_id is None:
             print("Please start a game first.")
             return None
-        response = requests.post(f"{self.server_url}/move", json={"direction": direction})
+        response = requests.post(
+            f"{self.server_url}/move",
+            params={"game_id": self.game_id},
+            json={"direction": direction},
+        )
         if response.status_code == 200:
             data = response.json()
-            self.capture_screenshot()  # Capture screenshot after each move
+            if self.recorder is not None:
+                self.recorder.record(direction, data)
             return data
         else:
             print("Failed to make a move.")
@@ -53,7 +68,7 @@ class Game2048Client:
         if self.game_id is None:
             print("Please start a game first.")
             return None
-        response = requests.get(f"{self.server_url}/state")
+        response = requests.get(f"{self.server_url}/state", params={"game_id": self.game_id})
         if response.status_code == 200:
             return response.json()
         else:
@@ -61,23 +76,6 @@ class Game2048Client:
             print(response.json())
             return None
 
-    def capture_screenshot(self):
-        """Fetches the screenshot from the server and saves it locally in sequence format."""
-        if self.game_id is None:
-            print("Please start a game first.")
-            return
-
-        response = requests.get(f"{self.server_url}/screenshot")
-        if response.status_code == 200:
-            filename = f"{self.screenshot_count:04d}.png"
-            screenshot_path = os.path.join(self.session_folder, filename)
-            with open(screenshot_path, "wb") as f:
-                f.write(response.content)
-            self.screenshot_count += 1
-        else:
-            print("Failed to capture screenshot.")
-            print(response.json())
-
     def print_final_stats(self, grid, score, total_moves, status):
         """Prints the final statistics of the game."""
         max_tile = self.get_max_tile(grid)
@@ -99,10 +97,11 @@ class Game2048Client:
         print("\n")
 
 class OptimizedSolver2048:
-    def __init__(self, base_depth: int = 3):
+    def __init__(self, base_depth: int = 3, tt_size_bits: int = 18):
         self.DIRECTIONS = ["UP", "RIGHT", "DOWN", "LEFT"]
         self.base_depth = base_depth
-        self.transposition_table = {}
+        # Leaf and interior values keyed by bitboard; kept across moves.
+        self.transposition_table = TranspositionTable(tt_size_bits)
         self.move_history = {dir: 0 for dir in self.DIRECTIONS}
         
         # Enhanced weight matrices
@@ -121,11 +120,6 @@ class OptimizedSolver2048:
         ])
 
     def evaluate_position(self, grid: List[List[int]], depth_remaining: int) -> float:
-        # Cache check
-        grid_tuple = tuple(map(tuple, grid))
-        if grid_tuple in self.transposition_table:
-            return self.transposition_table[grid_tuple]
-
         empty_cells = len(self.get_empty_cells(grid))
         max_tile = max(max(row) for row in grid)
         stage = self.get_stage(grid)
@@ -148,9 +142,6 @@ class OptimizedSolver2048:
             max_tile * weights['max_tile'] +
             depth_remaining * weights['depth']
         )
-
-        # Cache result
-        self.transposition_table[grid_tuple] = score
         return score
 
     def get_stage_weights(self, stage: str) -> dict:
@@ -221,7 +212,21 @@ class OptimizedSolver2048:
             return self.base_depth + 1
         return self.base_depth
 
-    def expectimax(self, grid: List[List[int]], depth: int, is_max: bool, alpha: float = float('-inf')) -> Tuple[float, str]:
+    def expectimax(self, grid: List[List[int]], depth: int, is_max: bool, alpha: float = float('-inf'),
+                   use_cache: bool = True) -> Tuple[float, str]:
+        # A cached value carries no best move, so the root passes use_cache=False.
+        key = node_key(bitboard.from_grid(grid), MAX_NODE if is_max else CHANCE_NODE)
+        if use_cache:
+            cached = self.transposition_table.probe(key, depth)
+            if cached is not None:
+                return cached, ""
+
+        score, best_move = self._expectimax_node(grid, depth, is_max, alpha)
+        self.transposition_table.store(key, depth, score)
+        return score, best_move
+
+    def _expectimax_node(self, grid: List[List[int]], depth: int, is_max: bool,
+                         alpha: float) -> Tuple[float, str]:
         if depth == 0:
             return self.evaluate_position(grid, depth), ""
 
@@ -272,7 +277,7 @@ class OptimizedSolver2048:
 
     def get_best_move(self, grid: List[List[int]]) -> str:
         depth = self.get_dynamic_depth(grid)
-        _, best_move = self.expectimax(grid, depth, True)
+        _, best_move = self.expectimax(grid, depth, True, use_cache=False)
         
         if not best_move:
             # Fallback to basic moves
@@ -307,47 +312,11 @@ class OptimizedSolver2048:
 
     def move_grid(self, grid: List[List[int]], direction: str) -> Tuple[List[List[int]], int, bool]:
         """Moves grid in specified direction and returns (new_grid, score, moved)."""
-        new_grid = [row[:] for row in grid]
-        score = 0
-        moved = False
-        
-        if direction in ["UP", "DOWN"]:
-            new_grid = list(map(list, zip(*new_grid)))  # Transpose
-        
-        if direction in ["DOWN", "RIGHT"]:
-            new_grid = [row[::-1] for row in new_grid]  # Reverse
-            
-        for i in range(4):
-            # Compact
-            row = [x for x in new_grid[i] if x != 0]
-            
-            # Merge
-            j = 0
-            while j < len(row)-1:
-                if row[j] == row[j+1]:
-                    row[j] *= 2
-                    score += row[j]
-                    row.pop(j+1)
-                    moved = True
-                j += 1
-                
-            # Pad with zeros
-            row.extend([0] * (4 - len(row)))
-            if row != new_grid[i]:
-                moved = True
-            new_grid[i] = row
-                
-        if direction in ["DOWN", "RIGHT"]:
-            new_grid = [row[::-1] for row in new_grid]
-            
-        if direction in ["UP", "DOWN"]:
-            new_grid = list(map(list, zip(*new_grid)))
-            
-        return new_grid, score, moved
+        return bitboard.move_grid(grid, direction)
 
 class ImprovedGame2048Client(Game2048Client):
-    def __init__(self, server_url="http://127.0.0.1:5000"):
-        super().__init__(server_url)
+    def __init__(self, server_url="http://127.0.0.1:5000", recorder=None):
+        super().__init__(server_url, recorder=recorder)
         self.solver = OptimizedSolver2048(base_depth=3)  # Base depth for Expectimax
 
     def solve(self):
@@ -383,9 +352,17 @@ class ImprovedGame2048Client(Game2048Client):
 
 # Example usage
 if __name__ == "__main__":
-    client = ImprovedGame2048Client()
-    # Run the game multiple times
-    for i in range(10):
-        print(f"\nStarting game {i + 1}")
-        client.start_game()
-        client.solve()
+    parser = argparse.ArgumentParser(description="2048 solver client")
+    add_recording_arguments(parser)
+    args = parser.parse_args()
+    recorder = recorder_from_args(args, os.path.join(SCRIPT_DIR, "screenshots"))
+    try:
+        client = ImprovedGame2048Client(recorder=recorder)
+        # Run the game multiple times
+        for i in range(10):
+            print(f"\nStarting game {i + 1}")
+            client.start_game()
+            client.solve()
+    finally:
+        if recorder is not None:
+            recorder.close()
@@ -1,29 +1,36 @@
+import argparse
 import copy
 from typing import List, Tuple, Dict
 import random
 import requests
 import os
+import sys
 import time
-from datetime import datetime
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Make the shared ``game_2048`` package importable when this script is run
+# directly (``python3 2048/solver/<file>.py``).
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from game_2048 import bitboard  # noqa: E402
+from game_2048.recording import add_recording_arguments, recorder_from_args  # noqa: E402
+
 class Game2048Client:
-    def __init__(self, server_url="http://127.0.0.1:5000"):
+    def __init__(self, server_url="http://127.0.0.1:5000", recorder=None):
         self.server_url = server_url
         self.game_id = None
-        self.screenshot_count = 0
-        self.screenshot_folder = os.path.join(SCRIPT_DIR, "screenshots")
+        self.recorder = recorder
 
     def start_game(self):
         response = requests.post(f"{self.server_url}/start")
         if response.status_code == 201:
             data = response.json()
             self.game_id = data["game_id"]
-            session_folder_name = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.session_folder = os.path.join(self.screenshot_folder, session_folder_name)
-            os.makedirs(self.session_folder, exist_ok=True)
-            self.screenshot_count = 0
+            if self.recorder is not None:
+                self.recorder.start(self.game_id, data)
             print("New game started!")
             print("Game ID:", self.game_id)
         else:
@@ -34,10 +41,15 @@ class Game2048Client:
         if self.game_id is None:
             print("Please start a game first.")
             return None
-        response = requests.post(f"{self.server_url}/move", json={"direction": direction})
+        response = requests.post(
+            f"{self.server_url}/move",
+            params={"game_id": self.game_id},
+            json={"direction": direction},
+        )
         if response.status_code == 200:
             data = response.json()
-            self.capture_screenshot()  # Capture screenshot after each move
+            if self.recorder is not None:
+                self.recorder.record(direction, data)
             return data
         else:
             print("Failed to make a move.")
@@ -48,7 +60,7 @@ class Game2048Client:
         if self.game_id is None:
             print("Please start a game first.")
             return None
-        response = requests.get(f"{self.server_url}/state")
+        response = requests.get(f"{self.server_url}/state", params={"game_id": self.game_id})
         if response.status_code == 200:
             return response.json()
         else:
@@ -56,23 +68,6 @@ class Game2048Client:
             print(response.json())
             return None
 
-    def capture_screenshot(self):
-        """Fetches the screenshot from the server and saves it locally in sequence format."""
-        if self.game_id is None:
-            print("Please start a game first.")
-            return
-
-        response = requests.get(f"{self.server_url}/screenshot")
-        if response.status_code == 200:
-            filename = f"{self.screenshot_count:04d}.png"
-            screenshot_path = os.path.join(self.session_folder, filename)
-            with open(screenshot_path, "wb") as f:
-                f.write(response.content)
-            self.screenshot_count += 1
-        else:
-            print("Failed to capture screenshot.")
-            print(response.json())
-
     def print_final_stats(self, grid, score, total_moves, status):
         """Prints the final statistics of the game."""
         max_tile = self.get_max_tile(grid)
@@ -164,54 +159,9 @@ class EnhancedSolver2048:
     def get_empty_cells(self, grid: List[List[int]]) -> List[Tuple[int, int]]:
         return [(i, j) for i in range(4) for j in range(4) if grid[i][j] == 0]
 
-    def merge_line(self, line: List[int]) -> Tuple[List[int], int]:
-        score = 0
-        merged = []
-        line = [x for x in line if x != 0]
-        i = 0
-        while i < len(line):
-            if i + 1 < len(line) and line[i] == line[i + 1]:
-                merged.append(line[i] * 2)
-                score += line[i] * 2
-                i += 2
-            else:
-                merged.append(line[i])
-                i += 1
-        merged.extend([0] * (4 - len(merged)))
-        return merged, score
-
     def move_grid(self, grid: List[List[int]], direction: str) -> Tuple[List[List[int]], int, bool]:
-        new_grid = [row[:] for row in grid]
-        score = 0
-        moved = False
-        
-        if direction in ["LEFT", "RIGHT"]:
-            for i in range(4):
-                line = new_grid[i][:]
-                if direction == "RIGHT":
-                    line.reverse()
-                merged_line, line_score = self.merge_line(line)
-                if direction == "RIGHT":
-                    merged_line.reverse()
-                if merged_line != new_grid[i]:
-                    moved = True
-                new_grid[i] = merged_line
-                score += line_score
-        else:  # UP or DOWN
-            for j in range(4):
-                line = [new_grid[i][j] for i in range(4)]
-                if direction == "DOWN":
-                    line.reverse()
-                merged_line, line_score = self.merge_line(line)
-                if direction == "DOWN":
-                    merged_line.reverse()
-                if moved or merged_line != [new_grid[i][j] for i in range(4)]:
-                    moved = True
-                for i in range(4):
-                    new_grid[i][j] = merged_line[i]
-                score += line_score
-        
-        return new_grid, score, moved
+        """Moves grid in specified direction and returns (new_grid, score, moved)."""
+        return bitboard.move_grid(grid, direction)
 
     def get_stage(self, grid: List[List[int]]) -> str:
         """Determine game stage based on max tile and empty cells"""
@@ -418,8 +368,8 @@ class EnhancedSolver2048:
         return best_move
 
 class ImprovedGame2048Client(Game2048Client):
-    def __init__(self, server_url="http://127.0.0.1:5000"):
-        super().__init__(server_url)
+    def __init__(self, server_url="http://127.0.0.1:5000", recorder=None):
+        super().__init__(server_url, recorder=recorder)
         self.solver = EnhancedSolver2048(depth=4)  # Increased base depth
 
     def solve(self):
@@ -457,9 +407,17 @@ class ImprovedGame2048Client(Game2048Client):
 
 # Example usage
 if __name__ == "__main__":
-    client = ImprovedGame2048Client()
-    # Run the game 25 times
-    for i in range(25):
-        print(f"\nStarting game {i + 1}")
-        client.start_game()
-        client.solve()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="2048 solver client")
+    add_recording_arguments(parser)
+    args = parser.parse_args()
+    recorder = recorder_from_args(args, os.path.join(SCRIPT_DIR, "screenshots"))
+    try:
+        client = ImprovedGame2048Client(recorder=recorder)
+        # Run the game 25 times
+        for i in range(25):
+            print(f"\nStarting game {i + 1}")
+            client.start_game()
+            client.solve()
+    finally:
+        if recorder is not None:
+            recorder.close()
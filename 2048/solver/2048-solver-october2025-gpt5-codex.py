@@ -1,116 +1,245 @@
 import copy
-import queue
-import threading
-from typing import List, Tuple, Dict
+import argparse
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple, Dict
 import random
 import numpy as np
-import requests
 import os
+import sys
 import time
-from datetime import datetime
 import math
 
 # Import Numba for JIT compilation
+import numba
 from numba import njit, prange
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-class Game2048Client:
-    def __init__(self, server_url="http://127.0.0.1:5000"):
-        self.server_url = server_url
-        self.game_id = None
-        self.screenshot_count = 0
-        self.screenshot_folder = os.path.join(SCRIPT_DIR, "screenshots")
-        self.event_queue = queue.Queue()
+# Make the shared ``game_2048`` package importable when this script is run
+# directly (``python3 2048/solver/<file>.py``).
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from game_2048 import bitboard  # noqa: E402
+from game_2048.client import Game2048Client as PooledGame2048Client  # noqa: E402
+from game_2048.ntuple import NTupleNetwork  # noqa: E402
+from game_2048.recording import add_recording_arguments, recorder_from_args  # noqa: E402
+from game_2048.transposition import (  # noqa: E402
+    CHANCE_NODE, MAX_NODE, TranspositionTable, node_key,
+)
+
+# Compiled leaf evaluator. Boards are (4, 4) arrays of tile exponents
+# (0 = empty, 1 = 2, 2 = 4, ...). Since log2 of a tile is exactly its
+# exponent, the terms below are the solver's heuristics evaluated directly
+# on exponents; STAGE_WEIGHTS is the one place their weights live.
+CORNER_WEIGHTS = np.array([
+    [2048, 1024, 512, 256],
+    [16, 32, 64, 128],
+    [8, 4, 2, 4],
+    [0, 0, 0, 0]
+], dtype=np.int64)
+
+SNAKE_WEIGHTS = np.array([
+    [2**15, 2**14, 2**13, 2**12],
+    [2**8, 2**9, 2**10, 2**11],
+    [2**7, 2**6, 2**5, 2**4],
+    [2**0, 2**1, 2**2, 2**3]
+], dtype=np.int64)
+
+STAGES = ("early", "mid", "late")
+# Columns: corner, snake, gradient, merge, empty, max_tile, depth,
+# monotonicity, smoothness, alignment; one row per entry of STAGES.
+STAGE_WEIGHTS = np.array([
+    [2.0, 1.0, 1.5, 1.0, 2.5, 1.0, 0.1, 1.5, 1.0, 1.0],
+    [2.5, 2.0, 2.0, 1.5, 2.0, 1.5, 0.2, 2.0, 1.5, 1.5],
+    [3.0, 2.5, 2.5, 2.0, 1.5, 2.0, 0.3, 2.5, 2.0, 2.5],
+])
+
+# Below this many boards the thread start-up of the parallel kernel costs
+# more than it saves.
+PARALLEL_BATCH_MIN = 256
+
+
+@njit
+def _evaluate_board(e, depth_remaining):
+    values = np.zeros((4, 4), dtype=np.int64)
+    empty_cells = 0
+    max_exp = 0
+    for i in range(4):
+        for j in range(4):
+            if e[i, j]:
+                values[i, j] = 1 << e[i, j]
+                if e[i, j] > max_exp:
+                    max_exp = e[i, j]
+            else:
+                empty_cells += 1
+    max_tile = values.max()
+
+    if max_tile < 512 and empty_cells > 8:
+        stage = 0
+    elif max_tile < 1024 and empty_cells > 4:
+        stage = 1
+    else:
+        stage = 2
+
+    corner_score = 0
+    snake_score = 0
+    for i in range(4):
+        for j in range(4):
+            corner_score += values[i, j] * CORNER_WEIGHTS[i, j]
+            snake_score += values[i, j] * SNAKE_WEIGHTS[i, j]
+
+    gradient_score = 0.0
+    for i in range(3):
+        for j in range(3):
+            if values[i, j] != 0:
+                if values[i, j] >= values[i, j + 1]:
+                    gradient_score += e[i, j]
+                if values[i, j] >= values[i + 1, j]:
+                    gradient_score += e[i, j]
+
+    merge_chains = 0.0
+    for i in range(4):
+        chain = 0
+        prev = 0
+        for j in range(4):
+            if values[i, j] != 0:
+                if values[i, j] == prev:
+                    chain += 1
+                    merge_chains += chain * e[i, j]
+                prev = values[i, j]
+    for j in range(4):
+        chain = 0
+        prev = 0
+        for i in range(4):
+            if values[i, j] != 0:
+                if values[i, j] == prev:
+                    chain += 1
+                    merge_chains += chain * e[i, j]
+                prev = values[i, j]
+
+    monotonicity = 0.0
+    for i in range(4):
+        for j in range(3):
+            if values[i, j] and values[i, j + 1]:
+                if values[i, j] >= values[i, j + 1]:
+                    monotonicity += e[i, j]
+                else:
+                    monotonicity -= e[i, j + 1]
+    for j in range(4):
+        for i in range(3):
+            if values[i, j] and values[i + 1, j]:
+                if values[i, j] >= values[i + 1, j]:
+                    monotonicity += e[i, j]
+                else:
+                    monotonicity -= e[i + 1, j]
+
+    smoothness = 0.0
+    for i in range(4):
+        for j in range(4):
+            if values[i, j] == 0:
+                continue
+            if j < 3 and values[i, j + 1] != 0:
+                smoothness -= abs(e[i, j] - e[i, j + 1])
+            if i < 3 and values[i + 1, j] != 0:
+                smoothness -= abs(e[i, j] - e[i + 1, j])
+
+    # First max tile in row-major order, as in max_corner_alignment
+    mi = 0
+    mj = 0
+    found = False
+    for i in range(4):
+        for j in range(4):
+            if not found and values[i, j] == max_tile:
+                mi = i
+                mj = j
+                found = True
+    corner_bonus = 4.0 if (mi == 0 or mi == 3) and (mj == 0 or mj == 3) else 0.0
+    half = values[mi, mj] / 2
+    aligned = 0
+    for k in range(4):
+        if values[mi, k] >= half:
+            aligned += 1
+        if values[k, mj] >= half:
+            aligned += 1
+    alignment = corner_bonus * max_exp + aligned
+
+    w = STAGE_WEIGHTS[stage]
+    return (
+        corner_score * w[0] +
+        snake_score * w[1] +
+        gradient_score * w[2] +
+        merge_chains * w[3] +
+        empty_cells * w[4] +
+        max_tile * w[5] +
+        depth_remaining * w[6] +
+        monotonicity * w[7] +
+        smoothness * w[8] +
+        alignment * w[9]
+    )
+
+
+@njit
+def _evaluate_batch_serial(boards, depth_remaining):
+    out = np.empty(boards.shape[0])
+    for k in range(boards.shape[0]):
+        out[k] = _evaluate_board(boards[k], depth_remaining[k])
+    return out
+
+
+@njit(parallel=True)
+def _evaluate_batch_parallel(boards, depth_remaining):
+    out = np.empty(boards.shape[0])
+    for k in prange(boards.shape[0]):
+        out[k] = _evaluate_board(boards[k], depth_remaining[k])
+    return out
+
+
+def evaluate_batch(boards, depth_remaining=0) -> np.ndarray:
+    """Score an (N, 4, 4) array of tile exponents in one compiled call.
+
+    ``depth_remaining`` is a scalar or an (N,) array; the result is an (N,)
+    float64 array equal to ``OptimizedSolver2048.evaluate_position`` on
+    each board.
+    """
+    boards = np.ascontiguousarray(boards, dtype=np.int64)
+    depths = np.broadcast_to(
+        np.asarray(depth_remaining, dtype=np.int64), (boards.shape[0],)
+    ).copy()
+    if boards.shape[0] >= PARALLEL_BATCH_MIN:
+        return _evaluate_batch_parallel(boards, depths)
+    return _evaluate_batch_serial(boards, depths)
+
+
+def grid_to_exponents(grid: List[List[int]]) -> np.ndarray:
+    return np.array(
+        [[value.bit_length() - 1 if value else 0 for value in row] for row in grid],
+        dtype=np.int64,
+    )
+
+
+class Game2048Client(PooledGame2048Client):
+    """Pooled HTTP client; frames and move logs only with a ``recorder``.
+
+    State comes back with every ``/move`` response, so ``get_state`` only
+    asks the server when nothing has been cached yet.
+    """
+
+    def __init__(self, server_url="http://127.0.0.1:5000", recorder=None):
+        super().__init__(server_url, recorder=recorder)
         self.is_running = True
-        self.lock = threading.Lock()
 
     def start_game(self):
-        try:
-            response = requests.post(f"{self.server_url}/start")
-            if response.status_code == 201:
-                data = response.json()
-                with self.lock:
-                    self.game_id = data["game_id"]
-                session_folder_name = datetime.now().strftime("%Y%m%d_%H%M%S")
-                self.session_folder = os.path.join(self.screenshot_folder, session_folder_name)
-                os.makedirs(self.session_folder, exist_ok=True)
-                self.screenshot_count = 0
-                print("New game started!")
-                print("Game ID:", self.game_id)
-                return True
-            else:
-                print("Failed to start a new game.")
-                print(response.json())
-                return False
-        except requests.exceptions.RequestException as e:
-            print(f"Connection error: {e}")
+        data = super().start_game()
+        if data is None:
+            print("Failed to start a new game.")
             return False
-
-    def make_move(self, direction):
-        if direction not in ["UP", "DOWN", "LEFT", "RIGHT"]:
-            print(f"Invalid move direction: {direction}")
-            return None
-
-        try:
-            with self.lock:
-                if self.game_id is None:
-                    print("Please start a game first.")
-                    return None
-                
-            response = requests.post(
-                f"{self.server_url}/move",
-                json={"direction": direction},
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                self.capture_screenshot()
-                return data
-            else:
-                print(f"Move failed: {response.json()}")
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            print(f"Connection error during move: {e}")
-            return None
-
-    def get_state(self):
-        try:
-            with self.lock:
-                if self.game_id is None:
-                    print("Please start a game first.")
-                    return None
-                
-            response = requests.get(f"{self.server_url}/state", timeout=5)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print("Failed to retrieve the game state.")
-                print(response.json())
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            print(f"Connection error getting state: {e}")
-            return None
-
-    def capture_screenshot(self):
-        """Fetches the screenshot from the server and saves it locally in sequence format."""
-        if self.game_id is None:
-            print("Please start a game first.")
-            return
-
-        response = requests.get(f"{self.server_url}/screenshot")
-        if response.status_code == 200:
-            filename = f"{self.screenshot_count:04d}.png"
-            screenshot_path = os.path.join(self.session_folder, filename)
-            with open(screenshot_path, "wb") as f:
-                f.write(response.content)
-            self.screenshot_count += 1
-        else:
-            print("Failed to capture screenshot.")
-            print(response.json())
+        print("New game started!")
+        print("Game ID:", self.game_id)
+        return True
 
     def print_final_stats(self, grid, score, total_moves, status):
         """Prints the final statistics of the game."""
@@ -133,124 +262,49 @@ class Game2048Client:
         print("\n")
 
 class OptimizedSolver2048:
-    def __init__(self, base_depth: int = 3):
+    def __init__(self, base_depth: int = 3, tt_size_bits: int = 18,
+                 prob_cutoff: float = 1e-4, sample_cells: Optional[int] = None,
+                 seed: Optional[int] = None, ntuple_weights: Optional[str] = None):
         self.DIRECTIONS = ["UP", "RIGHT", "DOWN", "LEFT"]
         self.base_depth = base_depth
-        self.transposition_table: Dict[Tuple[Tuple[int, ...], int, str], float] = {}
+        # Branches whose spawn path is less likely than prob_cutoff are scored
+        # as leaves; 0 disables the cutoff.
+        self.prob_cutoff = prob_cutoff
+        # Times the cutoff has fired; a node whose subtree it touched is
+        # worth less than its depth says, so it is not cached.
+        self.cutoffs = 0
+        # If set, chance nodes average over at most this many random empty
+        # cells instead of all of them.
+        self.sample_cells = sample_cells
+        self.rng = random.Random(seed)
+        # A trained n-tuple network (see game_2048.ntuple) replaces the
+        # hand-tuned heuristic at the leaves. Memory-mapped, so parallel
+        # workers share one copy of the weights.
+        self.network = NTupleNetwork.load(ntuple_weights) if ntuple_weights else None
+        # Interior max/chance values keyed by bitboard; kept across moves.
+        self.transposition_table = TranspositionTable(tt_size_bits)
         self.move_history = {dir: 0 for dir in self.DIRECTIONS}
         
         # Enhanced weight matrices
-        self.corner_weights = np.array([
-            [2048, 1024, 512, 256],
-            [16, 32, 64, 128],
-            [8, 4, 2, 4],
-            [0, 0, 0, 0]
-        ])
-        
-        self.snake_weights = np.array([
-            [2**15, 2**14, 2**13, 2**12],
-            [2**8, 2**9, 2**10, 2**11],
-            [2**7, 2**6, 2**5, 2**4],
-            [2**0, 2**1, 2**2, 2**3]
-        ])
-
-    def evaluate_position(self, grid: List[List[int]], depth_remaining: int) -> float:
-        stage = self.get_stage(grid)
-        # Cache check keyed by board, remaining depth, and stage
-        grid_tuple = tuple(map(tuple, grid))
-        cache_key = (grid_tuple, depth_remaining, stage)
-        if cache_key in self.transposition_table:
-            return self.transposition_table[cache_key]
+        self.corner_weights = CORNER_WEIGHTS
+        self.snake_weights = SNAKE_WEIGHTS
 
-        empty_cells = len(self.get_empty_cells(grid))
-        max_tile = max(max(row) for row in grid)
+    def evaluate_batch(self, boards, depth_remaining=0) -> np.ndarray:
+        """Score many boards at once; see the module-level ``evaluate_batch``."""
+        return evaluate_batch(boards, depth_remaining)
 
-        # Enhanced scoring components
-        corner_score = np.sum(np.multiply(np.array(grid), self.corner_weights))
-        snake_score = np.sum(np.multiply(np.array(grid), self.snake_weights))
-        gradient_score = self.calculate_gradient_score(grid)
-        merge_chains = self.calculate_merge_chains(grid)
-        
-        # Dynamic weights based on game stage
-        weights = self.get_stage_weights(stage)
-        
-        score = (
-            corner_score * weights['corner'] +
-            snake_score * weights['snake'] +
-            gradient_score * weights['gradient'] +
-            merge_chains * weights['merge'] +
-            empty_cells * weights['empty'] +
-            max_tile * weights['max_tile'] +
-            depth_remaining * weights['depth'] +
-            self.calculate_monotonicity(grid) * weights['monotonicity'] +
-            self.calculate_smoothness(grid) * weights['smoothness'] +
-            self.max_corner_alignment(grid) * weights['alignment']
-        )
-
-        # Cache result
-        self.transposition_table[cache_key] = score
-        return score
+    def evaluate_leaf(self, grid: List[List[int]], is_max: bool, depth_remaining: int = 0) -> float:
+        if self.network is None:
+            return self.evaluate_position(grid, depth_remaining)
+        board = bitboard.from_grid(grid)
+        # The network values afterstates; a board still to be moved is worth
+        # its best move.
+        return self.network.evaluate_state(board) if is_max else self.network.evaluate(board)
 
-    def get_stage_weights(self, stage: str) -> dict:
-        if stage == "early":
-            return {
-                'corner': 2.0, 'snake': 1.0, 'gradient': 1.5,
-                'merge': 1.0, 'empty': 2.5, 'max_tile': 1.0,
-                'depth': 0.1, 'monotonicity': 1.5, 'smoothness': 1.0,
-                'alignment': 1.0
-            }
-        elif stage == "mid":
-            return {
-                'corner': 2.5, 'snake': 2.0, 'gradient': 2.0,
-                'merge': 1.5, 'empty': 2.0, 'max_tile': 1.5,
-                'depth': 0.2, 'monotonicity': 2.0, 'smoothness': 1.5,
-                'alignment': 1.5
-            }
-        else:
-            return {
-                'corner': 3.0, 'snake': 2.5, 'gradient': 2.5,
-                'merge': 2.0, 'empty': 1.5, 'max_tile': 2.0,
-                'depth': 0.3, 'monotonicity': 2.5, 'smoothness': 2.0,
-                'alignment': 2.5
-            }
-
-    def calculate_gradient_score(self, grid: List[List[int]]) -> float:
-        score = 0
-        for i in range(3):
-            for j in range(3):
-                if grid[i][j] != 0:
-                    # Horizontal gradient
-                    if grid[i][j] >= grid[i][j+1]:
-                        score += math.log2(grid[i][j])
-                    # Vertical gradient    
-                    if grid[i][j] >= grid[i+1][j]:
-                        score += math.log2(grid[i][j])
-        return score
-
-    def calculate_merge_chains(self, grid: List[List[int]]) -> float:
-        score = 0
-        # Horizontal chains
-        for i in range(4):
-            chain = 0
-            prev = 0
-            for j in range(4):
-                if grid[i][j] != 0:
-                    if grid[i][j] == prev:
-                        chain += 1
-                        score += chain * math.log2(grid[i][j])
-                    prev = grid[i][j]
-        
-        # Vertical chains
-        for j in range(4):
-            chain = 0
-            prev = 0
-            for i in range(4):
-                if grid[i][j] != 0:
-                    if grid[i][j] == prev:
-                        chain += 1
-                        score += chain * math.log2(grid[i][j])
-                    prev = grid[i][j]
-        return score
+    def evaluate_position(self, grid: List[List[int]], depth_remaining: int) -> float:
+        # Leaves are cheaper to re-score than to look up; only interior
+        # nodes go through the transposition table.
+        return float(_evaluate_board(grid_to_exponents(grid), depth_remaining))
 
     def calculate_monotonicity(self, grid: List[List[int]]) -> float:
         score = 0.0
@@ -276,21 +330,6 @@ class OptimizedSolver2048:
                         score -= math.log2(nxt)
         return score
 
-    def calculate_smoothness(self, grid: List[List[int]]) -> float:
-        score = 0.0
-        for i in range(4):
-            for j in range(4):
-                if grid[i][j] == 0:
-                    continue
-                value_log = math.log2(grid[i][j])
-                # Right neighbor
-                if j < 3 and grid[i][j + 1] != 0:
-                    score -= abs(value_log - math.log2(grid[i][j + 1]))
-                # Down neighbor
-                if i < 3 and grid[i + 1][j] != 0:
-                    score -= abs(value_log - math.log2(grid[i + 1][j]))
-        return score
-
     def max_corner_alignment(self, grid: List[List[int]]) -> float:
         max_tile = max(max(row) for row in grid)
         max_positions = [(i, j) for i in range(4) for j in range(4) if grid[i][j] == max_tile]
@@ -313,10 +352,31 @@ class OptimizedSolver2048:
             return self.base_depth + 1
         return self.base_depth
 
-    def expectimax(self, grid: List[List[int]], depth: int, is_max: bool, alpha: float = float('-inf')) -> Tuple[float, str]:
+    def expectimax(self, grid: List[List[int]], depth: int, is_max: bool, alpha: float = float('-inf'),
+                   use_cache: bool = True, prob: float = 1.0) -> Tuple[float, str]:
         if depth == 0:
-            return self.evaluate_position(grid, depth), ""
-
+            return self.evaluate_leaf(grid, is_max), ""
+        if prob < self.prob_cutoff:
+            self.cutoffs += 1
+            return self.evaluate_leaf(grid, is_max), ""
+
+        # A cached value carries no best move, so the root passes use_cache=False.
+        key = node_key(bitboard.from_grid(grid), MAX_NODE if is_max else CHANCE_NODE)
+        if use_cache:
+            cached = self.transposition_table.probe(key, depth)
+            if cached is not None:
+                return cached, ""
+
+        cutoffs = self.cutoffs
+        score, best_move = self._expectimax_node(grid, depth, is_max, alpha, prob)
+        # A value cut short on an unlikely path would be wrong for a later,
+        # likelier probe of the same board at the same depth.
+        if self.cutoffs == cutoffs:
+            self.transposition_table.store(key, depth, score)
+        return score, best_move
+
+    def _expectimax_node(self, grid: List[List[int]], depth: int, is_max: bool,
+                         alpha: float, prob: float) -> Tuple[float, str]:
         if is_max:
             max_score = float('-inf')
             best_move = ""
@@ -327,7 +387,7 @@ class OptimizedSolver2048:
             for direction in moves:
                 new_grid, _, moved = self.move_grid(grid, direction)
                 if moved:
-                    score, _ = self.expectimax(new_grid, depth - 1, False, alpha)
+                    score, _ = self.expectimax(new_grid, depth - 1, False, alpha, prob=prob)
                     if score > max_score:
                         max_score = score
                         best_move = direction
@@ -346,26 +406,53 @@ class OptimizedSolver2048:
         else:
             empty_cells = self.get_empty_cells(grid)
             if not empty_cells:
-                return self.evaluate_position(grid, depth), ""
+                return self.evaluate_leaf(grid, False, depth), ""
                 
+            # Each spawn's probability is spread over all empty cells, even
+            # when only a sample of them is searched.
+            cell_prob = prob / len(empty_cells)
+            if self.sample_cells and len(empty_cells) > self.sample_cells:
+                empty_cells = self.rng.sample(empty_cells, self.sample_cells)
+
             avg_score = 0
             total_weight = 0
-            
+
+            if depth == 1:
+                # Every child is a leaf: score them all in one compiled call.
+                if self.network is not None:
+                    board = bitboard.from_grid(grid)
+                    children = np.array(
+                        [board | (e << (16 * i + 4 * j)) for (i, j) in empty_cells for e in (1, 2)],
+                        dtype=np.uint64,
+                    )
+                    scores = self.network.evaluate_states(children)
+                else:
+                    children = np.repeat(grid_to_exponents(grid)[None], 2 * len(empty_cells), axis=0)
+                    for k, (i, j) in enumerate(empty_cells):
+                        children[2 * k, i, j] = 1
+                        children[2 * k + 1, i, j] = 2
+                    scores = evaluate_batch(children, 0)
+                for k in range(len(empty_cells)):
+                    for offset, tile_prob in ((0, 0.9), (1, 0.1)):
+                        avg_score += scores[2 * k + offset] * tile_prob
+                        total_weight += tile_prob
+                return avg_score / total_weight, ""
+
             # Optimized chance node calculation
             for (i, j) in empty_cells:
-                for value, prob in [(2, 0.9), (4, 0.1)]:
+                for value, tile_prob in [(2, 0.9), (4, 0.1)]:
                     new_grid = [row[:] for row in grid]
                     new_grid[i][j] = value
-                    score, _ = self.expectimax(new_grid, depth - 1, True, alpha)
-                    avg_score += score * prob
-                    total_weight += prob
+                    score, _ = self.expectimax(new_grid, depth - 1, True, alpha,
+                                               prob=cell_prob * tile_prob)
+                    avg_score += score * tile_prob
+                    total_weight += tile_prob
                     
             return avg_score / total_weight, ""
 
     def get_best_move(self, grid: List[List[int]]) -> str:
-        self.prune_transposition_table()
         depth = self.get_dynamic_depth(grid)
-        _, best_move = self.expectimax(grid, depth, True)
+        _, best_move = self.expectimax(grid, depth, True, use_cache=False)
         
         if not best_move:
             # Fallback to basic moves
@@ -396,14 +483,6 @@ class OptimizedSolver2048:
         move_scores.sort(key=lambda x: x[1], reverse=True)
         return [direction for direction, _ in move_scores]
 
-    def prune_transposition_table(self, max_entries: int = 5000) -> None:
-        if len(self.transposition_table) <= max_entries:
-            return
-        keys = list(self.transposition_table.keys())
-        # Drop the oldest portion to keep cache bounded
-        for key in keys[: len(keys) - max_entries]:
-            self.transposition_table.pop(key, None)
-
     def get_empty_cells(self, grid: List[List[int]]) -> List[Tuple[int, int]]:
         """Returns list of (row, col) tuples for empty cells."""
         empty = []
@@ -413,62 +492,127 @@ class OptimizedSolver2048:
                     empty.append((i, j))
         return empty
 
-    def get_stage(self, grid: List[List[int]]) -> str:
-        """Determines game stage based on max tile and empty cells."""
-        max_tile = max(max(row) for row in grid)
-        empty_count = len(self.get_empty_cells(grid))
-        
-        if max_tile < 512 and empty_count > 8:
-            return "early"
-        elif max_tile < 1024 and empty_count > 4:
-            return "mid"
-        else:
-            return "late"
-
     def move_grid(self, grid: List[List[int]], direction: str) -> Tuple[List[List[int]], int, bool]:
         """Moves grid in specified direction and returns (new_grid, score, moved)."""
-        new_grid = [row[:] for row in grid]
-        score = 0
-        moved = False
-        
-        if direction in ["UP", "DOWN"]:
-            new_grid = list(map(list, zip(*new_grid)))  # Transpose
-        
-        if direction in ["DOWN", "RIGHT"]:
-            new_grid = [row[::-1] for row in new_grid]  # Reverse
-            
-        for i in range(4):
-            # Compact
-            row = [x for x in new_grid[i] if x != 0]
-            
-            # Merge
-            j = 0
-            while j < len(row)-1:
-                if row[j] == row[j+1]:
-                    row[j] *= 2
-                    score += row[j]
-                    row.pop(j+1)
-                    moved = True
-                j += 1
-                
-            # Pad with zeros
-            row.extend([0] * (4 - len(row)))
-            if row != new_grid[i]:
-                moved = True
-            new_grid[i] = row
-                
-        if direction in ["DOWN", "RIGHT"]:
-            new_grid = [row[::-1] for row in new_grid]
-            
-        if direction in ["UP", "DOWN"]:
-            new_grid = list(map(list, zip(*new_grid)))
-            
-        return new_grid, score, moved
+        return bitboard.move_grid(grid, direction)
+
+# Per-process solver for ParallelSolver2048 workers. It lives as long as the
+# worker, so its transposition table stays warm from one move to the next.
+_worker_solver: Optional[OptimizedSolver2048] = None
+
+
+def _init_worker(solver_options: dict) -> None:
+    global _worker_solver
+    # Parallelism comes from the pool; don't let each worker start its own
+    # numba thread pool on top of it.
+    numba.set_num_threads(1)
+    _worker_solver = OptimizedSolver2048(**solver_options)
+
+
+def _task_seed(*parts) -> int:
+    """A sampling seed for one task, the same in every interpreter run
+    (unlike ``hash()``, which is salted per process for strings)."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _search_subtree(grid: List[List[int]], depth: int, is_max: bool, prob: float,
+                    sample_seed: int) -> float:
+    # Reseed per task so cell sampling does not depend on which worker
+    # picked the task up.
+    _worker_solver.rng = random.Random(sample_seed)
+    score, _ = _worker_solver.expectimax(grid, depth, is_max, prob=prob)
+    return score
+
+
+class ParallelSolver2048:
+    """Runs the root of the expectimax search on a process pool.
+
+    Each legal root move is one task. With ``parallel_chance`` every spawn
+    under every root move is its own task instead, which keeps more workers
+    busy when only one or two moves are legal. Scores are combined in
+    submission order and ties go to the earlier direction in
+    ``DIRECTIONS``, so the chosen move does not depend on scheduling.
+    """
+
+    def __init__(self, workers: Optional[int] = None, parallel_chance: bool = False,
+                 **solver_options):
+        # Local solver for depth selection and the no-move fallback only.
+        self.solver = OptimizedSolver2048(**solver_options)
+        self.DIRECTIONS = self.solver.DIRECTIONS
+        self.parallel_chance = parallel_chance
+        self.seed = solver_options.get("seed")
+        # Spawn rather than fork: forking after numba has started threads is unsafe.
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(solver_options,),
+        )
+
+    def get_best_move(self, grid: List[List[int]]) -> str:
+        depth = self.solver.get_dynamic_depth(grid)
+        board = bitboard.from_grid(grid)
+        jobs = []  # (direction, weight, future)
+        for index, direction in enumerate(self.DIRECTIONS):
+            new_grid, _, moved = self.solver.move_grid(grid, direction)
+            if not moved:
+                continue
+            cells = self.solver.get_empty_cells(new_grid)
+            if not (self.parallel_chance and depth > 1 and cells):
+                future = self.executor.submit(
+                    _search_subtree, new_grid, depth - 1, False, 1.0,
+                    _task_seed(self.seed, board, index),
+                )
+                jobs.append((direction, 1.0, future))
+                continue
+            cell_prob = 1.0 / len(cells)
+            sample_cells = self.solver.sample_cells
+            if sample_cells and len(cells) > sample_cells:
+                cells = random.Random(_task_seed(self.seed, board, index)).sample(cells, sample_cells)
+            for (i, j) in cells:
+                for value, tile_prob in [(2, 0.9), (4, 0.1)]:
+                    child = [row[:] for row in new_grid]
+                    child[i][j] = value
+                    future = self.executor.submit(
+                        _search_subtree, child, depth - 2, True, cell_prob * tile_prob,
+                        _task_seed(self.seed, board, index, i, j, value),
+                    )
+                    jobs.append((direction, tile_prob, future))
+
+        totals: Dict[str, List[float]] = {}
+        for direction, weight, future in jobs:
+            total = totals.setdefault(direction, [0.0, 0.0])
+            total[0] += future.result() * weight
+            total[1] += weight
+
+        best_move = ""
+        best_score = float('-inf')
+        for direction in self.DIRECTIONS:
+            if direction in totals:
+                score = totals[direction][0] / totals[direction][1]
+                if score > best_score:
+                    best_score = score
+                    best_move = direction
+        return best_move
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
 
 class ImprovedGame2048Client(Game2048Client):
-    def __init__(self, server_url="http://127.0.0.1:5000"):
-        super().__init__(server_url)
-        self.solver = OptimizedSolver2048(base_depth=3)
+    def __init__(self, server_url="http://127.0.0.1:5000", solver=None, recorder=None,
+                 **solver_options):
+        super().__init__(server_url, recorder)
+        if solver is None:
+            solver = OptimizedSolver2048(base_depth=3, **solver_options)
+        self.solver = solver
         self.max_retries = 3
         self.retry_delay = 0.5
 
@@ -533,12 +677,38 @@ class ImprovedGame2048Client(Game2048Client):
     def __del__(self):
         self.is_running = False
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Expectimax 2048 solver client")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="search the root moves on this many processes (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--parallel-chance", action="store_true",
+        help="with --workers, also split the first chance layer into tasks",
+    )
+    add_recording_arguments(parser)
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    for i in range(10):
-        print(f"\nStarting game {i + 1}")
-        client = ImprovedGame2048Client()
-        if client.start_game():
-            client.solve()
-        else:
-            print("Failed to start game. Retrying...")
-            time.sleep(1)
+    args = parse_args()
+    # One pool for all games, so workers keep their tables warm throughout.
+    solver = None
+    if args.workers > 1:
+        solver = ParallelSolver2048(args.workers, args.parallel_chance, base_depth=3)
+    recorder = recorder_from_args(args, os.path.join(SCRIPT_DIR, "screenshots"))
+    try:
+        for i in range(10):
+            print(f"\nStarting game {i + 1}")
+            client = ImprovedGame2048Client(solver=solver, recorder=recorder)
+            if client.start_game():
+                client.solve()
+            else:
+                print("Failed to start game. Retrying...")
+                time.sleep(1)
+    finally:
+        if solver is not None:
+            solver.close()
+        if recorder is not None:
+            recorder.close()
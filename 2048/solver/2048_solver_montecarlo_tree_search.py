@@ -1,76 +1,43 @@
-import requests
+import argparse
+import math
+import multiprocessing
 import os
-import time
 import random
-from datetime import datetime
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-class Game2048Client:
-    def __init__(self, server_url="http://127.0.0.1:5000", depth=3):
-        self.server_url = server_url
-        self.game_id = None
-        self.screenshot_count = 0
-        self.screenshot_folder = os.path.join(SCRIPT_DIR, "screenshots")
-        self.depth = depth  # Maximum depth for MCTS
+# Make the shared ``game_2048`` package importable when this script is run
+# directly (``python3 2048/solver/<file>.py``).
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from game_2048 import bitboard  # noqa: E402
+from game_2048.client import Game2048Client as PooledGame2048Client  # noqa: E402
+from game_2048.recording import add_recording_arguments, recorder_from_args  # noqa: E402
+
+DIRECTIONS = ("DOWN", "RIGHT", "LEFT", "UP")
+ROLLOUT_POLICIES = ("random", "greedy")
+
+
+class Game2048Client(PooledGame2048Client):
+    """Pooled HTTP client; frames and move logs only with a ``recorder``."""
+
+    def __init__(self, server_url="http://127.0.0.1:5000", recorder=None):
+        super().__init__(server_url, recorder=recorder)
 
     def start_game(self):
-        response = requests.post(f"{self.server_url}/start")
-        if response.status_code == 201:
-            data = response.json()
-            self.game_id = data["game_id"]
-            session_folder_name = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.session_folder = os.path.join(self.screenshot_folder, session_folder_name)
-            os.makedirs(self.session_folder, exist_ok=True)
-            self.screenshot_count = 0
-            print("New game started!")
-            print("Game ID:", self.game_id)
-        else:
+        data = super().start_game()
+        if data is None:
             print("Failed to start a new game.")
-            print(response.json())
-
-    def make_move(self, direction):
-        if self.game_id is None:
-            print("Please start a game first.")
-            return None
-        response = requests.post(f"{self.server_url}/move", json={"direction": direction})
-        if response.status_code == 200:
-            data = response.json()
-            self.capture_screenshot()  # Capture screenshot after each move
-            return data
-        else:
-            print("Failed to make a move.")
-            print(response.json())
-            return None
-
-    def get_state(self):
-        if self.game_id is None:
-            print("Please start a game first.")
-            return None
-        response = requests.get(f"{self.server_url}/state")
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print("Failed to retrieve the game state.")
-            print(response.json())
-            return None
-
-    def capture_screenshot(self):
-        """Fetches the screenshot from the server and saves it locally in sequence format."""
-        if self.game_id is None:
-            print("Please start a game first.")
-            return
-
-        response = requests.get(f"{self.server_url}/screenshot")
-        if response.status_code == 200:
-            filename = f"{self.screenshot_count:04d}.png"
-            screenshot_path = os.path.join(self.session_folder, filename)
-            with open(screenshot_path, "wb") as f:
-                f.write(response.content)
-            self.screenshot_count += 1
-        else:
-            print("Failed to capture screenshot.")
-            print(response.json())
+            return False
+        print("New game started!")
+        print("Game ID:", self.game_id)
+        return True
 
     def print_final_stats(self, grid, score, total_moves, status):
         """Prints the final statistics of the game."""
@@ -92,29 +59,247 @@ class Game2048Client:
             print("\t".join(str(cell) if cell != 0 else "." for cell in row))
         print("\n")
 
-    def simulate_move(self, grid, move):
-        """Simulates a move by sending it to the server and returns the resulting state."""
-        # Temporary function for server simulation - assumes the server implements a similar move function
-        simulated_response = self.make_move(move)
-        return simulated_response
-
-    def monte_carlo_tree_search(self, grid):
-        """Uses MCTS to decide the best move."""
-        move_priority = ["DOWN", "RIGHT", "LEFT", "UP"]
-        move_scores = {move: 0 for move in move_priority}
-
-        for move in move_priority:
-            total_score = 0
-            for _ in range(self.depth):
-                simulated_response = self.simulate_move(grid, move)
-                if simulated_response and simulated_response["moved"]:
-                    total_score += self.get_max_tile(simulated_response["state"])
-            move_scores[move] = total_score / self.depth if self.depth > 0 else 0
-
-        # Choose the move with the highest average score from simulations
-        best_move = max(move_scores, key=move_scores.get)
-        print(f"Best Move (MCTS): {best_move} | Average Score: {move_scores[best_move]}")
-        return best_move
+
+def rollout(board: int, rng: random.Random, policy: str = "random",
+            max_moves: Optional[int] = None) -> int:
+    """Play from ``board`` (just after a spawn) until stuck; returns the score gained.
+
+    ``random`` picks uniformly among legal moves. ``greedy`` takes the legal
+    move that leaves the most empty cells (then the biggest merge), with a
+    10% chance of a random move so playouts still differ.
+    """
+    moves_fn = bitboard.MOVES
+    total = 0
+    moves = 0
+    while max_moves is None or moves < max_moves:
+        legal = []
+        for direction in DIRECTIONS:
+            new_board, score = moves_fn[direction](board)
+            if new_board != board:
+                legal.append((new_board, score))
+        if not legal:
+            break
+        if policy == "greedy" and rng.random() >= 0.1:
+            board, score = max(
+                legal, key=lambda m: (bitboard.count_empty(m[0]), m[1])
+            )
+        else:
+            board, score = legal[rng.randrange(len(legal))]
+        total += score
+        board = bitboard.add_random_tile(board, rng)
+        moves += 1
+    return total
+
+
+class _Node:
+    """Decision node: the board right after a spawn."""
+
+    __slots__ = ("board", "visits", "actions")
+
+    def __init__(self, board: int):
+        self.board = board
+        self.visits = 0
+        # direction -> [after-move board, merge score, visits, total reward, {board: child}]
+        self.actions: Dict[str, list] = {}
+        for direction in DIRECTIONS:
+            new_board, score = bitboard.MOVES[direction](board)
+            if new_board != board:
+                self.actions[direction] = [new_board, score, 0, 0.0, {}]
+
+
+class MonteCarloSolver2048:
+    """Flat Monte Carlo: spread playouts over the root moves round-robin.
+
+    Each root move is scored by the mean score of the playouts that start
+    with it (move score included). Playouts run until ``budget_ms`` is spent,
+    or until ``max_playouts`` have run if that comes first; a seeded search
+    stopped by ``max_playouts`` picks the same move every time.
+    """
+
+    def __init__(self, budget_ms: float = 100.0, rollout_policy: str = "random",
+                 max_rollout_moves: Optional[int] = None, seed: Optional[int] = None,
+                 max_playouts: Optional[int] = None):
+        if rollout_policy not in ROLLOUT_POLICIES:
+            raise ValueError(f"rollout_policy must be one of {ROLLOUT_POLICIES}")
+        self.budget_ms = budget_ms
+        self.rollout_policy = rollout_policy
+        self.max_rollout_moves = max_rollout_moves
+        self.max_playouts = max_playouts
+        self.rng = random.Random(seed)
+        self.DIRECTIONS = list(DIRECTIONS)
+        self.last_playouts = 0
+
+    def search(self, board: int) -> Dict[str, Tuple[int, float]]:
+        """Run playouts for the budget; returns ``{direction: (playouts, total_score)}``."""
+        legal = bitboard.legal_moves(board)
+        stats = {direction: [0, 0.0] for direction, _, _ in legal}
+        if not legal:
+            return {}
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        playouts = 0
+        while True:
+            for direction, new_board, score in legal:
+                start = bitboard.add_random_tile(new_board, self.rng)
+                reward = score + rollout(start, self.rng, self.rollout_policy, self.max_rollout_moves)
+                stats[direction][0] += 1
+                stats[direction][1] += reward
+            # Whole rounds only, so every root move gets the same number.
+            playouts += len(legal)
+            if time.perf_counter() >= deadline:
+                break
+            if self.max_playouts is not None and playouts >= self.max_playouts:
+                break
+        return {direction: (n, total) for direction, (n, total) in stats.items()}
+
+    def get_best_move(self, grid: List[List[int]]) -> str:
+        stats = self.search(bitboard.from_grid(grid))
+        self.last_playouts = sum(n for n, _ in stats.values())
+        return choose_move(stats, by_mean=True)
+
+
+class UCTSolver2048(MonteCarloSolver2048):
+    """UCT over decision nodes, with spawns sampled on the way down.
+
+    Each iteration descends from the root with UCB1, sampling a spawn after
+    every move, adds one new node, and backs up the score of the path plus a
+    playout from there. Chance outcomes are kept per action as a dict of
+    child boards, so repeated spawns share statistics. Rewards are divided
+    by the largest reward seen so far, so the exploration constant does not
+    depend on how far into the game the board is.
+    The move played is the most visited one. ``max_playouts`` caps the
+    iterations.
+    """
+
+    def __init__(self, budget_ms: float = 100.0, exploration: float = 1.0, **options):
+        super().__init__(budget_ms, **options)
+        self.exploration = exploration
+
+    def search(self, board: int) -> Dict[str, Tuple[int, float]]:
+        root = _Node(board)
+        if not root.actions:
+            return {}
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        scale = 1.0
+        iterations = 0
+        while time.perf_counter() < deadline:
+            if self.max_playouts is not None and iterations >= self.max_playouts:
+                break
+            reward = self._iterate(root, scale)
+            scale = max(scale, reward)
+            iterations += 1
+        return {direction: (a[2], a[3]) for direction, a in root.actions.items()}
+
+    def _iterate(self, root: _Node, scale: float) -> float:
+        path = []
+        node = root
+        reward = 0.0
+        while True:
+            if not node.actions:
+                break
+            direction = self._select(node, scale)
+            action = node.actions[direction]
+            path.append((node, action))
+            reward += action[1]
+            child_board = bitboard.add_random_tile(action[0], self.rng)
+            children = action[4]
+            child = children.get(child_board)
+            if child is None:
+                children[child_board] = _Node(child_board)
+                reward += rollout(child_board, self.rng, self.rollout_policy, self.max_rollout_moves)
+                break
+            node = child
+        for parent, action in path:
+            parent.visits += 1
+            action[2] += 1
+            action[3] += reward
+        return reward
+
+    def _select(self, node: _Node, scale: float) -> str:
+        best_direction = None
+        best_value = float('-inf')
+        log_visits = math.log(node.visits + 1)
+        for direction, action in node.actions.items():
+            visits = action[2]
+            if visits == 0:
+                return direction
+            value = action[3] / (visits * scale) + self.exploration * math.sqrt(log_visits / visits)
+            if value > best_value:
+                best_value = value
+                best_direction = direction
+        return best_direction
+
+
+def choose_move(stats: Dict[str, Tuple[int, float]], by_mean: bool) -> str:
+    """Best move by mean reward or by visit count; ties go to ``DIRECTIONS`` order."""
+    best_move = ""
+    best_key = None
+    for direction in DIRECTIONS:
+        if direction not in stats:
+            continue
+        visits, total = stats[direction]
+        if not visits:
+            continue
+        key = total / visits if by_mean else visits
+        if best_key is None or key > best_key:
+            best_key = key
+            best_move = direction
+    return best_move
+
+
+SOLVERS = {
+    "flat": MonteCarloSolver2048,
+    "uct": UCTSolver2048,
+}
+
+
+def _search_worker(kind: str, options: dict, board: int, seed: int) -> Dict[str, Tuple[int, float]]:
+    return SOLVERS[kind](seed=seed, **options).search(board)
+
+
+class ParallelMonteCarloSolver2048:
+    """Root-parallel search: every worker searches the same board with its own seed.
+
+    Per-move playout counts and score totals are summed across workers, in
+    worker order, before the move is picked.
+    """
+
+    def __init__(self, kind: str = "flat", workers: Optional[int] = None,
+                 seed: Optional[int] = None, **options):
+        self.kind = kind
+        self.options = options
+        self.workers = workers or os.cpu_count() or 1
+        self.rng = random.Random(seed)
+        self.DIRECTIONS = list(DIRECTIONS)
+        self.last_playouts = 0
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def get_best_move(self, grid: List[List[int]]) -> str:
+        board = bitboard.from_grid(grid)
+        futures = [
+            self.executor.submit(_search_worker, self.kind, self.options, board,
+                                 self.rng.getrandbits(64))
+            for _ in range(self.workers)
+        ]
+        totals: Dict[str, List[float]] = {}
+        for future in futures:
+            for direction, (visits, total) in future.result().items():
+                entry = totals.setdefault(direction, [0, 0.0])
+                entry[0] += visits
+                entry[1] += total
+        self.last_playouts = sum(visits for visits, _ in totals.values())
+        return choose_move({d: tuple(v) for d, v in totals.items()}, by_mean=self.kind == "flat")
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+
+class MonteCarloGame2048Client(Game2048Client):
+    def __init__(self, solver, server_url="http://127.0.0.1:5000", recorder=None):
+        super().__init__(server_url, recorder)
+        self.solver = solver
 
     def solve(self):
         while True:
@@ -133,17 +318,57 @@ class Game2048Client:
                 self.print_final_stats(state["state"], state["score"], state["total_moves"], "won")
                 break
 
-            # Use MCTS to select the best move
-            best_move = self.monte_carlo_tree_search(state["state"])
-            if best_move:
-                self.make_move(best_move)
-                time.sleep(0.1)  # Small delay to avoid rapid requests
+            # Playouts run locally; only the chosen move reaches the server.
+            best_move = self.solver.get_best_move(state["state"])
+            if not best_move:
+                print("No valid moves available.")
+                break
+            result = self.make_move(best_move)
+            if result is None or not result.get("moved", False):
+                print(f"Move {best_move} was rejected. Exiting.")
+                break
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Monte Carlo 2048 solver client")
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default="uct")
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                        help="search time per move, per worker (default: 100)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="run the search on this many processes (default: 1)")
+    parser.add_argument("--policy", choices=ROLLOUT_POLICIES, default="random",
+                        help="playout policy (default: random)")
+    parser.add_argument("--max-rollout-moves", type=int, default=None,
+                        help="cut playouts off after this many moves")
+    parser.add_argument("--max-playouts", type=int, default=None,
+                        help="stop a search after this many playouts, per worker, "
+                             "even with time left")
+    parser.add_argument("--games", type=int, default=25)
+    add_recording_arguments(parser)
+    return parser.parse_args()
+
 
 # Example usage
 if __name__ == "__main__":
-    client = Game2048Client(depth=50)  # Define the depth as needed
-    # Run the game 25 times
-    for i in range(25):
-        client.start_game()
-        client.solve()
-        print(f"Game {i + 1} completed")
+    args = parse_args()
+    options = {
+        "budget_ms": args.budget_ms,
+        "rollout_policy": args.policy,
+        "max_rollout_moves": args.max_rollout_moves,
+        "max_playouts": args.max_playouts,
+    }
+    if args.workers > 1:
+        solver = ParallelMonteCarloSolver2048(args.solver, args.workers, **options)
+    else:
+        solver = SOLVERS[args.solver](**options)
+    recorder = recorder_from_args(args, os.path.join(SCRIPT_DIR, "screenshots"))
+    client = MonteCarloGame2048Client(solver, recorder=recorder)
+    try:
+        for i in range(args.games):
+            if client.start_game():
+                client.solve()
+            print(f"Game {i + 1} completed")
+    finally:
+        if isinstance(solver, ParallelMonteCarloSolver2048):
+            solver.close()
+        client.close()
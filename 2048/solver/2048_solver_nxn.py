@@ -0,0 +1,221 @@
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Make the shared ``game_2048`` package importable when this script is run
+# directly (``python3 2048/solver/<file>.py``).
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from game_2048 import packed  # noqa: E402
+from game_2048.client import Game2048Client  # noqa: E402
+from game_2048.constants import DEFAULT_SPAWN, GAME_SIZE, MAX_SIZE, MIN_SIZE  # noqa: E402
+from game_2048.recording import add_recording_arguments, recorder_from_args  # noqa: E402
+
+DIRECTIONS = ("DOWN", "LEFT", "RIGHT", "UP")
+
+# Line heuristic weights (nneonneo's 2048-ai), scored on tile exponents.
+LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+
+
+def line_score(line: bytes) -> float:
+    """Heuristic value of one row or column; it does not depend on the board size."""
+    total = 0.0
+    empty = 0
+    merges = 0
+    previous = 0
+    counter = 0
+    for exponent in line:
+        total += exponent ** SUM_POWER
+        if exponent == 0:
+            empty += 1
+            continue
+        if previous == exponent:
+            counter += 1
+        elif counter > 0:
+            merges += 1 + counter
+            counter = 0
+        previous = exponent
+    if counter > 0:
+        merges += 1 + counter
+
+    monotonicity_left = 0.0
+    monotonicity_right = 0.0
+    for i in range(1, len(line)):
+        a = line[i - 1] ** MONOTONICITY_POWER
+        b = line[i] ** MONOTONICITY_POWER
+        if line[i - 1] > line[i]:
+            monotonicity_left += a - b
+        else:
+            monotonicity_right += b - a
+
+    return (
+        LOST_PENALTY
+        + EMPTY_WEIGHT * empty
+        + MERGES_WEIGHT * merges
+        - MONOTONICITY_WEIGHT * min(monotonicity_left, monotonicity_right)
+        - SUM_WEIGHT * total
+    )
+
+
+class NxNExpectimaxSolver:
+    """Expectimax on packed boards of any size from 3x3 to 8x8.
+
+    The board size comes from the grid passed to :meth:`get_best_move`. A
+    leaf is scored as the sum of :func:`line_score` over every row and
+    column. Line scores are memoised, like the line moves in
+    :mod:`game_2048.packed`.
+
+    Chance nodes weight each empty cell and each tile of ``spawn`` by its
+    probability. A chance node becomes a leaf once the probability of
+    reaching any one of its cells falls below ``prob_cutoff``. So boards
+    with many empty cells are searched shallower, and tight boards, where
+    the search matters, are searched deeper.
+    """
+
+    def __init__(self, max_depth: int = 3, prob_cutoff: float = 1e-3, spawn=DEFAULT_SPAWN):
+        self.max_depth = max_depth
+        self.prob_cutoff = prob_cutoff
+        self.outcomes = packed.spawn_outcomes(packed.normalize_spawn(spawn))
+        self.DIRECTIONS = list(DIRECTIONS)
+        self._line_scores: Dict[bytes, float] = {}
+        self._cache: Dict[Tuple[bytes, int], float] = {}
+        self.nodes = 0
+        # Times the cutoff has fired; a node whose subtree it touched is
+        # worth less than its depth says, so it is not cached.
+        self.cutoffs = 0
+
+    def evaluate(self, board: bytes) -> float:
+        n = packed.size_of(board)
+        scores = self._line_scores
+        total = 0.0
+        for line in [board[start:start + n] for start in range(0, n * n, n)] + [board[c::n] for c in range(n)]:
+            score = scores.get(line)
+            if score is None:
+                score = scores[line] = line_score(line)
+            total += score
+        return total
+
+    def get_best_move(self, grid: List[List[int]]) -> str:
+        board = packed.from_grid(grid)
+        self._cache.clear()
+        best_move = ""
+        best_value = float("-inf")
+        for direction in self.DIRECTIONS:
+            new_board, _ = packed.move(board, direction)
+            if new_board == board:
+                continue
+            value = self._chance(new_board, self.max_depth, 1.0)
+            if value > best_value:
+                best_value = value
+                best_move = direction
+        return best_move
+
+    def _max(self, board: bytes, depth: int, prob: float) -> float:
+        self.nodes += 1
+        best = None
+        for direction in self.DIRECTIONS:
+            new_board, _ = packed.move(board, direction)
+            if new_board != board:
+                value = self._chance(new_board, depth - 1, prob)
+                if best is None or value > best:
+                    best = value
+        # No move left: the game is lost here.
+        return best if best is not None else 0.0
+
+    def _chance(self, board: bytes, depth: int, prob: float) -> float:
+        if depth <= 0:
+            return self.evaluate(board)
+        empty = packed.empty_cells(board)
+        cell_prob = prob / len(empty) if empty else 0.0
+        if cell_prob < self.prob_cutoff:
+            self.cutoffs += 1
+            return self.evaluate(board)
+        key = (board, depth)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        self.nodes += 1
+        cutoffs = self.cutoffs
+        total = 0.0
+        for index in empty:
+            for exponent, p in self.outcomes:
+                child = packed.set_cell(board, index, exponent)
+                total += p * self._max(child, depth, cell_prob * p)
+        value = total / len(empty)
+        # A value cut short on an unlikely path would be wrong for a later,
+        # likelier visit of the same board at the same depth.
+        if self.cutoffs == cutoffs:
+            self._cache[key] = value
+        return value
+
+
+class NxNGame2048Client(Game2048Client):
+    """Plays server games of any size; ``size`` and ``spawn`` are sent to ``/start``."""
+
+    def __init__(self, solver: NxNExpectimaxSolver, size: int = GAME_SIZE,
+                 spawn=DEFAULT_SPAWN, server_url: str = "http://127.0.0.1:5000",
+                 recorder=None):
+        super().__init__(server_url, recorder=recorder)
+        self.solver = solver
+        self.size = size
+        self.spawn = spawn
+
+    def play(self) -> Optional[Dict]:
+        state = self.start_game(size=self.size, spawn=[list(pair) for pair in self.spawn])
+        if state is None:
+            print("Failed to start a new game.")
+            return None
+        while state["status"] == "ongoing":
+            best_move = self.solver.get_best_move(state["state"])
+            if not best_move:
+                break
+            state = self.make_move(best_move)
+            if state is None or not state.get("moved", False):
+                print(f"Move {best_move} was rejected. Exiting.")
+                break
+        return state
+
+
+def parse_spawn(text: str):
+    """``"2:0.9,4:0.1"`` -> ``((2, 0.9), (4, 0.1))``."""
+    return packed.normalize_spawn(
+        [pair.split(":") for pair in text.split(",") if pair]
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Expectimax 2048 solver for 3x3 to 8x8 boards")
+    parser.add_argument("--size", type=int, default=GAME_SIZE, choices=range(MIN_SIZE, MAX_SIZE + 1))
+    parser.add_argument("--spawn", type=parse_spawn, default=DEFAULT_SPAWN,
+                        help="spawn distribution as tile:probability pairs (default: 2:0.9,4:0.1)")
+    parser.add_argument("--depth", type=int, default=3, help="maximum search depth in moves")
+    parser.add_argument("--prob-cutoff", type=float, default=1e-3)
+    parser.add_argument("--games", type=int, default=1)
+    add_recording_arguments(parser)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    solver = NxNExpectimaxSolver(args.depth, args.prob_cutoff, args.spawn)
+    recorder = recorder_from_args(args, os.path.join(SCRIPT_DIR, "screenshots"))
+    client = NxNGame2048Client(solver, args.size, args.spawn, recorder=recorder)
+    try:
+        for i in range(args.games):
+            state = client.play()
+            if state is not None:
+                print(f"Game {i + 1}: {state['status']}, score {state['score']}, "
+                      f"max tile {state['max_tile']}, {state['total_moves']} moves")
+    finally:
+        client.close()
@@ -1,6 +1,24 @@
 # test_game.py
+import contextlib
+import csv
+import importlib.util
+import io
+import os
+import random
+import sys
+import tempfile
 import unittest
+from game_2048 import bitboard, gui, packed
+from game_2048.api import apply_moves
+from game_2048.benchmark import benchmark_solver, percentile, position_corpus
 from game_2048.game import Game2048
+from game_2048.gamelog import GameLogError, GameLogWriter, parse_game_log, render_frames
+from game_2048.gamelog import parse_args as parse_gamelog_args
+from game_2048.recording import GameRecorder, read_move_log, render_move_log
+from game_2048.selfplay import BitboardEngine, SelfPlayRunner, load_solver_class
+from game_2048.selfplay import parse_args as parse_selfplay_args
+from game_2048.sessions import SessionRegistry
+from game_2048.transposition import CHANCE_NODE, MAX_NODE, TranspositionTable, node_key
 
 class TestGame2048(unittest.TestCase):
     def setUp(self):
@@ -10,7 +28,46 @@ class TestGame2048(unittest.TestCase):
         state = self.game.get_state()
         self.assertEqual(state['score'], 0)
         self.assertEqual(state['moves'], 0)
-        self.assertEqual(state['max_tile'], 2)
+        # Either opening tile may be a 4.
+        self.assertEqual(state['max_tile'], max(max(row) for row in self.game.grid))
+        self.assertEqual(sum(v > 0 for row in self.game.grid for v in row), 2)
+
+    def test_seed_replays_spawns(self):
+        directions = ['LEFT', 'UP', 'RIGHT', 'DOWN'] * 10
+        first, second = Game2048(seed=42), Game2048(seed=42)
+        for direction in directions:
+            self.assertEqual(first.move(direction), second.move(direction))
+        self.assertEqual(first.grid, second.grid)
+        self.assertEqual(first.score, second.score)
+        other = Game2048(seed=43)
+        self.assertNotEqual(
+            (first.grid, first.seed), (other.grid, other.seed),
+        )
+
+    def test_spawn_draws_do_not_depend_on_the_board(self):
+        # Every spawn takes two draws, however many cells are empty.
+        game = Game2048(rng=random.Random(7))
+        game.grid = [[2 if (i, j) != (3, 3) else 0 for j in range(4)] for i in range(4)]
+        game.add_new_tile()
+        self.assertEqual(game.last_spawn[:2], (3, 3))
+        reference = random.Random(7)
+        for _ in range(3 * 2):
+            reference.random()
+        self.assertEqual(game.rng.random(), reference.random())
+
+    def test_tracked_state_matches_a_full_scan(self):
+        rng = random.Random(1)
+        for size, seed in ((3, 1), (4, 2), (4, 3), (5, 4)):
+            game = Game2048(size, seed=seed)
+            while True:
+                cells = [v for row in game.grid for v in row]
+                self.assertEqual(game._empty, [i for i, v in enumerate(cells) if not v])
+                self.assertEqual(game.max_tile, max(cells))
+                legal = [packed.move_grid(game.grid, d)[2] for d in packed.DIRECTIONS]
+                self.assertEqual(game.is_game_over(), not any(legal))
+                if game.is_game_over():
+                    break
+                game.move(rng.choice([d for d, ok in zip(packed.DIRECTIONS, legal) if ok]))
 
     def test_move(self):
         self.game.add_new_tile = lambda: None
@@ -64,4 +121,578 @@ class TestGame2048(unittest.TestCase):
             [4, 2, 4, 2],
         ]
 
-        self.assertTrue(self.game.is_game_over())
\ No newline at end of file
+        self.assertTrue(self.game.is_game_over())
+
+    def test_merge_into_65536_past_bitboard_cap(self):
+        self.game.add_new_tile = lambda: None
+        self.game.grid = [
+            [32768, 32768, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0]
+        ]
+        self.game.highest_tile = 32768
+
+        self.assertTrue(self.game.move('LEFT'))
+        self.assertEqual(self.game.grid[0][0], 65536)
+
+    def test_assigned_grid_picks_the_engine_by_its_top_tile(self):
+        # highest_tile only tracks play; the grid setter must be enough.
+        self.game.add_new_tile = lambda: None
+        self.game.grid = [
+            [32768, 32768, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0]
+        ]
+
+        self.assertTrue(self.game.move('LEFT'))
+        self.assertEqual(self.game.grid[0], [65536, 0, 0, 0])
+
+    def test_move_with_tile_past_bitboard_cap(self):
+        self.game.add_new_tile = lambda: None
+        self.game.grid = [
+            [65536, 2, 2, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0]
+        ]
+
+        self.assertTrue(self.game.move('LEFT'))
+        self.assertEqual(self.game.grid[0], [65536, 4, 0, 0])
+
+class TestBitboard(unittest.TestCase):
+    def test_round_trip(self):
+        grid = [
+            [2, 4, 8, 16],
+            [0, 32768, 0, 64],
+            [0, 0, 0, 0],
+            [1024, 0, 2, 0]
+        ]
+        board = bitboard.from_grid(grid)
+        self.assertEqual(bitboard.to_grid(board), grid)
+        self.assertEqual(bitboard.count_empty(board), 8)
+        self.assertEqual(bitboard.max_exponent(board), 15)
+
+    def test_moves_match_packed_engine(self):
+        rng = random.Random(2048)
+        for _ in range(500):
+            grid = [[(1 << rng.randint(1, 10)) if rng.random() < 0.6 else 0
+                     for _ in range(4)] for _ in range(4)]
+            board = bitboard.from_grid(grid)
+            cells = packed.from_grid(grid)
+            for direction in bitboard.DIRECTIONS:
+                new_board, score = bitboard.move(board, direction)
+                new_cells, packed_score = packed.move(cells, direction)
+                self.assertEqual(bitboard.to_grid(new_board), packed.to_grid(new_cells))
+                self.assertEqual(score, packed_score)
+                self.assertEqual(new_board != board, new_cells != cells)
+
+    def test_game_over_board_has_no_moves(self):
+        board = bitboard.from_grid([
+            [2, 4, 2, 4],
+            [4, 2, 4, 2],
+            [2, 4, 2, 4],
+            [4, 2, 4, 2],
+        ])
+        self.assertFalse(bitboard.can_move(board))
+        self.assertEqual(bitboard.legal_moves(board), [])
+
+def _slide_row_left(row):
+    tiles = [v for v in row if v]
+    out, score, i = [], 0, 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+            out.append(tiles[i] * 2)
+            score += tiles[i] * 2
+            i += 2
+        else:
+            out.append(tiles[i])
+            i += 1
+    return out + [0] * (len(row) - len(out)), score
+
+
+class TestPackedBoard(unittest.TestCase):
+    def test_moves_match_reference_on_every_size(self):
+        rng = random.Random(5)
+        for size in range(3, 9):
+            for _ in range(50):
+                grid = [[(1 << rng.randint(1, 17)) if rng.random() < 0.6 else 0
+                         for _ in range(size)] for _ in range(size)]
+                board = packed.from_grid(grid)
+                self.assertEqual(packed.to_grid(board), grid)
+                new_board, score = packed.move_left(board)
+                rows = [_slide_row_left(row) for row in grid]
+                self.assertEqual(packed.to_grid(new_board), [r for r, _ in rows])
+                self.assertEqual(score, sum(s for _, s in rows))
+                # UP is LEFT on the transposed board.
+                transposed = [list(col) for col in zip(*grid)]
+                up, up_score = packed.move_up(board)
+                left_t, left_t_score = packed.move_left(packed.from_grid(transposed))
+                self.assertEqual(packed.to_grid(up), [list(c) for c in zip(*packed.to_grid(left_t))])
+                self.assertEqual(up_score, left_t_score)
+
+    def test_sized_game_spawns_from_distribution(self):
+        random.seed(3)
+        game = Game2048(size=5, spawn={"4": 1.0})
+        self.assertEqual(len(game.grid), 5)
+        for direction in ('LEFT', 'UP', 'RIGHT', 'DOWN') * 5:
+            game.move(direction)
+        self.assertEqual(game.last_spawn[2], 4)
+        self.assertFalse(any(v == 2 for row in game.grid for v in row))
+
+    def test_invalid_configurations_are_rejected(self):
+        with self.assertRaises(ValueError):
+            Game2048(size=9)
+        with self.assertRaises(ValueError):
+            packed.normalize_spawn({3: 1.0})
+        with self.assertRaises(ValueError):
+            packed.normalize_spawn({2: 0.5, 4: 0.4})
+        self.assertEqual(packed.pick_spawn(packed.normalize_spawn({2: 0.9, 4: 0.1}), 0.95), 4)
+
+
+class _IdGame:
+    _next = 0
+
+    def __init__(self):
+        _IdGame._next += 1
+        self.game_id = f"g{_IdGame._next}"
+
+class TestSessionRegistry(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.registry = SessionRegistry(
+            _IdGame, max_sessions=2, ttl_seconds=10, clock=lambda: self.now
+        )
+
+    def test_sessions_are_independent_and_default_to_latest(self):
+        first = self.registry.create()
+        second = self.registry.create()
+        self.assertIs(self.registry.get(first.game_id), first)
+        self.assertIs(self.registry.get(), second)
+        self.assertIsNone(self.registry.get("missing"))
+
+    def test_least_recently_used_is_evicted(self):
+        first = self.registry.create()
+        second = self.registry.create()
+        self.registry.get(first.game_id)
+        self.registry.create()
+        self.assertIsNone(self.registry.get(second.game_id))
+        self.assertIs(self.registry.get(first.game_id), first)
+
+    def test_idle_sessions_expire(self):
+        first = self.registry.create()
+        self.now = 5
+        second = self.registry.create()
+        self.now = 12
+        self.assertIsNone(self.registry.get(first.game_id))
+        self.assertIs(self.registry.get(second.game_id), second)
+
+    def test_evicted_sessions_are_reported(self):
+        evicted = []
+        self.registry.on_evict = evicted.append
+        first = self.registry.create()
+        second = self.registry.create()
+        self.registry.create()
+        self.registry.remove(second.game_id)
+        self.assertEqual(evicted, [first, second])
+
+class TestApplyMoves(unittest.TestCase):
+    def setUp(self):
+        self.game = Game2048()
+        self.game.game_over = False
+        self.game.game_won = False
+        self.game.grid = [
+            [2, 2, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0]
+        ]
+
+    def test_batch_reports_steps_and_spawns(self):
+        result = apply_moves(self.game, ['LEFT', 'DOWN'])
+        self.assertEqual(result['applied'], 2)
+        self.assertIsNone(result['stop_reason'])
+        self.assertEqual(result['steps'][0]['score_gained'], 4)
+        row, col, value = result['steps'][1]['spawn']
+        self.assertEqual(self.game.grid[row][col], value)
+        self.assertEqual(self.game.total_moves, 2)
+
+    def test_batch_stops_at_first_illegal_move(self):
+        self.game.add_new_tile = lambda: None
+        result = apply_moves(self.game, ['LEFT', 'LEFT', 'RIGHT'])
+        self.assertEqual(result['applied'], 1)
+        self.assertEqual(result['stop_reason'], 'illegal_move')
+        self.assertEqual(self.game.grid[0], [4, 0, 0, 0])
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_deeper_entry_answers_shallower_probe(self):
+        table = TranspositionTable(size_bits=4)
+        key = node_key(0x1234, MAX_NODE)
+        table.store(key, 3, 1.5)
+        self.assertEqual(table.probe(key, 2), 1.5)
+        self.assertIsNone(table.probe(key, 4))
+        self.assertIsNone(table.probe(node_key(0x1234, CHANCE_NODE), 1))
+
+    def test_depth_preferred_slot_survives_collisions(self):
+        # One bucket, so every key collides.
+        table = TranspositionTable(size_bits=0)
+        table.store(1, 5, 10.0)
+        table.store(2, 1, 20.0)
+        table.store(3, 2, 30.0)
+        self.assertEqual(table.probe(1, 5), 10.0)
+        self.assertIsNone(table.probe(2, 1))
+        self.assertEqual(table.probe(3, 2), 30.0)
+        table.store(4, 6, 40.0)
+        self.assertEqual(table.probe(4, 6), 40.0)
+        self.assertEqual(table.probe(1, 5), 10.0)
+
+    def test_shallower_store_keeps_the_always_replace_entry(self):
+        table = TranspositionTable(size_bits=0)
+        table.store(1, 5, 10.0)
+        table.store(2, 3, 20.0)
+        table.store(2, 1, 21.0)
+        self.assertEqual(table.probe(2, 3), 20.0)
+        table.store(2, 4, 22.0)
+        self.assertEqual(table.probe(2, 4), 22.0)
+        table.store(2, 6, 23.0)
+        self.assertEqual(table.probe(2, 6), 23.0)
+        self.assertEqual(table.probe(1, 5), 10.0)
+        self.assertEqual(table.keys.count(2), 1)
+
+
+class _FirstLegalSolver:
+    """Picks the first direction that changes the board."""
+
+    def get_best_move(self, grid):
+        moves = packed.legal_moves(packed.from_grid(grid))
+        return moves[0][0] if moves else ""
+
+
+class TestSelfPlay(unittest.TestCase):
+    def test_engine_is_reproducible_per_seed(self):
+        self.assertEqual(BitboardEngine(7).board, BitboardEngine(7).board)
+        self.assertEqual(bitboard.count_empty(BitboardEngine(7).board), 14)
+
+    def test_runner_writes_one_row_per_seed(self):
+        runner = SelfPlayRunner('test_2048:_FirstLegalSolver')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'games.csv')
+            records = runner.run([3, 4, 3], output=path)
+            with open(path, newline='') as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual([row['seed'] for row in rows], ['3', '4', '3'])
+        self.assertEqual(records[0]['status'], 'over')
+        for key in ('score', 'moves', 'max_tile'):
+            self.assertEqual(records[0][key], records[2][key])
+
+    def test_size_picks_the_packed_engine(self):
+        self.assertEqual(parse_selfplay_args(['x:Solver', '--size', '5']).engine, 'packed')
+        self.assertEqual(parse_selfplay_args(['x:Solver']).engine, 'bitboard')
+        with self.assertRaises(ValueError):
+            SelfPlayRunner('test_2048:_FirstLegalSolver', engine='bitboard',
+                           engine_options={'size': 5})
+        records = SelfPlayRunner('test_2048:_FirstLegalSolver', engine='packed',
+                                 engine_options={'size': 5}).run([1])
+        self.assertEqual(records[0]['status'], 'over')
+
+
+class TestSolverBenchmark(unittest.TestCase):
+    def test_percentile_interpolates(self):
+        self.assertEqual(percentile([4, 1, 3, 2], 50), 2.5)
+        self.assertEqual(percentile([5], 99), 5)
+        self.assertIsNone(percentile([], 50))
+
+    def test_corpus_is_seeded_and_reports_are_complete(self):
+        self.assertEqual(position_corpus(3, seed=9), position_corpus(4, seed=9)[:3])
+        report = benchmark_solver('test_2048:_FirstLegalSolver', positions=3, games=2, seed=9)
+        self.assertEqual(report['positions']['count'], 3)
+        self.assertIsNone(report['node_source'])
+        self.assertEqual([r['seed'] for r in report['games']['results']], [9, 10])
+        self.assertEqual(report['games']['reach']['2048'], 0.0)
+        self.assertLessEqual(report['games']['p50_ms'], report['games']['p99_ms'])
+
+
+class TestNxNExpectimaxSolver(unittest.TestCase):
+    def setUp(self):
+        self.solver_class = load_solver_class('2048_solver_nxn:NxNExpectimaxSolver')
+        self.board = packed.from_grid([[2, 4, 8], [0, 2, 0], [0, 0, 4]])
+
+    def test_cut_short_values_are_not_cached(self):
+        expected = self.solver_class(max_depth=2)._chance(self.board, 2, 1.0)
+        solver = self.solver_class(max_depth=2)
+        # Reached first on an unlikely path, the grandchildren fall under the cutoff.
+        unlikely = solver._chance(self.board, 2, 0.005)
+        self.assertGreater(solver.cutoffs, 0)
+        self.assertNotEqual(unlikely, expected)
+        self.assertEqual(solver._chance(self.board, 2, 1.0), expected)
+
+
+HAVE_NUMBA = importlib.util.find_spec('numba') is not None
+
+
+@unittest.skipUnless(HAVE_NUMBA, 'needs numba (the solvers extra)')
+class TestMonteCarloSolvers(unittest.TestCase):
+    GRID = [
+        [2, 4, 8, 16],
+        [0, 2, 0, 4],
+        [0, 0, 0, 2],
+        [0, 0, 0, 0]
+    ]
+
+    def test_seeded_search_is_legal_and_reproducible(self):
+        legal = [move[0] for move in packed.legal_moves(packed.from_grid(self.GRID))]
+        for name in ('MonteCarloSolver2048', 'UCTSolver2048'):
+            solver_class = load_solver_class('2048_solver_montecarlo_tree_search:' + name)
+            moves = []
+            for _ in range(2):
+                # A budget that never runs out, so max_playouts ends the search.
+                solver = solver_class(budget_ms=60000, max_playouts=150,
+                                      max_rollout_moves=30, seed=3)
+                moves.append(solver.get_best_move(self.GRID))
+                self.assertLessEqual(solver.last_playouts, 150 + len(legal))
+            self.assertIn(moves[0], legal, name)
+            self.assertEqual(moves[0], moves[1], name)
+
+
+class TestNTupleNetwork(unittest.TestCase):
+    def setUp(self):
+        from game_2048.ntuple import NTupleNetwork, train
+        self.network_class = NTupleNetwork
+        self.network = NTupleNetwork.from_pattern('small')
+        train(self.network, 20, seed=1, report_every=20, log=None)
+        self.board = bitboard.from_grid([
+            [2, 4, 8, 16],
+            [0, 2, 0, 4],
+            [0, 0, 0, 2],
+            [0, 0, 0, 0]
+        ])
+
+    def test_training_learns_symmetric_values(self):
+        self.assertTrue(self.network.weights.any())
+        value = self.network.evaluate(self.board)
+        self.assertAlmostEqual(value, self.network.evaluate(bitboard.transpose(self.board)), places=3)
+
+    def test_save_and_memory_mapped_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'weights.npy')
+            self.network.save(path)
+            loaded = self.network_class.load(path)
+            self.assertFalse(loaded.weights.flags.writeable)
+            self.assertEqual(loaded.evaluate(self.board), self.network.evaluate(self.board))
+            self.assertIn(loaded.best_move(self.board), bitboard.DIRECTIONS)
+            del loaded
+
+
+@unittest.skipUnless(HAVE_NUMBA, 'needs numba (the solvers extra)')
+class TestGpt5CodexSolver(unittest.TestCase):
+    GRID = [
+        [2, 4, 8, 16],
+        [0, 2, 0, 4],
+        [0, 0, 0, 2],
+        [0, 0, 0, 0]
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.solver_class = load_solver_class('2048-solver-october2025-gpt5-codex:OptimizedSolver2048')
+        cls.legal = [move[0] for move in packed.legal_moves(packed.from_grid(cls.GRID))]
+
+    def test_batch_evaluator_matches_the_reference(self):
+        module = sys.modules[self.solver_class.__module__]
+        grids = position_corpus(module.PARALLEL_BATCH_MIN + 44, seed=6)
+        boards = [module.grid_to_exponents(grid) for grid in grids]
+        depths = [i % 4 for i in range(len(boards))]
+        # The uncompiled kernel is the reference for the compiled batch.
+        expected = [module._evaluate_board.py_func(board, depth)
+                    for board, depth in zip(boards, depths)]
+        parallel = module.evaluate_batch(boards, depths)
+        serial = module.evaluate_batch(boards[:50], depths[:50])
+        self.assertEqual(parallel.tolist(), expected)
+        self.assertEqual(serial.tolist(), expected[:50])
+        solver = self.solver_class()
+        self.assertEqual([solver.evaluate_position(grid, depth) for grid, depth in zip(grids, depths)],
+                         expected)
+
+    def test_cutoff_and_sampled_searches_return_legal_moves(self):
+        solver = self.solver_class(base_depth=3, prob_cutoff=0.05)
+        self.assertIn(solver.get_best_move(self.GRID), self.legal)
+        self.assertGreater(solver.cutoffs, 0)
+        moves = [self.solver_class(base_depth=3, sample_cells=2, seed=1).get_best_move(self.GRID)
+                 for _ in range(2)]
+        self.assertIn(moves[0], self.legal)
+        self.assertEqual(moves[0], moves[1])
+
+    def test_no_sampling_is_the_full_search(self):
+        full = self.solver_class(prob_cutoff=0).expectimax(self.GRID, 3, True, use_cache=False)
+        # More cells to sample than there are empty cells: nothing is left out.
+        every_cell = self.solver_class(prob_cutoff=0, sample_cells=16)
+        self.assertEqual(every_cell.expectimax(self.GRID, 3, True, use_cache=False), full)
+
+    def test_parallel_move_is_reproducible(self):
+        parallel_class = load_solver_class('2048-solver-october2025-gpt5-codex:ParallelSolver2048')
+        module = sys.modules[parallel_class.__module__]
+        # A fixed value: hash() would change with PYTHONHASHSEED.
+        self.assertEqual(module._task_seed(5, bitboard.from_grid(self.GRID), 2, 1, 3, 4),
+                         8145898083511750052)
+        moves = []
+        for _ in range(2):
+            # One task per sampled spawn, so the task seeds pick the cells.
+            with parallel_class(workers=2, parallel_chance=True, base_depth=3,
+                                sample_cells=3, seed=5) as solver:
+                moves.append(solver.get_best_move(self.GRID))
+        self.assertIn(moves[0], self.legal)
+        self.assertEqual(moves[0], moves[1])
+
+    def test_cut_short_values_stay_out_of_the_table(self):
+        expected, _ = self.solver_class(prob_cutoff=1e-2).expectimax(self.GRID, 3, False)
+        solver = self.solver_class(prob_cutoff=1e-2)
+        # Reached first on an unlikely path, every max child falls under the cutoff.
+        unlikely, _ = solver.expectimax(self.GRID, 3, False, prob=0.05)
+        self.assertGreater(solver.cutoffs, 0)
+        self.assertNotEqual(unlikely, expected)
+        self.assertEqual(solver.expectimax(self.GRID, 3, False)[0], expected)
+
+
+def _state_of(game, status='ongoing', moved=True):
+    return {'state': [row[:] for row in game.grid], 'score': game.score,
+            'total_moves': game.total_moves, 'status': status, 'moved': moved}
+
+
+class TestGameRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        random.seed(5)
+        self.game = Game2048()
+
+    def _play(self, recorder, directions):
+        recorder.start('g1', _state_of(self.game))
+        for i, direction in enumerate(directions):
+            moved = self.game.move(direction)
+            status = 'over' if i == len(directions) - 1 else 'ongoing'
+            recorder.record(direction, _state_of(self.game, status, moved))
+        recorder.close()
+
+    def test_samples_frames_and_logs_every_move(self):
+        recorder = GameRecorder(self.tmp.name, every=2, terminal=True, move_log=True)
+        self._play(recorder, ['LEFT', 'DOWN', 'RIGHT', 'UP', 'LEFT'])
+        files = sorted(os.listdir(recorder.session_folder))
+        moves = recorder.moves
+        expected = {f'{n:04d}.png' for n in range(0, moves + 1, 2)} | {f'{moves:04d}.png'}
+        self.assertEqual(set(files) - {'moves.log'}, expected)
+
+        snapshots = read_move_log(os.path.join(recorder.session_folder, 'moves.log'))
+        self.assertEqual(len(snapshots), moves + 1)
+        self.assertEqual(snapshots[-1].grid, self.game.grid)
+        self.assertEqual(snapshots[-1].score, self.game.score)
+        self.assertTrue(snapshots[-1].is_game_over())
+
+        out = os.path.join(self.tmp.name, 'frames')
+        written = render_move_log(os.path.join(recorder.session_folder, 'moves.log'), out, every=3)
+        self.assertEqual(written, len(os.listdir(out)))
+
+    def test_batch_is_replayed_move_by_move(self):
+        recorder = GameRecorder(self.tmp.name, terminal=False, move_log=True)
+        previous = _state_of(self.game)
+        recorder.start('g1', previous)
+        self.game.game_over = self.game.game_won = False
+        result = apply_moves(self.game, ['LEFT', 'DOWN', 'RIGHT'])
+        recorder.record_batch(previous, {**_state_of(self.game), **result})
+        recorder.close()
+        snapshots = read_move_log(os.path.join(recorder.session_folder, 'moves.log'))
+        self.assertEqual(len(snapshots), result['applied'] + 1)
+        self.assertEqual(snapshots[-1].grid, self.game.grid)
+
+    def test_batch_on_a_larger_board(self):
+        game = Game2048(5, seed=8)
+        recorder = GameRecorder(self.tmp.name, terminal=False, move_log=True)
+        previous = _state_of(game)
+        recorder.start('g5', previous)
+        game.game_over = game.game_won = False
+        result = apply_moves(game, ['LEFT', 'DOWN', 'RIGHT', 'UP'])
+        recorder.record_batch(previous, {**_state_of(game), **result})
+        recorder.close()
+        snapshots = read_move_log(os.path.join(recorder.session_folder, 'moves.log'))
+        self.assertEqual(len(snapshots), result['applied'] + 1)
+        self.assertEqual(snapshots[-1].grid, game.grid)
+
+
+class TestGameLog(unittest.TestCase):
+    def _logged_game(self, moves=200):
+        random.seed(11)
+        game = Game2048()
+        buffer = io.BytesIO()
+        writer = GameLogWriter.for_game(buffer, game, seed=11, config={'solver': 'random'})
+        rng = random.Random(3)
+        for _ in range(moves):
+            if game.is_game_over():
+                break
+            score = game.score
+            direction = rng.choice(packed.DIRECTIONS)
+            if game.move(direction):
+                writer.append(direction, game.last_spawn, game.score - score)
+        writer.close()
+        return game, writer, buffer.getvalue()
+
+    def test_replay_matches_the_game(self):
+        game, writer, data = self._logged_game()
+        log = parse_game_log(data)
+        self.assertEqual((log.seed, log.config, len(log.moves)), (11, {'solver': 'random'}, writer.moves))
+        board, score = log.replay()
+        self.assertEqual(packed.to_grid(board), game.grid)
+        self.assertEqual(score, game.score)
+        stats = log.stats()
+        self.assertEqual(stats['max_tile'], game.max_tile)
+        self.assertEqual(sum(stats['directions'].values()), game.total_moves)
+        self.assertLess(len(data), 120 + 4 * game.total_moves)
+
+    def test_truncated_and_corrupt_logs(self):
+        _, writer, data = self._logged_game()
+        log = parse_game_log(data[:-1])
+        self.assertTrue(log.truncated)
+        self.assertEqual(len(log.moves), writer.moves - 1)
+        log.replay()
+        with self.assertRaises(GameLogError):
+            parse_game_log(b'nope' + data[4:])
+        log = parse_game_log(data)
+        log.moves[0] = log.moves[0]._replace(score_delta=log.moves[0].score_delta + 2)
+        with self.assertRaises(GameLogError):
+            log.replay()
+
+    def test_render_every_must_be_positive(self):
+        _, _, data = self._logged_game(moves=5)
+        log = parse_game_log(data)
+        for every in (0, -2):
+            with self.assertRaises(ValueError):
+                render_frames(log, 'unused', every=every)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            parse_gamelog_args(['render', 'game.log', 'frames', '--every', '0'])
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        self.text_cache = gui.text_cache
+        self.text_cache.clear()
+        self.addCleanup(self.text_cache.clear)
+
+    def test_fonts_and_surfaces_are_reused(self):
+        font = self.text_cache.get_font(None, 20, bold=True)
+        self.assertIs(self.text_cache.get_font(None, 20, bold=True), font)
+        first = self.text_cache.render_text(2048, 20, (0, 0, 0), bold=True)
+        self.assertIs(self.text_cache.render_text('2048', 20, (0, 0, 0), bold=True), first)
+        self.assertIsNot(self.text_cache.render_text(2048, 20, (255, 0, 0), bold=True), first)
+        self.assertEqual(self.text_cache.cache_info()['hits'], 1)
+
+    def test_least_recently_used_surface_is_evicted(self):
+        font = self.text_cache.get_font(None, 12)
+        limit = self.text_cache.MAX_SURFACES
+        self.addCleanup(setattr, self.text_cache, 'MAX_SURFACES', limit)
+        self.text_cache.MAX_SURFACES = 2
+        a = self.text_cache.render('a', font, (0, 0, 0))
+        self.text_cache.render('b', font, (0, 0, 0))
+        self.text_cache.render('a', font, (0, 0, 0))
+        self.text_cache.render('c', font, (0, 0, 0))
+        self.assertIs(self.text_cache.render('a', font, (0, 0, 0)), a)
+        self.assertEqual(self.text_cache.cache_info()['surfaces'], 2)
@@ -1,9 +1,18 @@
 # gui/chess_gui.py
+import os
+import sys
 from os import environ
 environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
 import pygame
 import chess
 
+# text_cache lives at the repository root, shared with the other games.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+import text_cache  # noqa: E402
+
 class ChessGUI:
     def __init__(self):
         # Initialize Pygame and screen variables
@@ -25,9 +34,9 @@ class ChessGUI:
         self.MENU_BG_COLOR = (200, 200, 200)
         
         # Fonts
-        self.font = pygame.font.SysFont("Segoe UI Symbol", self.square_size - 10)
-        self.label_font = pygame.font.SysFont("Arial", 20)
-        self.menu_font = pygame.font.SysFont("Segoe UI Symbol", 18)  # Ensures Unicode chess pieces display correctly
+        self.font = text_cache.get_font("Segoe UI Symbol", self.square_size - 10)
+        self.label_font = text_cache.get_font("Arial", 20)
+        self.menu_font = text_cache.get_font("Segoe UI Symbol", 18)  # Ensures Unicode chess pieces display correctly
         
         # Unicode pieces as an instance attribute
         self.UNICODE_PIECES = {
@@ -50,36 +59,36 @@ class ChessGUI:
         
         # First Line: Move count, Last move, Status
         # Move count
-        move_text = self.menu_font.render(f"Move: {self.move_count}", True, self.LABEL_COLOR)
+        move_text = text_cache.render(f"Move: {self.move_count}", self.menu_font, self.LABEL_COLOR)
         self.screen.blit(move_text, (10, 10))
         
         # Last move
-        last_move_text = self.menu_font.render(f"Last Move: {self.last_move}", True, self.LABEL_COLOR)
+        last_move_text = text_cache.render(f"Last Move: {self.last_move}", self.menu_font, self.LABEL_COLOR)
         self.screen.blit(last_move_text, (150, 10))
         
         # Status
-        status_text = self.menu_font.render(f"Status: {self.check_status}", True, self.LABEL_COLOR)
+        status_text = text_cache.render(f"Status: {self.check_status}", self.menu_font, self.LABEL_COLOR)
         self.screen.blit(status_text, (350, 10))
         
         # Second Line: White Captured
-        captured_white_text = self.menu_font.render(
+        captured_white_text = text_cache.render(
             f"White Captured: {''.join(self.captured_white)}",
-            True,
+            self.menu_font,
             self.LABEL_COLOR,
         )
         self.screen.blit(captured_white_text, (10, 50))
         
         # Third Line: Black Captured
-        captured_black_text = self.menu_font.render(
+        captured_black_text = text_cache.render(
             f"Black Captured: {''.join(self.captured_black)}",
-            True,
+            self.menu_font,
             self.LABEL_COLOR,
         )
         self.screen.blit(captured_black_text, (10, 80))
         
         # Castling indication (optional on the third line)
         if self.castling_occurred:
-            castling_text = self.menu_font.render("Castling occurred", True, self.LABEL_COLOR)
+            castling_text = text_cache.render("Castling occurred", self.menu_font, self.LABEL_COLOR)
             self.screen.blit(castling_text, (350, 80))
 
     def draw_board(self, board, selected_square=None):
@@ -118,7 +127,7 @@ class ChessGUI:
                     piece_symbol = self.UNICODE_PIECES.get(piece.symbol(), '')
                     if piece_symbol:
                         piece_color = self.WHITE_PIECE_COLOR if piece.color == chess.WHITE else self.BLACK_PIECE_COLOR
-                        text_surface = self.font.render(piece_symbol, True, piece_color)
+                        text_surface = text_cache.render(piece_symbol, self.font, piece_color)
                         text_rect = text_surface.get_rect(center=rect.center)
                         self.screen.blit(text_surface, text_rect)
 
@@ -129,14 +138,14 @@ class ChessGUI:
         """Draw the labels for ranks and files."""
         # Draw file labels (a to h)
         for col in range(8):
-            file_label = self.label_font.render(chr(ord('a') + col), True, self.LABEL_COLOR)
+            file_label = text_cache.render(chr(ord('a') + col), self.label_font, self.LABEL_COLOR)
             self.screen.blit(file_label, (
                 col * self.square_size + self.label_offset + self.square_size / 2 - file_label.get_width() / 2,
                 self.menu_height + 8 * self.square_size + self.label_offset + 5))
         
         # Draw rank labels (1 to 8)
         for row in range(8):
-            rank_label = self.label_font.render(str(row + 1), True, self.LABEL_COLOR)
+            rank_label = text_cache.render(str(row + 1), self.label_font, self.LABEL_COLOR)
             self.screen.blit(rank_label, (
                 self.label_offset - 15,
                 self.menu_height + row * self.square_size + self.square_size / 2 - rank_label.get_height() / 2))
@@ -2,10 +2,18 @@ from os import environ
 environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
 import pygame
 import chess
+import os
 import random
 import sys
 import time
 
+# text_cache lives at the repository root, shared with the other games.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+import text_cache  # noqa: E402
+
 # Initialize Pygame
 pygame.init()
 screen_width = 520
@@ -31,11 +39,11 @@ def _load_chess_font(size):
                  "DejaVu Sans", "Arial Unicode MS"):
         path = pygame.font.match_font(name)
         if path:
-            return pygame.font.Font(path, size)
-    return pygame.font.SysFont(None, size)
+            return text_cache.get_font(path, size)
+    return text_cache.get_font(None, size)
 
 font = _load_chess_font(square_size - 10)
-label_font = pygame.font.SysFont("Arial", 20)
+label_font = text_cache.get_font("Arial", 20)
 
 # Unicode pieces dictionary
 UNICODE_PIECES = {
@@ -80,7 +88,7 @@ def draw_board(board, selected_square=None):
                 piece_symbol = UNICODE_PIECES[piece.symbol()]
                 # Changed: Swap the colors - white pieces are now WHITE_PIECE_COLOR
                 piece_color = WHITE_PIECE_COLOR if piece.color == chess.WHITE else BLACK_PIECE_COLOR
-                text_surface = font.render(piece_symbol, True, piece_color)
+                text_surface = text_cache.render(piece_symbol, font, piece_color)
                 text_rect = text_surface.get_rect(
                     center=(col * square_size + label_offset + square_size // 2,
                            row * square_size + label_offset + square_size // 2))
@@ -89,14 +97,14 @@ def draw_board(board, selected_square=None):
     # Draw labels
     for i in range(8):
         # Column labels
-        col_label = label_font.render(COLUMNS[i], True, LABEL_COLOR)
+        col_label = text_cache.render(COLUMNS[i], label_font, LABEL_COLOR)
         screen.blit(col_label, (i * square_size + label_offset + square_size // 2 - 
                                col_label.get_width() // 2, label_offset // 2))
         screen.blit(col_label, (i * square_size + label_offset + square_size // 2 - 
                                col_label.get_width() // 2, screen_height - label_offset))
 
         # Row labels
-        row_label = label_font.render(ROWS[i], True, LABEL_COLOR)
+        row_label = text_cache.render(ROWS[i], label_font, LABEL_COLOR)
         screen.blit(row_label, (label_offset // 2, 
                                i * square_size + label_offset + square_size // 2 - 
                                row_label.get_height() // 2))
@@ -104,11 +112,11 @@ def draw_board(board, selected_square=None):
                                i * square_size + label_offset + square_size // 2 -
                                row_label.get_height() // 2))
 
-    quit_label = label_font.render("ESC to quit", True, LABEL_COLOR)
+    quit_label = text_cache.render("ESC to quit", label_font, LABEL_COLOR)
     screen.blit(quit_label, (screen_width - quit_label.get_width() - 2, screen_height - quit_label.get_height()))
 
     # Computer (White) is always the AI in chess_autoplay; show an "AI" badge in the HUD.
-    ai_badge = label_font.render("AI", True, (200, 0, 0))
+    ai_badge = text_cache.render("AI", label_font, (200, 0, 0))
     screen.blit(ai_badge, (2, screen_height - ai_badge.get_height()))
 
     pygame.display.flip()
@@ -145,10 +153,10 @@ def display_game_over(board, hold_ms=3000):
     else:
         winner = "Game Over!"
 
-    text_surface = font.render(winner, True, (0, 0, 0))
+    text_surface = text_cache.render(winner, font, (0, 0, 0))
     text_rect = text_surface.get_rect(center=(screen_width // 2, screen_height // 2))
     screen.blit(text_surface, text_rect)
-    quit_label = label_font.render("ESC to quit", True, (0, 0, 0))
+    quit_label = text_cache.render("ESC to quit", label_font, (0, 0, 0))
     screen.blit(quit_label, (screen_width // 2 - quit_label.get_width() // 2, screen_height // 2 + 40))
     pygame.display.flip()
     # Non-blocking wait so QUIT/ESC stay responsive
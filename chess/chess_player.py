@@ -6,6 +6,13 @@ import chess.pgn
 import sys
 import os
 
+# text_cache lives at the repository root, shared with the other games.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+import text_cache  # noqa: E402
+
 # Initialize Pygame
 pygame.init()
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -54,11 +61,11 @@ def _load_chess_font(size):
                  "DejaVu Sans", "Arial Unicode MS"):
         path = pygame.font.match_font(name)
         if path:
-            return pygame.font.Font(path, size)
-    return pygame.font.SysFont(None, size)
+            return text_cache.get_font(path, size)
+    return text_cache.get_font(None, size)
 
 font = _load_chess_font(square_size - 10)
-info_font = pygame.font.SysFont("Arial", 24)
+info_font = text_cache.get_font("Arial", 24)
 
 def show_game_details(game, game_id, game_dir):
     screen.fill(info_bg_color)  # Set background color for info screen
@@ -78,10 +85,10 @@ def show_game_details(game, game_id, game_dir):
         f"Result: {result}"
     ]
     for i, line in enumerate(lines):
-        text_surface = info_font.render(line, True, black)
+        text_surface = text_cache.render(line, info_font, black)
         screen.blit(text_surface, (20, 30 + i * 30))
 
-    quit_surface = info_font.render("ESC to quit", True, black)
+    quit_surface = text_cache.render("ESC to quit", info_font, black)
     screen.blit(quit_surface, (screen_size - quit_surface.get_width() - 10, 10))
 
     pygame.display.flip()
@@ -107,10 +114,10 @@ def draw_board(board, move_index, last_move):
     step_text = f"Step: {move_index + 1}"
     last_move_text = f"Last Move: {last_move}" if last_move else "Last Move: -"
     fen_text = f"FEN: {board.fen()}"
-    step_surface = info_font.render(step_text, True, black)
-    last_move_surface = info_font.render(last_move_text, True, black)
-    fen_surface = info_font.render(fen_text, True, black)
-    quit_surface = info_font.render("ESC to quit", True, black)
+    step_surface = text_cache.render(step_text, info_font, black)
+    last_move_surface = text_cache.render(last_move_text, info_font, black)
+    fen_surface = text_cache.render(fen_text, info_font, black)
+    quit_surface = text_cache.render("ESC to quit", info_font, black)
     screen.blit(step_surface, (10, 10))
     screen.blit(last_move_surface, (10, 40))
     screen.blit(fen_surface, (10, 70))
@@ -135,7 +142,7 @@ def draw_board(board, move_index, last_move):
             piece = board.piece_at(chess.square(col, 7 - row))
             if piece:
                 piece_unicode = unicode_pieces[piece.symbol()]
-                text_surface = font.render(piece_unicode, True, black if piece.color == chess.WHITE else white)
+                text_surface = text_cache.render(piece_unicode, font, black if piece.color == chess.WHITE else white)
                 text_rect = text_surface.get_rect(
                     center=(
                         col * square_size + square_size // 2,
@@ -1,12 +1,20 @@
 from os import environ
 environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
 
+import os
 import pygame
 import sys
 import copy
 import random
 import logging
 
+# text_cache lives at the repository root, shared with the other games.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+import text_cache  # noqa: E402
+
 
 logger = logging.getLogger(__name__)
 
@@ -102,18 +110,18 @@ class GameOfLife:
         return count
 
     def draw_menu(self):
-        font = pygame.font.SysFont(None, 24)
+        font = text_cache.get_font(None, 24)
         # Draw "Add" button (to add live cells randomly)
         pygame.draw.rect(self.screen, (0, 200, 0), self.add_button_rect)
-        add_text = font.render("Add", True, (255, 255, 255))
+        add_text = text_cache.render("Add", font, (255, 255, 255))
         self.screen.blit(add_text, (self.add_button_rect.x + 20, self.add_button_rect.y + 10))
         # Draw Dropdown for spawn count
         pygame.draw.rect(self.screen, (0, 0, 200), self.dropdown_rect)
-        drop_text = font.render(f"{self.spawn_count_selected}", True, (255, 255, 255))
+        drop_text = text_cache.render(f"{self.spawn_count_selected}", font, (255, 255, 255))
         self.screen.blit(drop_text, (self.dropdown_rect.x + 20, self.dropdown_rect.y + 10))
         # Draw "Start" button
         pygame.draw.rect(self.screen, (200, 0, 0), self.start_button_rect)
-        start_text = font.render("Start", True, (255, 255, 255))
+        start_text = text_cache.render("Start", font, (255, 255, 255))
         self.screen.blit(start_text, (self.start_button_rect.x + 10, self.start_button_rect.y + 10))
 
     def draw(self):
@@ -126,43 +134,43 @@ class GameOfLife:
                 pygame.draw.rect(self.screen, color, rect)
                 pygame.draw.rect(self.screen, (200, 200, 200), rect, 1)
         # Draw UI area below grid based on state
-        font = pygame.font.SysFont(None, 24)
+        font = text_cache.get_font(None, 24)
         # Always draw "Add" and "Dropdown" at fixed locations
         pygame.draw.rect(self.screen, (0, 200, 0), self.add_button_rect)
-        add_text = font.render("Add", True, (255, 255, 255))
+        add_text = text_cache.render("Add", font, (255, 255, 255))
         self.screen.blit(add_text, (self.add_button_rect.x + 20, self.add_button_rect.y + 10))
         pygame.draw.rect(self.screen, (0, 0, 200), self.dropdown_rect)
-        drop_text = font.render(f"{self.spawn_count_selected}", True, (255, 255, 255))
+        drop_text = text_cache.render(f"{self.spawn_count_selected}", font, (255, 255, 255))
         self.screen.blit(drop_text, (self.dropdown_rect.x + 20, self.dropdown_rect.y + 10))
         if self.state == "menu":
             # Fixed "Start" button in menu
             pygame.draw.rect(self.screen, (200, 0, 0), self.start_button_rect)
-            start_text = font.render("Start", True, (255, 255, 255))
+            start_text = text_cache.render("Start", font, (255, 255, 255))
             self.screen.blit(start_text, (self.start_button_rect.x + 10, self.start_button_rect.y + 10))
         else:
             # In simulation, fixed "Pause" and "New Game" buttons
             pygame.draw.rect(self.screen, (200, 200, 0), self.pause_button_rect)
-            pause_text = font.render("Pause", True, (0, 0, 0))
+            pause_text = text_cache.render("Pause", font, (0, 0, 0))
             self.screen.blit(pause_text, (self.pause_button_rect.x + 10, self.pause_button_rect.y + 10))
             pygame.draw.rect(self.screen, (0, 0, 200), self.newgame_button_rect)
-            new_text = font.render("New Game", True, (255, 255, 255))
+            new_text = text_cache.render("New Game", font, (255, 255, 255))
             self.screen.blit(new_text, (self.newgame_button_rect.x + 5, self.newgame_button_rect.y + 10))
             # Draw generation info (unchanged)
             live_cells = sum(sum(row) for row in self.grid)
             info = f"Live: {live_cells}  Generation: {self.generation}"
-            info_text = font.render(info, True, (0, 0, 0))
+            info_text = text_cache.render(info, font, (0, 0, 0))
             self.screen.blit(info_text, (self.screen.get_width() - info_text.get_width() - 10, self.height * self.cell_size + 10))
         
         # Draw pattern buttons
-        font = pygame.font.SysFont(None, 20)
+        font = text_cache.get_font(None, 20)
         for name, rect in self.pattern_buttons.items():
             pygame.draw.rect(self.screen, (100, 100, 200), rect)
-            text = font.render(name, True, (255, 255, 255))
+            text = text_cache.render(name, font, (255, 255, 255))
             self.screen.blit(text, (rect.x + 5, rect.y + 10))
 
         # ESC to quit hint
-        hint_font = pygame.font.SysFont(None, 18)
-        hint_text = hint_font.render("ESC to quit", True, (80, 80, 80))
+        hint_font = text_cache.get_font(None, 18)
+        hint_text = text_cache.render("ESC to quit", hint_font, (80, 80, 80))
         self.screen.blit(hint_text, (self.screen.get_width() - hint_text.get_width() - 5, self.screen.get_height() - hint_text.get_height() - 2))
 
         pygame.display.flip()
@@ -0,0 +1,313 @@
+"""Render-free Minesweeper board shared by every front-end.
+
+The board holds three ``height x width`` uint8 NumPy arrays, indexed
+``[y, x]``:
+
+    mines    1 where a mine is
+    numbers  adjacent mine count, 0 on mines
+    states   CellState of each cell
+
+plus running counts of hidden, flagged and unrevealed safe cells. So
+asking whether the game is won, or how many cells are hidden, never
+scans the board. The numbers are computed with array shifts once the
+mines are placed. A reveal floods outward with an explicit stack, so
+large open areas cannot hit the recursion limit.
+
+Each array is a view of a flat bytearray (``cell = y * width + x``).
+Whole-board work goes through the arrays; one-cell reads from Python go
+through the bytearrays, which are several times faster than NumPy
+scalar indexing.
+
+Front-ends keep drawing, input, timers and scoring, and call into the
+board for the rules:
+
+- place_mines() / ensure_mines(): the first reveal is safe, and so are
+  its neighbours where the board has room;
+- reveal(), chord(), set_flag() / toggle_flag(), reveal_mines();
+- won / lost.
+
+Code written against the old one-object-per-cell grid can read
+``board.cell_grid()``. Its CellView objects read and write the board
+(subclass CellView to add per-cell UI fields).
+
+The board has no pygame state, so it pickles and copies cheaply
+(``board.copy()``) for solvers and batch runs. Mines are drawn from
+``rng`` (a random.Random), or from the global random module when it is
+None, so ``random.seed(n)`` still replays a game.
+"""
+import random
+from enum import IntEnum
+from functools import lru_cache
+
+import numpy as np
+
+_OFFSETS = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+
+
+class CellState(IntEnum):
+    HIDDEN = 0
+    REVEALED = 1
+    FLAGGED = 2
+
+
+_STATES = tuple(CellState)
+_HIDDEN, _REVEALED, _FLAGGED = _STATES
+
+
+@lru_cache(maxsize=None)
+def _neighbor_table(width, height):
+    """Flat indices of each flat cell's neighbours."""
+    return tuple(
+        tuple((y + dy) * width + x + dx for dx, dy in _OFFSETS
+              if 0 <= x + dx < width and 0 <= y + dy < height)
+        for y in range(height) for x in range(width)
+    )
+
+
+class Board:
+    def __init__(self, width, height, mine_count, rng=None):
+        if not 0 <= mine_count <= width * height:
+            raise ValueError(f"Cannot place {mine_count} mines on a {width}x{height} board")
+        self.width = width
+        self.height = height
+        self.mine_count = mine_count
+        self.rng = rng
+        self.mines_placed = False
+        # (x, y) of the revealed mine that ended the game.
+        self.exploded = None
+        self.hidden_count = width * height
+        self.flagged_count = 0
+        self.safe_left = width * height - mine_count
+        self._mines = bytearray(width * height)
+        self._numbers = bytearray(width * height)
+        self._states = bytearray(width * height)
+        self._make_arrays()
+
+    def _make_arrays(self):
+        shape = (self.height, self.width)
+        self.mines = np.frombuffer(self._mines, dtype=np.uint8).reshape(shape)
+        self.numbers = np.frombuffer(self._numbers, dtype=np.uint8).reshape(shape)
+        self.states = np.frombuffer(self._states, dtype=np.uint8).reshape(shape)
+        self._neighbors = _neighbor_table(self.width, self.height)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("mines", "numbers", "states", "_neighbors"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._make_arrays()
+
+    def copy(self):
+        other = Board.__new__(Board)
+        state = self.__getstate__()
+        for name in ("_mines", "_numbers", "_states"):
+            state[name] = bytearray(state[name])
+        other.__setstate__(state)
+        return other
+
+    @classmethod
+    def from_mines(cls, mines, rng=None):
+        """A board with a fixed layout: ``mines`` is a height x width array of 0/1."""
+        mines = np.asarray(mines, dtype=np.uint8)
+        height, width = mines.shape
+        board = cls(width, height, int(mines.sum()), rng)
+        board._set_mines(mines)
+        return board
+
+    # -- layout --------------------------------------------------------
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def neighbors(self, x, y):
+        w = self.width
+        return [(i % w, i // w) for i in self._neighbors[y * w + x]]
+
+    def place_mines(self, safe_cells=()):
+        """Place mine_count mines at random, never on ``safe_cells``.
+
+        Falls back to fewer mines if the safe cells leave too little room."""
+        safe_cells = set(safe_cells)
+        candidates = [
+            (x, y) for x in range(self.width) for y in range(self.height)
+            if (x, y) not in safe_cells
+        ]
+        rng = self.rng or random
+        positions = rng.sample(candidates, min(self.mine_count, len(candidates)))
+        mines = np.zeros((self.height, self.width), dtype=np.uint8)
+        for x, y in positions:
+            mines[y, x] = 1
+        self._set_mines(mines)
+
+    def ensure_mines(self, x, y):
+        """Place the mines on first use, keeping (x, y) and its neighbours clear."""
+        if not self.mines_placed:
+            self.place_mines([(x, y), *self.neighbors(x, y)])
+
+    def _set_mines(self, mines):
+        h, w = self.height, self.width
+        self.mines[...] = mines
+        padded = np.pad(self.mines, 1)
+        counts = np.zeros((h, w), dtype=np.uint8)
+        for dx, dy in _OFFSETS:
+            counts += padded[1 + dy:1 + dy + h, 1 + dx:1 + dx + w]
+        counts[self.mines == 1] = 0
+        self.numbers[...] = counts
+        self.mine_count = int(self.mines.sum())
+        self.mines_placed = True
+        self.safe_left = int(np.count_nonzero((self.mines == 0) & (self.states != _REVEALED)))
+
+    # -- cell access ---------------------------------------------------
+
+    def is_mine(self, x, y):
+        return self._mines[y * self.width + x] == 1
+
+    def number(self, x, y):
+        return self._numbers[y * self.width + x]
+
+    def state(self, x, y):
+        return _STATES[self._states[y * self.width + x]]
+
+    def set_state(self, x, y, state):
+        """Set one cell's state directly, keeping the running counts right."""
+        i = y * self.width + x
+        old = self._states[i]
+        if old == state:
+            return
+        self._states[i] = state
+        safe = not self._mines[i]
+        if old == _HIDDEN:
+            self.hidden_count -= 1
+        elif old == _FLAGGED:
+            self.flagged_count -= 1
+        elif safe:
+            self.safe_left += 1
+        if state == _HIDDEN:
+            self.hidden_count += 1
+        elif state == _FLAGGED:
+            self.flagged_count += 1
+        elif safe:
+            self.safe_left -= 1
+
+    # -- moves ---------------------------------------------------------
+
+    def reveal(self, x, y):
+        """Reveal (x, y), flooding out from cells with no adjacent mines.
+
+        Places the mines first if needed. Returns the cells revealed, in
+        order; empty if (x, y) was not hidden. Revealing a mine sets
+        ``exploded`` and reveals only that cell."""
+        if not self.in_bounds(x, y):
+            return []
+        self.ensure_mines(x, y)
+        w = self.width
+        start = y * w + x
+        states = self._states
+        if states[start] != _HIDDEN:
+            return []
+        if self._mines[start]:
+            self.set_state(x, y, _REVEALED)
+            self.exploded = (x, y)
+            return [(x, y)]
+        numbers = self._numbers
+        neighbors = self._neighbors
+        revealed = []
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            if states[i] != _HIDDEN:
+                continue
+            states[i] = _REVEALED
+            revealed.append((i % w, i // w))
+            # Neighbours of a 0 are never mines.
+            if numbers[i] == 0:
+                stack.extend(n for n in neighbors[i] if states[n] == _HIDDEN)
+        self.hidden_count -= len(revealed)
+        self.safe_left -= len(revealed)
+        return revealed
+
+    def chord(self, x, y):
+        """Reveal the hidden neighbours of a revealed number whose flags are all placed.
+
+        Returns the cells revealed (empty if the flag count doesn't match)."""
+        i = y * self.width + x
+        if self._states[i] != _REVEALED or self._mines[i]:
+            return []
+        neighbors = self.neighbors(x, y)
+        flags = sum(1 for nx, ny in neighbors if self.state(nx, ny) == _FLAGGED)
+        if flags != self._numbers[i]:
+            return []
+        revealed = []
+        for nx, ny in neighbors:
+            revealed += self.reveal(nx, ny)
+        return revealed
+
+    def set_flag(self, x, y, flagged=True):
+        """Flag or unflag a cell; returns whether it changed."""
+        current = self.state(x, y)
+        if flagged and current == _HIDDEN:
+            self.set_state(x, y, _FLAGGED)
+            return True
+        if not flagged and current == _FLAGGED:
+            self.set_state(x, y, _HIDDEN)
+            return True
+        return False
+
+    def toggle_flag(self, x, y):
+        return self.set_flag(x, y, self.state(x, y) == _HIDDEN)
+
+    def reveal_mines(self):
+        """Reveal every hidden mine (flags stay); returns the cells revealed."""
+        ys, xs = np.nonzero((self.mines == 1) & (self.states == _HIDDEN))
+        self.states[ys, xs] = _REVEALED
+        self.hidden_count -= len(xs)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    # -- status --------------------------------------------------------
+
+    @property
+    def lost(self):
+        return self.exploded is not None
+
+    @property
+    def won(self):
+        return self.mines_placed and self.exploded is None and self.safe_left == 0
+
+    @property
+    def mines_left(self):
+        """Mines not yet flagged (negative if there are too many flags)."""
+        return self.mine_count - self.flagged_count
+
+    def cell_grid(self, cell_class=None):
+        """A ``grid[y][x]`` of CellView objects (or ``cell_class``) over this board."""
+        cell_class = cell_class or CellView
+        return [[cell_class(self, x, y) for x in range(self.width)] for y in range(self.height)]
+
+
+class CellView:
+    """One square of a Board, with the attributes of the old Cell objects."""
+
+    def __init__(self, board, x, y):
+        self.board = board
+        self.x = x
+        self.y = y
+        self._i = y * board.width + x
+
+    @property
+    def is_mine(self):
+        return self.board._mines[self._i] == 1
+
+    @property
+    def neighbor_mines(self):
+        return self.board._numbers[self._i]
+
+    @property
+    def state(self):
+        return _STATES[self.board._states[self._i]]
+
+    @state.setter
+    def state(self, state):
+        self.board.set_state(self.x, self.y, state)
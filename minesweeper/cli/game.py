@@ -1,18 +1,17 @@
-from enum import Enum
+import os
 import random
+import sys
 
-class CellState(Enum):
-    HIDDEN = 0
-    REVEALED = 1
-    FLAGGED = 2
-
-class Cell:
-    def __init__(self, is_mine=False):
-        self.is_mine = is_mine
-        self.state = CellState.HIDDEN
-        self.neighbor_mines = 0
-        self.x = 0
-        self.y = 0
+import numpy as np
+
+# The board model is shared with the other front-ends, one directory up.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from board import Board, CellState, CellView  # noqa: E402
+
+
+class Cell(CellView):
+    def __init__(self, board, x, y):
+        super().__init__(board, x, y)
         self.simple_probability = 0
         self.adjacent_probability = 0
         self.solved = False # dont increase hint count if cell is solved
@@ -106,13 +105,11 @@ class Minesweeper:
         self.width = width
         self.height = height
         self.mine_count = mine_count
-        self.grid = [[Cell() for _ in range(width)] for _ in range(height)]
+        self.board = Board(width, height, mine_count)
+        self.grid = self.board.cell_grid(Cell)
         self.game_over = False
         self.victory = False
-        self.first_click = not quickstart  # If quickstart is True, we won't wait for first click to place mines
         self.reveals = 0
-        self.flags = 0
-        self.hidden_remaining = width * height
         self.steps = 0
         self.hints = 0  # Initialize hints count
         self.initial_probability = mine_count / (width * height)
@@ -120,46 +117,36 @@ class Minesweeper:
         self.complexity = 0
         self.game_id = ''
 
-        for y in range(height):
-            for x in range(width):
-                self.grid[y][x].x = x
-                self.grid[y][x].y = y
-
         # If quickstart is True, place mines now
         if quickstart:
             self.place_mines_random()
             self.complexity = self.complexity_score()  # Compute complexity immediately
 
-    def place_mines_random(self):
-        all_positions = [(x, y) for x in range(self.width) for y in range(self.height)]
-        self.mine_positions = random.sample(all_positions, self.mine_count)
-
-        for x, y in self.mine_positions:
-            self.grid[y][x].is_mine = True
+    # Mines are placed by the first click (clear of it and its neighbours),
+    # or up front with quickstart.
+    @property
+    def first_click(self):
+        return not self.board.mines_placed
 
-        # Update neighbor counts
-        for x, y in self.mine_positions:
-            for nx, ny in self.get_neighbors(x, y):
-                self.grid[ny][nx].neighbor_mines += 1
+    @property
+    def flags(self):
+        return self.board.flagged_count
 
-    def place_mines(self, safe_x, safe_y):
-        safe_cells = {(safe_x, safe_y)}
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx, ny = safe_x + dx, safe_y + dy
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    safe_cells.add((nx, ny))
+    @property
+    def hidden_remaining(self):
+        return self.board.hidden_count
 
-        all_positions = [(x, y) for x in range(self.width) for y in range(self.height)]
-        possible_mine_positions = [pos for pos in all_positions if pos not in safe_cells]
-        self.mine_positions = random.sample(possible_mine_positions, self.mine_count)
+    def _record_mine_positions(self):
+        ys, xs = np.nonzero(self.board.mines)
+        self.mine_positions = list(zip(xs.tolist(), ys.tolist()))
 
-        for x, y in self.mine_positions:
-            self.grid[y][x].is_mine = True
+    def place_mines_random(self):
+        self.board.place_mines()
+        self._record_mine_positions()
 
-        for x, y in self.mine_positions:
-            for nx, ny in self.get_neighbors(x, y):
-                self.grid[ny][nx].neighbor_mines += 1
+    def place_mines(self, safe_x, safe_y):
+        self.board.ensure_mines(safe_x, safe_y)
+        self._record_mine_positions()
 
         # After placing mines, compute complexity
         self.complexity =self.complexity_score()
@@ -177,12 +164,8 @@ class Minesweeper:
         Calculate and print a complexity score based on the distribution of neighbor_mines counts.
         Currently all multipliers are set to 1.
         """
-        counts = {i: 0 for i in range(9)}  # counts for 0 through 8
-        for row in self.grid:
-            for cell in row:
-                if not cell.is_mine:
-                    if 0 <= cell.neighbor_mines <= 8:
-                        counts[cell.neighbor_mines] += 1
+        safe_numbers = self.board.numbers[self.board.mines == 0]
+        counts = dict(enumerate(np.bincount(safe_numbers, minlength=9).tolist()))  # counts for 0 through 8
 
         # Currently multiplier is 1 for all
         score = sum(counts[i] * self.factorial(i) for i in range(9))
@@ -194,7 +177,7 @@ class Minesweeper:
         # game_id computation
 
         # Convert the grid to a list of lists for encoding
-        board_list = [[cell.is_mine for cell in row] for row in self.grid]
+        board_list = self.board.mines.astype(bool).tolist()
         
         self.game_id = MinesweeperFormat.encode_game(self.width, self.height, self.mine_count,self.complexity, board_list)
         print("Game ID:", self.game_id)
@@ -202,58 +185,44 @@ class Minesweeper:
         return score
 
     def get_neighbors(self, x, y):
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    yield nx, ny
+        return self.board.neighbors(x, y)
 
     def reveal(self, x, y):
         # If not quickstart, place mines on first click ensuring safe cell
         if self.first_click:
             self.place_mines(x, y)
-            self.first_click = False
 
-        cell = self.grid[y][x]
-        if cell.state == CellState.HIDDEN:
-            cell.state = CellState.REVEALED
-            cell.solved = True
-            self.reveals += 1
-            self.hidden_remaining -= 1
-            self.steps += 1
-            if cell.is_mine:
-                self.game_over = True
-                self.victory = False
-            else:
-                if cell.neighbor_mines == 0:
-                    for nx, ny in self.get_neighbors(x, y):
-                        self.reveal(nx, ny)
-                self.check_victory()
-            self.update_probabilities()
+        revealed = self.board.reveal(x, y)
+        if not revealed:
+            return
+        for rx, ry in revealed:
+            self.grid[ry][rx].solved = True
+        self.reveals += len(revealed)
+        self.steps += len(revealed)
+        if self.board.lost:
+            self.game_over = True
+            self.victory = False
+        else:
+            self.check_victory()
+        self.update_probabilities()
 
     def flag(self, x, y):
         cell = self.grid[y][x]
         if cell.state == CellState.HIDDEN:
             if self.flags < self.mine_count:
-                cell.state = CellState.FLAGGED
+                self.board.set_flag(x, y, True)
                 cell.solved = True
-                self.flags += 1
                 self.steps += 1
-                self.hidden_remaining -= 1
                 self.update_probabilities()
         elif cell.state == CellState.FLAGGED:
-            cell.state = CellState.HIDDEN
+            self.board.set_flag(x, y, False)
             cell.solved = False
-            self.flags -= 1
             self.steps += 1
-            self.hidden_remaining += 1
             self.update_probabilities()
 
     def update_probabilities(self):
         remaining_mines = self.mine_count - self.flags
-        total_hidden_cells = sum(cell.state == CellState.HIDDEN for row in self.grid for cell in row)
+        total_hidden_cells = self.board.hidden_count
 
         if total_hidden_cells == 0:
             base_probability = 0
@@ -267,12 +236,9 @@ class Minesweeper:
                     cell.adjacent_probability = self.calculate_adjacent_probability(cell)
 
     def check_victory(self):
-        for row in self.grid:
-            for cell in row:
-                if cell.state == CellState.HIDDEN and not cell.is_mine:
-                    return
-        self.game_over = True
-        self.victory = True
+        if self.board.won:
+            self.game_over = True
+            self.victory = True
     
     def print_solution(self):
         for row in self.grid:
@@ -6,7 +6,8 @@ import json
 import time
 import pygame
 import random
-from enum import Enum
+
+from board import Board, CellState
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SAVED_PROGRESS_PATH = os.path.join(SCRIPT_DIR, "saved_progress.json")
@@ -65,11 +66,6 @@ NUMBER_COLORS = {
     8: GRAY
 }
 
-class CellState(Enum):
-    HIDDEN = 0
-    REVEALED = 1
-    FLAGGED = 2
-
 class Button:
     def __init__(self, x, y, text, height=30):
         self.text = text
@@ -135,12 +131,6 @@ class InputBox:
         pygame.draw.rect(screen, self.color, self.rect, 2)
         screen.blit(self.txt_surface, (self.rect.x + 5, self.rect.y + 5))
 
-class Cell:
-    def __init__(self):
-        self.is_mine = False
-        self.state = CellState.HIDDEN
-        self.neighbor_mines = 0
-
 def load_saved_progress():
     """T-000099: load highest difficulty ever beaten (or None)."""
     try:
@@ -243,7 +233,7 @@ class Minesweeper:
 
         Using globals keeps the existing reveal/draw code (which references
         GRID_WIDTH/HEIGHT, MINE_COUNT, WINDOW_WIDTH/HEIGHT directly) working
-        without touching the cell-reveal recursion.
+        without touching the reveal code.
         """
         global GRID_WIDTH, GRID_HEIGHT, MINE_COUNT, WINDOW_WIDTH, WINDOW_HEIGHT
         cfg = DIFFICULTIES[name]
@@ -334,7 +324,8 @@ class Minesweeper:
             clock.tick(60)
 
     def reset_game(self, seed=None):
-        self.grid = [[Cell() for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+        self.board = Board(GRID_WIDTH, GRID_HEIGHT, MINE_COUNT)
+        self.grid = self.board.cell_grid()
         self.game_over = False
         self.victory = False
         self.mines_remaining = MINE_COUNT
@@ -378,13 +369,10 @@ class Minesweeper:
         
         if safe_hidden_cells:
             x, y = random.choice(safe_hidden_cells)
-            self.grid[y][x].state = CellState.REVEALED
             self.used_hint_or_quickplay = True
             self.hints_used += 1
-            if self.grid[y][x].neighbor_mines == 0:
-                self.reveal_adjacent_cells(x, y)
-            # Check for victory after revealing a cell
-            self.check_victory()
+            # Checks for victory after revealing the cell
+            self.reveal_cell(x, y)
 
     def solve_it(self):
         # Reveal all non-mine cells and flag all mines without changing the score
@@ -399,44 +387,21 @@ class Minesweeper:
         self.game_over = True
 
     def place_mines(self, first_x, first_y):
-        safe_cells = [(first_x, first_y)]
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx, ny = first_x + dx, first_y + dy
-                if 0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT:
-                    safe_cells.append((nx, ny))
-        positions = [(x, y) for x in range(GRID_WIDTH) for y in range(GRID_HEIGHT) if (x, y) not in safe_cells]
-        mine_positions = random.sample(positions, MINE_COUNT)
-        for x, y in mine_positions:
-            self.grid[y][x].is_mine = True
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                if not self.grid[y][x].is_mine:
-                    count = sum(1 for dx in [-1, 0, 1] for dy in [-1, 0, 1] 
-                                if 0 <= x + dx < GRID_WIDTH and 0 <= y + dy < GRID_HEIGHT and self.grid[y + dy][x + dx].is_mine)
-                    self.grid[y][x].neighbor_mines = count
+        self.board.ensure_mines(first_x, first_y)
 
     def reveal_cell(self, x, y):
-        if not (0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT):
-            return
-        cell = self.grid[y][x]
-        if cell.state != CellState.HIDDEN:
+        revealed = self.board.reveal(x, y)
+        if self.board.lost:
+            self.game_over = True
+            self.reveal_all_mines()
             return
-        cell.state = CellState.REVEALED
         if not self.used_hint_or_quickplay:
-            self.points += cell.neighbor_mines if cell.neighbor_mines else 1
-        if cell.neighbor_mines == 0 and not cell.is_mine:
-            self.reveal_adjacent_cells(x, y)
-        if self.check_victory():
+            for cx, cy in revealed:
+                number = self.board.number(cx, cy)
+                self.points += number if number else 1
+        if revealed and self.check_victory():
             self.handle_victory()
 
-    def reveal_adjacent_cells(self, x, y):
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx, ny = x + dx, y + dy
-                if (dx != 0 or dy != 0) and (0 <= nx < GRID_WIDTH) and (0 <= ny < GRID_HEIGHT):
-                    self.reveal_cell(nx, ny)
-
     def handle_click(self, pos, right_click=False):
         if self.game_over or self.victory:
             return
@@ -466,10 +431,7 @@ class Minesweeper:
             self.check_victory()
 
     def reveal_all_mines(self):
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                if self.grid[y][x].is_mine:
-                    self.grid[y][x].state = CellState.REVEALED
+        self.board.reveal_mines()
 
     def check_victory(self) -> bool:
         """
@@ -477,17 +439,11 @@ class Minesweeper:
         - All non-mine cells revealed OR
         - All mines correctly flagged
         """
-        # Count various cell states
-        total_hidden = self.count_hidden()
-        total_mines = MINE_COUNT
-        total_flags = sum(1 for row in self.grid for cell in row if cell.state == CellState.FLAGGED)
-        
+        total_mines = self.board.mine_count
+        total_flags = self.board.flagged_count
+
         # Victory condition 1: All non-mine cells revealed
-        if total_hidden == total_mines:
-            for y in range(GRID_HEIGHT):
-                for x in range(GRID_WIDTH):
-                    if self.grid[y][x].state == CellState.HIDDEN and not self.grid[y][x].is_mine:
-                        return False
+        if self.board.won:
             self.handle_victory()
             return True
         
@@ -820,12 +776,7 @@ class Minesweeper:
         Returns:
             int: Total number of hidden cells in the grid
         """
-        return sum(
-            1 
-            for row in self.grid 
-            for cell in row 
-            if cell.state == CellState.HIDDEN
-        )
+        return self.board.hidden_count
 
 
 if __name__ == "__main__":
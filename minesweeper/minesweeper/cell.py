@@ -1,14 +1,9 @@
 # cell.py
+# Cells now live in the shared board model (../board.py), used by every
+# Minesweeper front-end in this repository.
+import os
+import sys
 
-from enum import Enum
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-class CellState(Enum):
-    HIDDEN = 0
-    REVEALED = 1
-    FLAGGED = 2
-
-class Cell:
-    def __init__(self):
-        self.is_mine = False
-        self.state = CellState.HIDDEN
-        self.neighbor_mines = 0
+from board import Board, CellState, CellView as Cell  # noqa: E402,F401
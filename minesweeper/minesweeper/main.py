@@ -9,7 +9,6 @@ import os
 from datetime import datetime
 import uuid  # To generate a unique identifier
 from minesweeper import Minesweeper
-from cell import CellState  # Import CellState for setting cell states
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -63,7 +62,7 @@ if __name__ == "__main__":
             if action == 'reveal':
                 game.reveal_cell(x, y)
             elif action == 'flag':
-                game.grid[y][x].state = CellState.FLAGGED  # Use CellState.FLAGGED
+                game.board.set_flag(x, y)
                 game.mines_remaining -= 1
                 if debug_mode:
                     print(f"Flagged cell at ({x}, {y}) as a mine")
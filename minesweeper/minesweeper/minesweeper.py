@@ -2,7 +2,6 @@
 from os import environ
 environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
 import pygame
-import random
 from config import (
     BLACK,
     CELL_SIZE,
@@ -18,104 +17,60 @@ from config import (
     WINDOW_HEIGHT,
     WINDOW_WIDTH,
 )
-from cell import Cell, CellState
+from cell import Board, CellState
 
 class Minesweeper:
-    def __init__(self, solver=None, debug_mode=False):
-        pygame.init()
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Minesweeper")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
+    def __init__(self, solver=None, debug_mode=False, headless=False):
+        # headless: no window, clock or font; draw() and run() are then
+        # unavailable and the game is driven by calling reveal_cell directly.
+        self.headless = headless
+        if not headless:
+            pygame.init()
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+            pygame.display.set_caption("Minesweeper")
+            self.clock = pygame.time.Clock()
+            self.font = pygame.font.Font(None, 36)
         self.debug_mode = debug_mode  # Set debug mode
         self.reset_game()
         self.solver = solver(self) if solver else None  # Initialize solver if provided
         self.iteration = 0
 
     def reset_game(self):
-        self.grid = [[Cell() for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+        self.board = Board(GRID_WIDTH, GRID_HEIGHT, MINE_COUNT)
+        self.grid = self.board.cell_grid()
         self.game_over = False
-        self.first_click = True
         self.mines_remaining = MINE_COUNT
         if self.debug_mode:
             print("Game reset with hidden cells.")
 
-    def place_mines(self, first_x, first_y):
-        safe_cells = [(first_x, first_y)]
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx, ny = first_x + dx, first_y + dy
-                if 0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT:
-                    safe_cells.append((nx, ny))
-
-        mine_positions = [
-            (x, y) for x in range(GRID_WIDTH) for y in range(GRID_HEIGHT)
-            if (x, y) not in safe_cells
-        ]
-        selected_positions = random.sample(mine_positions, MINE_COUNT)
-
-        for x, y in selected_positions:
-            self.grid[y][x].is_mine = True
+    @property
+    def first_click(self):
+        return not self.board.mines_placed
 
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                if not self.grid[y][x].is_mine:
-                    self.grid[y][x].neighbor_mines = sum(
-                        1 for dx in [-1, 0, 1] for dy in [-1, 0, 1]
-                        if 0 <= x + dx < GRID_WIDTH and 0 <= y + dy < GRID_HEIGHT
-                        and self.grid[y + dy][x + dx].is_mine
-                    )
+    def place_mines(self, first_x, first_y):
+        self.board.ensure_mines(first_x, first_y)
 
     def reveal_cell(self, x, y):
         """Reveal a cell and handle cascade reveal if the cell has no neighboring mines."""
-        if self.first_click:
-            self.place_mines(x, y)
-            self.first_click = False
-
-        cell = self.grid[y][x]
-        if cell.state != CellState.HIDDEN:
-            return
-
-        cell.state = CellState.REVEALED
+        revealed = self.board.reveal(x, y)
         if self.debug_mode:
-            print(f"Revealed cell at ({x}, {y}) - Neighbor mines: {cell.neighbor_mines}")
+            for i, (rx, ry) in enumerate(revealed):
+                kind = "Revealed" if i == 0 else "Cascade reveal"
+                print(f"{kind} cell at ({rx}, {ry}) - Neighbor mines: {self.board.number(rx, ry)}")
 
-        if cell.is_mine:
+        if self.board.lost and not self.game_over:
             self.game_over = True
             print("Game Over! Mine clicked.")
             self.reveal_all_mines()
-        elif cell.neighbor_mines == 0:
-            self.cascade_reveal(x, y)
-
-    def cascade_reveal(self, x, y):
-        """Recursively reveal adjacent cells if they have no neighboring mines."""
-        directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT:
-                neighbor = self.grid[ny][nx]
-                if neighbor.state == CellState.HIDDEN and not neighbor.is_mine:
-                    neighbor.state = CellState.REVEALED
-                    if self.debug_mode:
-                        print(f"Cascade reveal cell at ({nx}, {ny}) - Neighbor mines: {neighbor.neighbor_mines}")
-                    if neighbor.neighbor_mines == 0:
-                        self.cascade_reveal(nx, ny)
 
     def reveal_all_mines(self):
         """Reveal all mines when the game is over."""
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                cell = self.grid[y][x]
-                if cell.is_mine:
-                    cell.state = CellState.REVEALED
+        self.board.reveal_mines()
         print("All mines revealed.")
 
     def count_hidden_cells(self):
         """Count the number of hidden cells on the board."""
-        return sum(
-            1 for row in self.grid for cell in row
-            if cell.state == CellState.HIDDEN
-        )
+        return self.board.hidden_count
 
     def draw(self):
         self.screen.fill(GRAY)
@@ -150,7 +105,7 @@ class Minesweeper:
                     if action == 'reveal':
                         self.reveal_cell(x, y)
                     elif action == 'flag':
-                        self.grid[y][x].state = CellState.FLAGGED
+                        self.board.set_flag(x, y)
                         self.mines_remaining -= 1
                         if self.debug_mode:
                             print(f"Flagged cell at ({x}, {y}) as a mine")
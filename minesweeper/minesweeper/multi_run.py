@@ -1,42 +1,247 @@
-# run_multiple_times.py
+# multi_run.py
+"""Headless solver tournament.
 
+Plays N seeded boards per solver in-process, without a window, across a
+pool of worker processes, and prints one CSV row per solver:
+
+    python multi_run.py 100 enhanced_solver advanced_solver
+    python multi_run.py 500 --workers 8 --seed 1000 --output results.csv
+
+With no solver names every solver in solvers/ plays. Game i of every
+solver is seeded with seed + i (mine placement and the solvers' own
+random choices both use the global random module).
+
+A game is won when no mine was revealed and either every safe cell is
+revealed or every mine, and nothing else, is flagged. A guess is a
+reveal made on a move during which the solver called random_hidden_cell
+or probabilistic_guess; for solvers without either (random_solver) every
+reveal is a guess. The first click counts as a guess.
+
+A game still running after --timeout seconds is stopped and counted as
+a loss (where the platform has SIGALRM); some solvers' backtracking can
+take minutes on one board.
+
+The old invocation, `python multi_run.py <N> main.py <solver> [debug]`,
+still works: the .py argument is ignored and debug is passed to the
+solvers.
+"""
+
+import argparse
+import contextlib
+import csv
+import importlib
+import io
+import os
+import random
+import signal
 import sys
-import subprocess
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from cell import CellState  # noqa: E402
+from config import GRID_HEIGHT, GRID_WIDTH  # noqa: E402
+from minesweeper import Minesweeper  # noqa: E402
+
+GUESS_METHODS = ("random_hidden_cell", "probabilistic_guess")
+# Solvers that keep returning cells they can't act on would never finish.
+MAX_MOVES = GRID_WIDTH * GRID_HEIGHT * 4
+DEFAULT_TIMEOUT = 30.0
+PERCENTILES = (50, 90, 99)
+FIELDS = (
+    ["solver", "games", "wins", "win_rate", "timeouts", "guesses_per_game", "moves_per_game"]
+    + [f"time_p{p}_ms" for p in PERCENTILES]
+    + ["time_mean_ms"]
+)
+
+
+def available_solvers():
+    return sorted(
+        name[:-3] for name in os.listdir(os.path.join(SCRIPT_DIR, "solvers"))
+        if name.endswith("_solver.py")
+    )
+
+
+def percentile(values, p):
+    """The p-th percentile of values, interpolating between ranks."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class _GameTimeout(Exception):
+    pass
+
 
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: python run_multiple_times.py <N> <filename> [solver] [debug]")
-        sys.exit(1)
+def _on_alarm(signum, frame):
+    raise _GameTimeout()
 
-    # Parse arguments
+
+class _GuessCounter:
+    """Wraps a solver's guessing methods to tell whether a move was a guess."""
+
+    def __init__(self, solver):
+        self.guessed = False
+        self.every_move = not any(hasattr(solver, name) for name in GUESS_METHODS)
+        for name in GUESS_METHODS:
+            method = getattr(solver, name, None)
+            if method is not None:
+                setattr(solver, name, self._wrap(method))
+
+    def _wrap(self, method):
+        def wrapped(*args, **kwargs):
+            self.guessed = True
+            return method(*args, **kwargs)
+        return wrapped
+
+
+def _won(game):
+    board = game.board
+    mines = board.mines == 1
+    # Some solvers mark cells revealed themselves, bypassing reveal_cell.
+    if game.game_over or np.any(mines & (board.states == CellState.REVEALED)):
+        return False
+    return board.won or np.array_equal(mines, board.states == CellState.FLAGGED)
+
+
+def play_game(task):
+    """Play one seeded game; returns a dict of per-game results."""
+    solver_name, seed, debug_mode, timeout = task
+    SolverClass = importlib.import_module(f"solvers.{solver_name}").Solver
+    random.seed(seed)
+    game = Minesweeper(headless=True)
+    moves = guesses = 0
+    timed_out = False
+    output = sys.stdout if debug_mode else io.StringIO()
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
     try:
-        N = int(sys.argv[1])
-        filename = sys.argv[2]
-    except ValueError:
-        print("Error: N must be an integer.")
-        sys.exit(1)
-
-    # Optional arguments
-    solver = sys.argv[3] if len(sys.argv) > 3 else None
-    debug = sys.argv[4] if len(sys.argv) > 4 else None
-
-    # Prepare command with optional arguments
-    base_command = ["python", filename]
-    if solver:
-        base_command.append(solver)
-    if debug:
-        base_command.append(debug)
-
-    # Run the specified file N times
-    for i in range(N):
-        print(f"Running {filename}, iteration {i + 1}/{N}")
-        result = subprocess.run(base_command, capture_output=True, text=True)
-
-        # Print output and errors from each run
-        if result.stdout:
-            print(f"Output:\n{result.stdout}")
-        if result.stderr:
-            print(f"Error:\n{result.stderr}")
+        with contextlib.redirect_stdout(output):
+            solver = SolverClass(game, debug_mode=debug_mode)
+            counter = _GuessCounter(solver)
+            while not game.game_over and moves < MAX_MOVES:
+                counter.guessed = False
+                move = solver.next_move()
+                if not move:
+                    break
+                moves += 1
+                x, y, action = move
+                if action == 'reveal':
+                    guesses += counter.guessed or counter.every_move
+                    game.reveal_cell(x, y)
+                elif action == 'flag':
+                    game.board.set_flag(x, y)
+                    game.mines_remaining -= 1
+                # main.py stops here too: the solver believes every mine is flagged.
+                if game.mines_remaining <= 0 or _won(game):
+                    break
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except _GameTimeout:
+        timed_out = True
+    finally:
+        if use_alarm:
+            # Normally cancelled above already. If the game raised first, the
+            # alarm can still fire here, and must not escape into pool.map.
+            try:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+            except _GameTimeout:
+                timed_out = True
+    elapsed = time.perf_counter() - start
+    return {
+        "solver": solver_name,
+        "seed": seed,
+        "won": not timed_out and _won(game),
+        "timed_out": timed_out,
+        "moves": moves,
+        "guesses": guesses,
+        "seconds": elapsed,
+    }
+
+
+def summarize(solver_name, results):
+    games = len(results)
+    wins = sum(r["won"] for r in results)
+    times_ms = [r["seconds"] * 1000 for r in results]
+    row = {
+        "solver": solver_name,
+        "games": games,
+        "wins": wins,
+        "win_rate": round(wins / games, 4) if games else 0,
+        "timeouts": sum(r["timed_out"] for r in results),
+        "guesses_per_game": round(sum(r["guesses"] for r in results) / games, 2) if games else 0,
+        "moves_per_game": round(sum(r["moves"] for r in results) / games, 1) if games else 0,
+        "time_mean_ms": round(sum(times_ms) / games, 2) if games else 0,
+    }
+    for p in PERCENTILES:
+        value = percentile(times_ms, p)
+        row[f"time_p{p}_ms"] = round(value, 2) if value is not None else ""
+    return row
+
+
+def run_tournament(solvers, games, seed=0, workers=None, debug_mode=False,
+                   timeout=DEFAULT_TIMEOUT):
+    """Play games boards per solver; returns one summary row per solver."""
+    tasks = [(name, seed + i, debug_mode, timeout) for name in solvers for i in range(games)]
+    with Pool(workers) as pool:
+        results = pool.map(play_game, tasks, chunksize=max(1, games // 16))
+    return [
+        summarize(name, [r for r in results if r["solver"] == name])
+        for name in solvers
+    ]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Minesweeper solver tournament")
+    parser.add_argument("games", type=int, help="boards per solver")
+    parser.add_argument("solvers", nargs="*",
+                        help="solver modules from solvers/ (default: all of them)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first board")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds before a game is stopped and lost; 0 for no limit "
+                             "(default: %(default)s)")
+    parser.add_argument("--output", help="write the CSV here instead of stdout")
+    parser.add_argument("--debug", action="store_true",
+                        help="run solvers in debug mode and show their output")
+    args = parser.parse_args(argv)
+    # Old form: multi_run.py <N> main.py <solver> [debug]
+    args.solvers = [name for name in args.solvers if not name.endswith(".py")]
+    if "debug" in args.solvers:
+        args.solvers.remove("debug")
+        args.debug = True
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    known = available_solvers()
+    unknown = [name for name in args.solvers if name not in known]
+    if unknown:
+        print(f"Unknown solver(s): {', '.join(unknown)}. Valid solvers: {', '.join(known)}",
+              file=sys.stderr)
+        return 1
+    rows = run_tournament(args.solvers or known, args.games, args.seed,
+                          args.workers, args.debug, args.timeout)
+    with open(args.output, "w", newline="") if args.output else contextlib.nullcontext(sys.stdout) as out:
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# test_multi_run.py
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import multi_run
+from cell import Board, CellState
+
+LAYOUT = [
+    [0, 0, 0, 0, 1],
+    [0, 0, 0, 0, 0],
+    [0, 0, 0, 1, 0],
+    [0, 0, 0, 0, 0],
+]
+MINES = [(4, 0), (3, 2)]
+
+
+def _game(board, game_over=False):
+    return SimpleNamespace(board=board, game_over=game_over)
+
+
+class TestPercentile(unittest.TestCase):
+    def test_known_values(self):
+        values = list(range(1, 11))
+        self.assertEqual(multi_run.percentile(values, 0), 1)
+        self.assertEqual(multi_run.percentile(values, 100), 10)
+        self.assertAlmostEqual(multi_run.percentile(values, 50), 5.5)
+        self.assertAlmostEqual(multi_run.percentile(values, 90), 9.1)
+        self.assertAlmostEqual(multi_run.percentile([4, 1, 3, 2], 50), 2.5)
+        self.assertEqual(multi_run.percentile([7], 99), 7)
+        self.assertIsNone(multi_run.percentile([], 50))
+
+
+class TestWon(unittest.TestCase):
+    def test_all_safe_cells_revealed(self):
+        board = Board.from_mines(LAYOUT)
+        for y, row in enumerate(LAYOUT):
+            for x, mine in enumerate(row):
+                if not mine:
+                    board.reveal(x, y)
+        self.assertTrue(board.won)
+        self.assertTrue(multi_run._won(_game(board)))
+
+    def test_exactly_the_mines_flagged(self):
+        board = Board.from_mines(LAYOUT)
+        board.set_flag(*MINES[0])
+        self.assertFalse(multi_run._won(_game(board)))
+        board.set_flag(*MINES[1])
+        self.assertFalse(board.won)
+        self.assertTrue(multi_run._won(_game(board)))
+        board.set_flag(0, 0)
+        self.assertFalse(multi_run._won(_game(board)))
+
+    def test_lost_games_are_not_won(self):
+        board = Board.from_mines(LAYOUT)
+        for x, y in MINES:
+            board.set_flag(x, y)
+        self.assertFalse(multi_run._won(_game(board, game_over=True)))
+        board = Board.from_mines(LAYOUT)
+        board.set_flag(*MINES[0])
+        # A solver marking the other mine revealed itself, past reveal_cell.
+        board.set_state(*MINES[1], CellState.REVEALED)
+        self.assertFalse(multi_run._won(_game(board)))
+
+
+class TestTournament(unittest.TestCase):
+    def test_two_game_smoke_run(self):
+        # In its own process: the workers import solvers/ by package name,
+        # which the other test directories also use.
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.csv")
+            env = dict(os.environ, SDL_VIDEODRIVER="dummy")
+            subprocess.run(
+                [sys.executable, multi_run.__file__, "2", "simple_solver",
+                 "--workers", "1", "--output", path],
+                check=True, env=env, cwd=tmp, capture_output=True, timeout=120,
+            )
+            with open(path, newline="") as f:
+                reader = csv.DictReader(f)
+                rows = list(reader)
+        self.assertEqual(list(reader.fieldnames), list(multi_run.FIELDS))
+        self.assertEqual(len(rows), 1)
+        row = rows[0]
+        self.assertEqual(row["solver"], "simple_solver")
+        self.assertEqual(int(row["games"]), 2)
+        self.assertLessEqual(int(row["wins"]) + int(row["timeouts"]), 2)
+        self.assertTrue(0.0 <= float(row["win_rate"]) <= 1.0)
+        self.assertLessEqual(float(row["time_p50_ms"]), float(row["time_p99_ms"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
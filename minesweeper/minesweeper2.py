@@ -4,10 +4,11 @@ environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
 import pygame
 import random
 from enum import Enum, auto
-from dataclasses import dataclass
 from typing import List, Tuple, Optional, Dict
 import os
 
+from board import Board, CellState
+
 # Configuration
 class Config:
     CELL_SIZE = 32
@@ -70,57 +71,15 @@ class GameState(Enum):
     WON = auto()
     LOST = auto()
 
-class CellState(Enum):
-    HIDDEN = auto()
-    REVEALED = auto()
-    FLAGGED = auto()
-
-@dataclass
-class Cell:
-    is_mine: bool = False
-    state: CellState = CellState.HIDDEN
-    neighbor_mines: int = 0
-
-class Grid:
+class Grid(Board):
+    """The shared board, plus a ``cells[y][x]`` view for drawing."""
     def __init__(self, width: int, height: int, mine_count: int):
-        self.width = width
-        self.height = height
-        self.mine_count = mine_count
-        self.cells = [[Cell() for _ in range(width)] for _ in range(height)]
-        self.first_click = True
-    
-    def place_mines(self, first_x: int, first_y: int) -> None:
-        safe_cells = [(first_x, first_y)]
-        safe_cells.extend([
-            (first_x + dx, first_y + dy)
-            for dx in [-1, 0, 1] for dy in [-1, 0, 1]
-            if 0 <= first_x + dx < self.width and 0 <= first_y + dy < self.height
-        ])
-        
-        all_positions = [
-            (x, y) for x in range(self.width) for y in range(self.height)
-            if (x, y) not in safe_cells
-        ]
-        
-        mine_positions = random.sample(all_positions, self.mine_count)
-        for x, y in mine_positions:
-            self.cells[y][x].is_mine = True
-        
-        self._calculate_neighbors()
-    
-    def _calculate_neighbors(self) -> None:
-        for y in range(self.height):
-            for x in range(self.width):
-                if not self.cells[y][x].is_mine:
-                    self.cells[y][x].neighbor_mines = self._count_adjacent_mines(x, y)
-    
-    def _count_adjacent_mines(self, x: int, y: int) -> int:
-        return sum(
-            self.cells[y + dy][x + dx].is_mine
-            for dx in [-1, 0, 1] for dy in [-1, 0, 1]
-            if 0 <= x + dx < self.width and 0 <= y + dy < self.height
-            and (dx != 0 or dy != 0)
-        )
+        super().__init__(width, height, mine_count)
+        self.cells = self.cell_grid()
+
+    @property
+    def first_click(self) -> bool:
+        return not self.mines_placed
 
 class GameTimer:
     def __init__(self):
@@ -287,8 +246,7 @@ class Minesweeper:
             
         self._new_game()
         self.state = GameState.PLAYING
-        self.grid.first_click = False
-        self.grid.place_mines(0, 0)
+        self.grid.ensure_mines(0, 0)
         
         # Reveal 5 random safe cells
         safe_cells = [
@@ -355,49 +313,23 @@ class Minesweeper:
         if self.state == GameState.READY:
             self.state = GameState.PLAYING
             self.timer.start()
-            if self.grid.first_click:
-                self.grid.place_mines(x, y)
-                self.grid.first_click = False
-        
-        cell.state = CellState.REVEALED
-        
-        if cell.is_mine:
+
+        self.grid.reveal(x, y)
+        if self.grid.lost:
             self.state = GameState.LOST
-            return
-            
-        if cell.neighbor_mines == 0:
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    nx, ny = x + dx, y + dy
-                    if (0 <= nx < Config.GRID_WIDTH and 
-                        0 <= ny < Config.GRID_HEIGHT):
-                        self._reveal_cell(nx, ny)
 
     def _toggle_flag(self, x: int, y: int) -> None:
         if self.state != GameState.PLAYING:
             return
             
-        cell = self.grid.cells[y][x]
-        if cell.state == CellState.REVEALED:
-            return
-            
-        cell.state = (
-            CellState.HIDDEN 
-            if cell.state == CellState.FLAGGED 
-            else CellState.FLAGGED
-        )
+        self.grid.toggle_flag(x, y)
 
     def _check_victory(self) -> None:
         if self.state != GameState.PLAYING:
             return
             
-        for y in range(Config.GRID_HEIGHT):
-            for x in range(Config.GRID_WIDTH):
-                cell = self.grid.cells[y][x]
-                if not cell.is_mine and cell.state != CellState.REVEALED:
-                    return
-                    
-        self.state = GameState.WON
+        if self.grid.won:
+            self.state = GameState.WON
 
     def run(self):
         clock = pygame.time.Clock()
@@ -1,11 +1,11 @@
 from os import environ
 environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
 import pygame
-import random
 import sys
 import time
 import importlib
-from enum import Enum
+
+from board import Board, CellState
 
 # Constants
 CELL_SIZE = 32
@@ -39,17 +39,6 @@ NUMBER_COLORS = {
     8: GRAY
 }
 
-class CellState(Enum):
-    HIDDEN = 0
-    REVEALED = 1
-    FLAGGED = 2
-
-class Cell:
-    def __init__(self):
-        self.is_mine = False
-        self.state = CellState.HIDDEN
-        self.neighbor_mines = 0
-
 class Minesweeper:
     def __init__(self, solver_name=None):
         pygame.init()  # Initialize Pygame
@@ -64,6 +53,10 @@ class Minesweeper:
         self.GRID_WIDTH = GRID_WIDTH
         self.GRID_HEIGHT = GRID_HEIGHT
 
+        # Callbacks for cell changes, see subscribe(). Set up before the
+        # solver loads so it can subscribe from its constructor.
+        self._listeners = []
+
         # Load specified solver
         self.solver_name = solver_name
         self.solver = self.load_solver(solver_name)
@@ -107,93 +100,69 @@ class Minesweeper:
             print(f"Error loading solver '{solver_name}': {e}")
             return None
 
+    def subscribe(self, listener):
+        """Call listener(event, x, y) on every cell change.
+
+        Events are "reveal", "flag" and "unflag" for cell (x, y), and
+        "reset" (with no cell) when a new game starts."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _notify(self, event, x=None, y=None):
+        for listener in self._listeners:
+            listener(event, x, y)
+
     def reset_game(self):
-        self.grid = [[Cell() for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+        # Mines go down on the first reveal, clear of it and its neighbours.
+        self.board = Board(GRID_WIDTH, GRID_HEIGHT, MINE_COUNT)
+        self.grid = self.board.cell_grid()
         self.game_over = False
         self.victory = False
         self.step_count = 0  # Reset step count on a new game
-        # Defer mine placement until the first click so it can be made safe.
-        self.mines_placed = False
+        self._notify("reset")
+
+    @property
+    def mines_placed(self):
+        return self.board.mines_placed
+
+    @property
+    def hidden_count(self):
+        return self.board.hidden_count
+
+    @property
+    def flagged_count(self):
+        return self.board.flagged_count
 
     def place_mines(self, safe_cells=None):
         """Randomly place mines on the grid, avoiding any cells in safe_cells."""
-        safe_cells = set(safe_cells) if safe_cells else set()
-        candidate_cells = [
-            (x, y)
-            for x in range(GRID_WIDTH)
-            for y in range(GRID_HEIGHT)
-            if (x, y) not in safe_cells
-        ]
-        mine_count = min(MINE_COUNT, len(candidate_cells))
-        mine_positions = random.sample(candidate_cells, mine_count)
-
-        for x, y in mine_positions:
-            self.grid[y][x].is_mine = True
-
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                if not self.grid[y][x].is_mine:
-                    count = sum(
-                        1 for dx in [-1, 0, 1] for dy in [-1, 0, 1]
-                        if 0 <= x + dx < GRID_WIDTH and 0 <= y + dy < GRID_HEIGHT
-                        and self.grid[y + dy][x + dx].is_mine
-                    )
-                    self.grid[y][x].neighbor_mines = count
-
-    def _ensure_mines_placed(self, click_x, click_y):
-        """Place mines on first click, excluding the clicked cell and its 8 neighbors."""
-        if self.mines_placed:
-            return
-        safe_cells = {
-            (click_x + dx, click_y + dy)
-            for dx in (-1, 0, 1)
-            for dy in (-1, 0, 1)
-            if 0 <= click_x + dx < GRID_WIDTH and 0 <= click_y + dy < GRID_HEIGHT
-        }
-        self.place_mines(safe_cells=safe_cells)
-        self.mines_placed = True
+        self.board.place_mines(safe_cells or ())
 
     def reveal_cell(self, x, y):
         """Reveal a cell and print debug information about clicked cells."""
-        if not (0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT):
-            return
-        # Guarantee the first revealed cell is safe by placing mines now.
-        self._ensure_mines_placed(x, y)
-        cell = self.grid[y][x]
-        if cell.state != CellState.HIDDEN:
+        revealed = self.board.reveal(x, y)
+        if not revealed:
             return
-        cell.state = CellState.REVEALED
+        for rx, ry in revealed:
+            print(f"Revealed cell at ({rx}, {ry}), mine: {self.board.is_mine(rx, ry)}, "
+                  f"neighbors: {self.board.number(rx, ry)}")
+            self._notify("reveal", rx, ry)
 
-        # Print which cell is clicked
-        print(f"Revealed cell at ({x}, {y}), mine: {cell.is_mine}, neighbors: {cell.neighbor_mines}")
-
-        if cell.is_mine:
+        if self.board.lost:
             self.game_over = True
             print("Game Over! Mine clicked.")
             self.reveal_all_mines()
-        elif cell.neighbor_mines == 0:
-            self.reveal_adjacent_cells(x, y)
 
         # Check for victory if no mine is clicked
         self.check_victory()
 
     def check_victory(self):
         """Check if all non-mine cells are revealed, indicating victory."""
-        all_revealed = all(
-            cell.state == CellState.REVEALED or cell.is_mine
-            for row in self.grid for cell in row
-        )
-        if all_revealed:
+        if self.board.won:
             self.victory = True
             print("Victory! All non-mine cells revealed.")
 
-    def reveal_adjacent_cells(self, x, y):
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx, ny = x + dx, y + dy
-                if (dx != 0 or dy != 0) and (0 <= nx < GRID_WIDTH) and (0 <= ny < GRID_HEIGHT):
-                    self.reveal_cell(nx, ny)
-
     def handle_click(self, pos, right_click=False):
         if self.is_solver_active:
             return  # Ignore clicks when a solver is running
@@ -202,23 +171,27 @@ class Minesweeper:
         y = (pos[1] - HEADER_HEIGHT) // CELL_SIZE
         if not (0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT):
             return
-        cell = self.grid[y][x]
         if right_click:
-            if cell.state == CellState.HIDDEN:
-                cell.state = CellState.FLAGGED
-            elif cell.state == CellState.FLAGGED:
-                cell.state = CellState.HIDDEN
+            if self.grid[y][x].state == CellState.HIDDEN:
+                self.flag_cell(x, y)
+            else:
+                self.unflag_cell(x, y)
         else:
             self.reveal_cell(x, y)
 
+    def flag_cell(self, x, y):
+        if self.board.set_flag(x, y, True):
+            self._notify("flag", x, y)
+
+    def unflag_cell(self, x, y):
+        if self.board.set_flag(x, y, False):
+            self._notify("unflag", x, y)
+
     def reveal_all_mines(self):
         # Reveal unflagged mines only; preserve FLAGGED state so the solver's
         # correct flags survive the post-mortem (and remain countable).
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                cell = self.grid[y][x]
-                if cell.is_mine and cell.state != CellState.FLAGGED:
-                    cell.state = CellState.REVEALED
+        for x, y in self.board.reveal_mines():
+            self._notify("reveal", x, y)
 
     def run(self):
         running = True
@@ -233,14 +206,11 @@ class Minesweeper:
                     if action == 'reveal':
                         self.reveal_cell(x, y)
                     elif action == 'flag':
-                        self.grid[y][x].state = CellState.FLAGGED
-
-                    # Calculate hidden cells and mines remaining
-                    hidden_cells = sum(1 for row in self.grid for cell in row if cell.state == CellState.HIDDEN)
-                    mines_remaining = MINE_COUNT - sum(1 for row in self.grid for cell in row if cell.state == CellState.FLAGGED)
+                        self.flag_cell(x, y)
 
                     # Print step information
-                    print(f"Step {self.step_count}: Hidden cells remaining: {hidden_cells}, Mines remaining: {mines_remaining}")
+                    mines_remaining = MINE_COUNT - self.flagged_count
+                    print(f"Step {self.step_count}: Hidden cells remaining: {self.hidden_count}, Mines remaining: {mines_remaining}")
 
                 else:
                     print("No moves available from the solver.")
@@ -280,15 +250,9 @@ class Minesweeper:
                 elapsed = time.monotonic() - self._round_start_time
                 # Progress made before the game ended. reveal_all_mines now
                 # preserves FLAGGED state, so the count reflects real flags.
-                opened = sum(
-                    1 for row in self.grid for c in row
-                    if c.state == CellState.REVEALED and not c.is_mine
-                )
-                flagged = sum(
-                    1 for row in self.grid for c in row
-                    if c.state == CellState.FLAGGED
-                )
                 safe_total = GRID_WIDTH * GRID_HEIGHT - MINE_COUNT
+                opened = safe_total - self.board.safe_left
+                flagged = self.board.flagged_count
                 print(
                     f"[minesweeper-solver] {outcome} in {elapsed:.2f}s "
                     f"— flagged {flagged}/{MINE_COUNT}, opened {opened}/{safe_total}",
@@ -324,20 +288,11 @@ class Minesweeper:
         # mines remaining (MINE_COUNT minus flag count). The print loop in
         # run() emits the same numbers — this just mirrors them on-screen.
         hud_font = pygame.font.Font(None, 24)
-        hidden_left = sum(
-            1 for row in self.grid for cell in row
-            if cell.state == CellState.HIDDEN
-        )
-        flagged = sum(
-            1 for row in self.grid for cell in row
-            if cell.state == CellState.FLAGGED
-        )
-        mines_left = MINE_COUNT - flagged
         parts = []
         if self.is_solver_active:
             parts.append(f"Step: {self.step_count}")
-        parts.append(f"Hidden: {hidden_left}")
-        parts.append(f"Mines: {mines_left}")
+        parts.append(f"Hidden: {self.board.hidden_count}")
+        parts.append(f"Mines: {MINE_COUNT - self.board.flagged_count}")
         hud_text = hud_font.render("   ".join(parts), True, BLACK)
         self.screen.blit(hud_text, (10, 38))
 
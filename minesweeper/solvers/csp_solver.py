@@ -1,32 +1,193 @@
 """Constraint enumeration / CSP solver.
 
 Splits the frontier into connected components (constraints sharing any
-cell), enumerates every valid mine configuration per component via
-backtracking with constraint propagation, and computes exact P(mine)
-for each frontier cell. Cells with P=0 are revealed; P=1 are flagged.
-For guesses, the minimum exact probability across the frontier wins;
-interior cells (not adjacent to any constraint) use a residual base
-probability derived from the global mine count minus the frontier's
-expected mines.
-
-Components whose enumeration would exceed MAX_CONFIGS configurations
-are skipped — their cells fall back to base probability for guessing.
-This bounds worst-case time per move."""
+cell) and counts every valid mine configuration per component, without
+storing any of them. For each component the count is bucketed by the
+number of mines in the configuration: {mines: (configs, per-cell mine
+counts)}. The buckets of all components are then combined with the
+number of ways to place the remaining mines on the interior cells (not
+adjacent to any constraint), which gives exact P(mine) for every hidden
+cell given the mines left. Cells with P=0 are revealed; P=1 are flagged.
+For guesses, the minimum exact probability wins.
+
+The counter propagates forced cells (a constraint with no mines left
+makes its cells safe; one needing all of its cells makes them mines),
+splits the remaining constraints into independent pieces whose counts
+multiply, and branches on a cell of the tightest constraint first. Long
+frontiers therefore count in roughly linear time instead of enumerating
+an exponential number of configurations.
+
+Components that need more than MAX_NODES search nodes are skipped — their
+cells are treated as interior cells. This bounds worst-case
+time per move. The weights are then only approximate, so a move with a
+skipped component draws no certainties from the interior and takes a
+frontier cell as certain only if every configuration of its own
+component agrees.
+
+Constraints come from the shared FrontierIndex (solvers/frontier.py), and
+a component whose constraints did not change since the previous move
+reuses its counts, so a move only re-counts the components it touched."""
 from collections import defaultdict, deque
+from math import comb
+
+from solvers.frontier import FrontierIndex
+
+MAX_NODES = 200000
+
+
+class _TooManyNodes(Exception):
+    pass
+
+
+def _split(constraints):
+    """Group constraints, given as (cells, mines), into independent pieces."""
+    parent = list(range(len(constraints)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {}
+    for i, (cells, _) in enumerate(constraints):
+        for cell in cells:
+            j = owner.setdefault(cell, i)
+            a, b = find(i), find(j)
+            if a != b:
+                parent[a] = b
+    groups = defaultdict(list)
+    for i, constraint in enumerate(constraints):
+        groups[find(i)].append(constraint)
+    return list(groups.values())
+
 
-from minesweeper_with_solver import MINE_COUNT
+def _combine(a, b):
+    """Counts of two independent pieces -> counts of both together."""
+    out = {}
+    for ka, (na, ca) in a.items():
+        for kb, (nb, cb) in b.items():
+            n, counts = out.get(ka + kb, (0, None))
+            if counts is None:
+                counts = defaultdict(int)
+            for cell, c in ca.items():
+                counts[cell] += c * nb
+            for cell, c in cb.items():
+                counts[cell] += c * na
+            out[ka + kb] = (n + na * nb, counts)
+    return out
 
-MAX_CONFIGS = 50000
 
+def _merge_into(out, counts):
+    for k, (n, cells) in counts.items():
+        total, merged = out.get(k, (0, None))
+        if merged is None:
+            merged = defaultdict(int)
+        for cell, c in cells.items():
+            merged[cell] += c
+        out[k] = (total + n, merged)
 
-def _neighbors(x, y, w, h):
-    for dx in (-1, 0, 1):
-        for dy in (-1, 0, 1):
-            if dx == 0 and dy == 0:
-                continue
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < w and 0 <= ny < h:
-                yield nx, ny
+
+class _Counter:
+    """Counts the configurations of one component, bucketed by mine count.
+
+    A result maps mines -> (configurations, {cell: configurations in which
+    the cell is a mine}); cells that are never mines are left out.
+    """
+
+    def __init__(self, max_nodes=MAX_NODES):
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self.memo = {}
+
+    def count(self, constraints):
+        key = tuple(sorted(constraints))
+        result = self.memo.get(key)
+        if result is None:
+            result = self.memo[key] = self._count(constraints)
+        return result
+
+    def _count(self, constraints):
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise _TooManyNodes
+        constraints, mines = self._propagate(constraints)
+        if constraints is None:
+            return {}
+        if not constraints:
+            result = {0: (1, {})}
+        else:
+            pieces = _split(constraints)
+            if len(pieces) > 1:
+                result = {0: (1, {})}
+                for piece in pieces:
+                    result = _combine(result, self.count(piece))
+                    if not result:
+                        return {}
+            else:
+                result = self._branch(constraints)
+        if not mines:
+            return result
+        shift = len(mines)
+        return {
+            k + shift: (n, {**cells, **{cell: n for cell in mines}})
+            for k, (n, cells) in result.items()
+        }
+
+    def _branch(self, constraints):
+        # Most-constrained first: a cell of the constraint with the fewest
+        # open cells, preferring the cell that appears in most constraints.
+        tightest = min(constraints, key=lambda c: len(c[0]))[0]
+        degree = defaultdict(int)
+        for cells, _ in constraints:
+            for cell in cells:
+                degree[cell] += 1
+        cell = max(sorted(tightest), key=degree.__getitem__)
+        out = {}
+        for value in (0, 1):
+            assigned = []
+            for cells, m in constraints:
+                if cell in cells:
+                    assigned.append((tuple(c for c in cells if c != cell), m - value))
+                else:
+                    assigned.append((cells, m))
+            counts = self.count(assigned)
+            if value:
+                counts = {
+                    k + 1: (n, {**cells, cell: n}) for k, (n, cells) in counts.items()
+                }
+            _merge_into(out, counts)
+        return out
+
+    @staticmethod
+    def _propagate(constraints):
+        """Settle cells forced by a single constraint, repeatedly.
+
+        Returns (open constraints, forced mines), or (None, None) when the
+        constraints contradict each other.
+        """
+        mines = set()
+        while True:
+            forced = {}
+            for cells, m in constraints:
+                if m < 0 or m > len(cells):
+                    return None, None
+                if m == 0 or m == len(cells):
+                    for cell in cells:
+                        if forced.setdefault(cell, m > 0) != (m > 0):
+                            return None, None
+            if not forced:
+                return constraints, mines
+            mines.update(cell for cell, is_mine in forced.items() if is_mine)
+            reduced = []
+            for cells, m in constraints:
+                open_cells = tuple(c for c in cells if c not in forced)
+                m -= sum(1 for c in cells if forced.get(c))
+                if open_cells:
+                    reduced.append((open_cells, m))
+                elif m:
+                    return None, None
+            constraints = reduced
 
 
 class Solver:
@@ -35,14 +196,21 @@ class Solver:
         self.queue = deque()
         self.first_move = True
         self._last_probs = {}
+        self._interior_prob = None
+        self._last_components = []
+        self._skipped = False
         # Resolved lazily on first next_move(): game.grid doesn't exist
         # yet when load_solver runs Solver(game). Pulling CellState from
         # a live cell avoids the __main__-vs-imported double-Enum trap.
         self.CellState = None
+        self.index = FrontierIndex(game)
+        # Constraint keys of a component -> its (buckets, cells).
+        self._component_cache = {}
 
     def _resolve_cell_state(self):
         if self.CellState is None:
             self.CellState = type(self.game.grid[0][0].state)
+        self.index.sync()
 
     def _w(self):
         return self.game.GRID_WIDTH
@@ -53,38 +221,6 @@ class Solver:
     def _grid(self):
         return self.game.grid
 
-    def _hidden_cells(self):
-        w, h = self._w(), self._h()
-        g = self._grid()
-        return [
-            (x, y) for y in range(h) for x in range(w)
-            if g[y][x].state == self.CellState.HIDDEN
-        ]
-
-    def _flagged_count(self):
-        return sum(1 for row in self._grid() for c in row if c.state == self.CellState.FLAGGED)
-
-    def _build_constraints(self):
-        w, h = self._w(), self._h()
-        g = self._grid()
-        out = []
-        for y in range(h):
-            for x in range(w):
-                c = g[y][x]
-                if c.state != self.CellState.REVEALED or c.neighbor_mines <= 0:
-                    continue
-                hidden = []
-                flagged = 0
-                for nx, ny in _neighbors(x, y, w, h):
-                    n = g[ny][nx]
-                    if n.state == self.CellState.HIDDEN:
-                        hidden.append((nx, ny))
-                    elif n.state == self.CellState.FLAGGED:
-                        flagged += 1
-                if hidden:
-                    out.append((frozenset(hidden), c.neighbor_mines - flagged))
-        return out
-
     def _components(self, constraints):
         """Union-find over constraints: two constraints join iff they share a cell."""
         cell_to_cs = defaultdict(set)
@@ -111,111 +247,158 @@ class Solver:
         return list(groups.values())
 
     def _enumerate(self, comp_indices, all_constraints):
-        """Enumerate valid 0/1 assignments to the component's cells.
-        Returns (configs, cells_list) or (None, cells_list) if MAX_CONFIGS
-        is exceeded (component too large to enumerate safely)."""
-        cs = [all_constraints[i] for i in comp_indices]
+        """Count the valid mine configurations of one component.
+
+        Returns (buckets, cells): buckets maps mines -> (configurations,
+        {cell: configurations with a mine there}). buckets is None if the
+        component needs more than MAX_NODES search nodes."""
+        cs = [(tuple(sorted(all_constraints[i][0])), all_constraints[i][1])
+              for i in comp_indices]
         cells = sorted({c for cells, _ in cs for c in cells})
-        cell_idx = {c: i for i, c in enumerate(cells)}
-        n = len(cells)
-        # Pre-compute, per constraint, the cell indices it covers.
-        cs_idx = [(sorted(cell_idx[c] for c in cells_set), m) for cells_set, m in cs]
-
-        configs = []
-        partial = [0] * n
-        # For pruning: per-constraint running tally of mines + remaining cells.
-        # constraint_pos[k] = next index in cs_idx[k][0] that we haven't decided yet
-        cs_count = len(cs_idx)
-        # Map: depth -> list of (constraint_idx, position in cs_idx[k][0])
-        # for efficient pruning. Build a per-depth list of constraints that include
-        # cell `depth`, so we update those at depth time.
-        cell_to_constraints = [[] for _ in range(n)]
-        for k, (idxs, _) in enumerate(cs_idx):
-            for i in idxs:
-                cell_to_constraints[i].append(k)
-        # Per-constraint state: used mines so far, remaining uncoverable cells.
-        used = [0] * cs_count
-        remaining = [len(idxs) for idxs, _ in cs_idx]
-        target = [m for _, m in cs_idx]
-
-        result_too_big = [False]
-
-        def backtrack(depth):
-            if result_too_big[0]:
-                return
-            if len(configs) > MAX_CONFIGS:
-                result_too_big[0] = True
-                return
-            if depth == n:
-                configs.append(tuple(partial))
-                return
-            for val in (0, 1):
-                # Apply
-                changed = []
-                ok = True
-                for k in cell_to_constraints[depth]:
-                    used[k] += val
-                    remaining[k] -= 1
-                    changed.append(k)
-                    if used[k] > target[k] or used[k] + remaining[k] < target[k]:
-                        ok = False
-                if ok:
-                    partial[depth] = val
-                    backtrack(depth + 1)
-                # Undo
-                for k in changed:
-                    used[k] -= val
-                    remaining[k] += 1
-            partial[depth] = 0
-
-        backtrack(0)
-        if result_too_big[0]:
+        try:
+            return _Counter(MAX_NODES).count(cs), cells
+        except _TooManyNodes:
             return None, cells
-        return configs, cells
 
     def _deduce(self):
         self._last_probs = {}
-        constraints = self._build_constraints()
-        if not constraints:
+        self._interior_prob = None
+        # (cells, buckets) per counted component, kept for guessing.
+        self._last_components = []
+        self._skipped = False
+        # A component none of whose constraints changed since the last pass
+        # keeps its counts; only the dirty ones are counted again.
+        dirty = self.index.take_dirty()
+        keys = list(self.index.constraints)
+        if not keys:
+            self._component_cache = {}
             return set(), set()
-        components = self._components(constraints)
+        constraints = [self.index.constraints[key] for key in keys]
+        cache = {}
+        for comp in self._components(constraints):
+            comp_keys = frozenset(keys[i] for i in comp)
+            cached = self._component_cache.get(comp_keys)
+            if cached is None or not comp_keys.isdisjoint(dirty):
+                cached = self._enumerate(comp, constraints)
+            cache[comp_keys] = cached
+            buckets, cells = cached
+            if buckets is None:
+                self._skipped = True
+            elif buckets:
+                self._last_components.append((cells, buckets))
+        self._component_cache = cache
+        return self._weigh_globally()
+
+    def _weigh_globally(self):
+        """Exact P(mine) for every hidden cell, given the mines left.
+
+        A configuration of component i with k_i mines can be completed in
+        C(interior, mines_left - sum(k_i)) ways, so each component's
+        buckets are weighted by the mine-count distribution of all the
+        other components, convolved together, times that binomial. All
+        sums are exact integers; only the final probabilities are floats.
+
+        Fills _last_probs (frontier cells) and _interior_prob (every other
+        hidden cell) and returns the cells that are certain: (mines, safes).
+        """
+        components = self._last_components
+        hidden = self.index.hidden
+        mines_left = self.index.mines_left()
+        # Cells of skipped components count as interior.
+        interior = len(hidden) - sum(len(cells) for cells, _ in components)
+        dists = [{k: n for k, (n, _) in buckets.items()} for _, buckets in components]
+
+        def convolve(a, b):
+            out = defaultdict(int)
+            for ka, na in a.items():
+                for kb, nb in b.items():
+                    if ka + kb <= mines_left:
+                        out[ka + kb] += na * nb
+            return out
+
+        def ways(free, mines):
+            return comb(free, mines) if 0 <= mines <= free else 0
+
+        prefix = [{0: 1}]
+        for dist in dists:
+            prefix.append(convolve(prefix[-1], dist))
+        suffix = [{0: 1}]
+        for dist in reversed(dists):
+            suffix.append(convolve(suffix[-1], dist))
+        suffix.reverse()
+
+        everything = prefix[-1]
+        total = sum(n * ways(interior, mines_left - k) for k, n in everything.items())
+        if total == 0:
+            # The flags contradict the mine count; weigh components alone.
+            self._weigh_locally()
+            return self._certain_cells()
+
         mines = set()
         safes = set()
-        for comp in components:
-            configs, cells = self._enumerate(comp, constraints)
-            if configs is None or not configs:
-                continue
-            n_configs = len(configs)
-            for i, cell in enumerate(cells):
-                mine_count = sum(c[i] for c in configs)
-                p = mine_count / n_configs
-                self._last_probs[cell] = p
-                if p == 0.0:
+        for i, (cells, buckets) in enumerate(components):
+            others = convolve(prefix[i], suffix[i + 1])
+            weight = {
+                k: sum(n * ways(interior, mines_left - k - ko) for ko, n in others.items())
+                for k in buckets
+            }
+            n_configs = sum(n for n, _ in buckets.values())
+            for cell in cells:
+                mine_weight = sum(counts.get(cell, 0) * weight[k] for k, (_, counts) in buckets.items())
+                self._last_probs[cell] = mine_weight / total
+                if self._skipped:
+                    # The weights lean on the skipped cells' approximation.
+                    mine_configs = sum(counts.get(cell, 0) for _, counts in buckets.values())
+                    if mine_configs == 0:
+                        safes.add(cell)
+                    elif mine_configs == n_configs:
+                        mines.add(cell)
+                elif mine_weight == 0:
                     safes.add(cell)
-                elif p == 1.0:
+                elif mine_weight == total:
                     mines.add(cell)
+        if interior:
+            interior_weight = sum(
+                n * ways(interior - 1, mines_left - k - 1) for k, n in everything.items()
+            )
+            self._interior_prob = interior_weight / total
+            # Skipped cells sit in the interior count without their
+            # constraints, so nothing about the interior is certain then.
+            if not self._skipped and interior_weight in (0, total):
+                known = {c for c in hidden if c not in self._last_probs}
+                (safes if interior_weight == 0 else mines).update(known)
+        return mines, safes
+
+    def _weigh_locally(self):
+        """P(mine) from each component's configurations alone, all counted equally."""
+        for cells, buckets in self._last_components:
+            n_configs = sum(n for n, _ in buckets.values())
+            for cell in cells:
+                mine_count = sum(counts.get(cell, 0) for _, counts in buckets.values())
+                self._last_probs[cell] = mine_count / n_configs
+
+    def _certain_cells(self):
+        mines = {c for c, p in self._last_probs.items() if p == 1.0}
+        safes = {c for c, p in self._last_probs.items() if p == 0.0}
         return mines, safes
 
     def _pick_guess(self):
-        hidden_cells = self._hidden_cells()
+        hidden_cells = self.index.hidden
         if not hidden_cells:
             return None
-        flagged = self._flagged_count()
-        mines_left = max(0, MINE_COUNT - flagged)
-        # Residual mines outside enumerated frontier are spread over interior cells.
-        interior = [c for c in hidden_cells if c not in self._last_probs]
-        if interior:
-            frontier_mines_est = sum(self._last_probs.values())
-            interior_mines = max(0.0, mines_left - frontier_mines_est)
-            base = interior_mines / len(interior)
-        else:
-            base = 1.0
-        best = (float("inf"), None)
-        for cell in hidden_cells:
-            p = self._last_probs.get(cell, base)
-            if p < best[0]:
-                best = (p, cell)
-        return best[1]
+        base = self._interior_prob
+        if base is None:
+            mines_left = self.index.mines_left()
+            # Residual mines outside enumerated frontier are spread over interior cells.
+            interior = [c for c in hidden_cells if c not in self._last_probs]
+            if interior:
+                frontier_mines_est = sum(self._last_probs.values())
+                interior_mines = max(0.0, mines_left - frontier_mines_est)
+                base = interior_mines / len(interior)
+            else:
+                base = 1.0
+        # Ties go to the first cell in row-major order.
+        return min(hidden_cells, key=lambda c: (self._last_probs.get(c, base), c[1], c[0]))
 
     def next_move(self):
         self._resolve_cell_state()
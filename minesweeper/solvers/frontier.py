@@ -0,0 +1,189 @@
+"""Incremental frontier / constraint index shared by the solvers.
+
+A constraint is a revealed numbered cell with hidden neighbours: the set
+of those hidden cells and how many of them are mines (the number minus
+the flagged neighbours). The index keeps every constraint, the hidden
+cells and the flag count up to date from the game's reveal / flag
+events, so a change to one cell only touches the constraints around it
+instead of rescanning the board.
+
+Constraints changed since a solver last looked are reported by
+take_dirty(). Each solver decides what to re-run for them.
+
+Games without subscribe() (custom harnesses) still work: the index then
+rebuilds itself from the grid whenever it is read."""
+from collections import defaultdict
+
+from minesweeper_with_solver import MINE_COUNT
+
+
+def _neighbors(x, y, w, h):
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            if dx == 0 and dy == 0:
+                continue
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < w and 0 <= ny < h:
+                yield nx, ny
+
+
+class FrontierIndex:
+    def __init__(self, game):
+        self.game = game
+        self.CellState = None
+        # (x, y) of a numbered cell -> [set of hidden neighbours, mines among them]
+        self.constraints = {}
+        # hidden cell -> numbered cells whose constraint contains it
+        self.owners = defaultdict(set)
+        self.hidden = set()
+        self.flagged = 0
+        self._dirty = set()
+        self._stale = True
+        subscribe = getattr(game, "subscribe", None)
+        self.polling = subscribe is None
+        if not self.polling:
+            subscribe(self._on_event)
+
+    # -- reading -------------------------------------------------------
+
+    def sync(self):
+        """Bring the index up to date; a no-op unless it has to rebuild."""
+        if self._stale or self.polling:
+            self._rebuild()
+
+    def mines_left(self):
+        # The board's count, not MINE_COUNT: place_mines() puts fewer mines
+        # down when the safe area leaves too little room.
+        board = getattr(self.game, "board", None)
+        total = board.mine_count if board is not None else MINE_COUNT
+        return max(0, total - self.flagged)
+
+    def constraint_list(self):
+        """(frozenset of hidden cells, mines) for every constraint."""
+        return [(frozenset(cells), m) for cells, m in self.constraints.values()]
+
+    def take_dirty(self):
+        """Numbered cells whose constraint changed since the last call.
+
+        Cells whose constraint has since disappeared are left out."""
+        dirty = {key for key in self._dirty if key in self.constraints}
+        self._dirty = set()
+        return dirty
+
+    def neighbours_of(self, key):
+        """Constraints sharing at least one cell with constraint ``key``."""
+        out = set()
+        for cell in self.constraints[key][0]:
+            out.update(self.owners[cell])
+        out.discard(key)
+        return out
+
+    # -- updating ------------------------------------------------------
+
+    def _on_event(self, event, x=None, y=None):
+        if event == "reset" or self._stale:
+            self._stale = True
+            return
+        if event == "reveal":
+            self._reveal(x, y)
+        elif event == "flag":
+            self._flag(x, y)
+        elif event == "unflag":
+            self._unflag(x, y)
+
+    def _rebuild(self):
+        grid = self.game.grid
+        if self.CellState is None:
+            self.CellState = type(grid[0][0].state)
+        self.constraints = {}
+        self.owners = defaultdict(set)
+        self.hidden = set()
+        self.flagged = 0
+        for y, row in enumerate(grid):
+            for x, cell in enumerate(row):
+                if cell.state == self.CellState.HIDDEN:
+                    self.hidden.add((x, y))
+                elif cell.state == self.CellState.FLAGGED:
+                    self.flagged += 1
+        for y, row in enumerate(grid):
+            for x, cell in enumerate(row):
+                if cell.state == self.CellState.REVEALED:
+                    self._add_constraint(x, y)
+        self._dirty = set(self.constraints)
+        self._stale = False
+
+    def _add_constraint(self, x, y):
+        cell = self.game.grid[y][x]
+        if cell.is_mine or cell.neighbor_mines <= 0:
+            return
+        hidden = set()
+        mines = cell.neighbor_mines
+        for nx, ny in _neighbors(x, y, self.game.GRID_WIDTH, self.game.GRID_HEIGHT):
+            state = self.game.grid[ny][nx].state
+            if state == self.CellState.HIDDEN:
+                hidden.add((nx, ny))
+            elif state == self.CellState.FLAGGED:
+                mines -= 1
+        if hidden:
+            self.constraints[(x, y)] = [hidden, mines]
+            for h in hidden:
+                self.owners[h].add((x, y))
+            self._dirty.add((x, y))
+
+    def _remove_from_constraints(self, cell, mine):
+        for key in self.owners.pop(cell, ()):
+            constraint = self.constraints[key]
+            constraint[0].discard(cell)
+            constraint[1] -= mine
+            if not constraint[0]:
+                del self.constraints[key]
+            self._dirty.add(key)
+
+    def _reveal(self, x, y):
+        self.hidden.discard((x, y))
+        self._remove_from_constraints((x, y), 0)
+        self._add_constraint(x, y)
+
+    def _flag(self, x, y):
+        self.hidden.discard((x, y))
+        self.flagged += 1
+        self._remove_from_constraints((x, y), 1)
+
+    def _unflag(self, x, y):
+        self.hidden.add((x, y))
+        self.flagged -= 1
+        w, h = self.game.GRID_WIDTH, self.game.GRID_HEIGHT
+        for nx, ny in _neighbors(x, y, w, h):
+            if self.game.grid[ny][nx].state != self.CellState.REVEALED:
+                continue
+            constraint = self.constraints.get((nx, ny))
+            if constraint is None:
+                self._add_constraint(nx, ny)
+            else:
+                constraint[0].add((x, y))
+                constraint[1] += 1
+                self.owners[(x, y)].add((nx, ny))
+                self._dirty.add((nx, ny))
+
+
+def pick_guess(index):
+    """Hidden cell with the lowest local mine fraction, or None.
+
+    A cell's estimate is the smallest remaining / hidden ratio over the
+    constraints it is in, capped at the global base probability; ties go
+    to the first cell in row-major order."""
+    if not index.hidden:
+        return None
+    base = index.mines_left() / len(index.hidden)
+    probs = {}
+    for cells, mines in index.constraints.values():
+        ratio = mines / len(cells)
+        for cell in cells:
+            if ratio < probs.get(cell, base):
+                probs[cell] = ratio
+    if probs:
+        cell, prob = min(probs.items(), key=lambda item: (item[1], item[0][1], item[0][0]))
+        if prob < base:
+            return cell
+    # Every hidden cell sits at the base probability.
+    return min(index.hidden, key=lambda cell: (cell[1], cell[0]))
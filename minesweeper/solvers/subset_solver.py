@@ -8,17 +8,7 @@ equals len(extras) they are all mines. Catches 1-2-1, 1-1, and many
 classic chained patterns single-cell deduction misses."""
 from collections import deque
 
-from minesweeper_with_solver import MINE_COUNT
-
-
-def _neighbors(x, y, w, h):
-    for dx in (-1, 0, 1):
-        for dy in (-1, 0, 1):
-            if dx == 0 and dy == 0:
-                continue
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < w and 0 <= ny < h:
-                yield nx, ny
+from solvers.frontier import FrontierIndex, pick_guess
 
 
 class Solver:
@@ -30,10 +20,13 @@ class Solver:
         # yet when load_solver runs Solver(game). Pulling CellState from
         # a live cell avoids the __main__-vs-imported double-Enum trap.
         self.CellState = None
+        self.index = FrontierIndex(game)
+        self._pending = set()
 
     def _resolve_cell_state(self):
         if self.CellState is None:
             self.CellState = type(self.game.grid[0][0].state)
+        self.index.sync()
 
     def _w(self):
         return self.game.GRID_WIDTH
@@ -44,45 +37,21 @@ class Solver:
     def _grid(self):
         return self.game.grid
 
-    def _hidden_cells(self):
-        w, h = self._w(), self._h()
-        g = self._grid()
-        return [
-            (x, y) for y in range(h) for x in range(w)
-            if g[y][x].state == self.CellState.HIDDEN
-        ]
-
-    def _flagged_count(self):
-        return sum(1 for row in self._grid() for c in row if c.state == self.CellState.FLAGGED)
-
     def _constraints(self):
         """List of (frozenset of hidden cells, remaining_mines) for every
         revealed numbered cell with at least one hidden neighbour."""
-        w, h = self._w(), self._h()
-        g = self._grid()
-        out = []
-        for y in range(h):
-            for x in range(w):
-                c = g[y][x]
-                if c.state != self.CellState.REVEALED or c.neighbor_mines <= 0:
-                    continue
-                hidden = []
-                flagged = 0
-                for nx, ny in _neighbors(x, y, w, h):
-                    n = g[ny][nx]
-                    if n.state == self.CellState.FLAGGED:
-                        flagged += 1
-                    elif n.state == self.CellState.HIDDEN:
-                        hidden.append((nx, ny))
-                if hidden:
-                    out.append((frozenset(hidden), c.neighbor_mines - flagged))
-        return out
+        return self.index.constraint_list()
 
     def _deduce(self):
-        constraints = self._constraints()
+        # Constraints changed since the last full (subset) pass. A pair of
+        # unchanged constraints was already compared and acted on.
+        self._pending |= self.index.take_dirty()
+        constraints = self.index.constraints
+        pending = [key for key in self._pending if key in constraints]
         mines = set()
         safes = set()
-        for hidden, remaining in constraints:
+        for key in pending:
+            hidden, remaining = constraints[key]
             if remaining == 0:
                 safes.update(hidden)
             elif remaining == len(hidden):
@@ -90,47 +59,25 @@ class Solver:
         if mines or safes:
             return mines, safes
         # Subset deduction: A ⊂ B → extras = B - A contain (mB - mA) mines.
-        for i, (hA, mA) in enumerate(constraints):
-            for j, (hB, mB) in enumerate(constraints):
-                if i == j or not hA < hB:
-                    continue
-                extra = hB - hA
-                em = mB - mA
-                if em == 0:
-                    safes.update(extra)
-                elif em == len(extra):
-                    mines.update(extra)
+        # Only constraints sharing a cell can be subsets of one another.
+        for a in pending:
+            hA, mA = constraints[a]
+            for b in self.index.neighbours_of(a):
+                hB, mB = constraints[b]
+                for (h1, m1), (h2, m2) in (((hA, mA), (hB, mB)), ((hB, mB), (hA, mA))):
+                    if not h1 < h2:
+                        continue
+                    extra = h2 - h1
+                    em = m2 - m1
+                    if em == 0:
+                        safes.update(extra)
+                    elif em == len(extra):
+                        mines.update(extra)
+        self._pending = set()
         return mines, safes
 
     def _pick_guess(self):
-        w, h = self._w(), self._h()
-        g = self._grid()
-        hidden_cells = self._hidden_cells()
-        if not hidden_cells:
-            return None
-        flagged = self._flagged_count()
-        base = max(0, MINE_COUNT - flagged) / len(hidden_cells)
-        best_prob = float("inf")
-        best_cell = None
-        for x, y in hidden_cells:
-            local_min = base
-            for nx, ny in _neighbors(x, y, w, h):
-                c = g[ny][nx]
-                if c.state == self.CellState.REVEALED and c.neighbor_mines > 0:
-                    hidden = 0
-                    flagged_nb = 0
-                    for nnx, nny in _neighbors(nx, ny, w, h):
-                        nn = g[nny][nnx]
-                        if nn.state == self.CellState.HIDDEN:
-                            hidden += 1
-                        elif nn.state == self.CellState.FLAGGED:
-                            flagged_nb += 1
-                    if hidden > 0:
-                        local_min = min(local_min, (c.neighbor_mines - flagged_nb) / hidden)
-            if local_min < best_prob:
-                best_prob = local_min
-                best_cell = (x, y)
-        return best_cell
+        return pick_guess(self.index)
 
     def next_move(self):
         self._resolve_cell_state()
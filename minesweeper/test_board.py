@@ -0,0 +1,187 @@
+# test_board.py
+import copy
+import pickle
+import random
+import unittest
+from types import SimpleNamespace
+
+from board import Board, CellState
+from solvers.frontier import FrontierIndex
+
+# 0 = safe, 1 = mine. The left half is open ground, so revealing (0, 0)
+# floods everything up to the numbers next to the mines.
+LAYOUT = [
+    [0, 0, 0, 0, 1],
+    [0, 0, 0, 0, 0],
+    [0, 0, 0, 1, 0],
+    [0, 0, 0, 0, 0],
+]
+
+
+class TestBoard(unittest.TestCase):
+    def test_first_click_is_safe(self):
+        for seed in range(50):
+            board = Board(9, 9, 10, rng=random.Random(seed))
+            x, y = seed % 9, seed // 9 % 9
+            revealed = board.reveal(x, y)
+            self.assertFalse(board.lost)
+            self.assertIn((x, y), revealed)
+            self.assertEqual(board.number(x, y), 0)
+            for nx, ny in board.neighbors(x, y):
+                self.assertFalse(board.is_mine(nx, ny))
+            self.assertEqual(board.mine_count, 10)
+
+    def test_place_mines_falls_back_to_fewer_mines(self):
+        board = Board(3, 3, 8, rng=random.Random(1))
+        board.reveal(1, 1)
+        self.assertEqual(board.mine_count, 0)
+        self.assertTrue(board.won)
+
+    def test_flood_reveal(self):
+        board = Board.from_mines(LAYOUT)
+        revealed = board.reveal(0, 0)
+        self.assertEqual(len(revealed), len(set(revealed)))
+        self.assertEqual(len(revealed), 14)
+        self.assertEqual(board.state(3, 1), CellState.REVEALED)
+        self.assertEqual(board.state(4, 1), CellState.HIDDEN)
+        self.assertEqual(board.hidden_count, 20 - 14)
+        self.assertEqual(board.safe_left, 4)
+        self.assertEqual(board.reveal(0, 0), [])
+
+    def test_revealing_a_mine_loses(self):
+        board = Board.from_mines(LAYOUT)
+        self.assertEqual(board.reveal(4, 0), [(4, 0)])
+        self.assertEqual(board.exploded, (4, 0))
+        self.assertTrue(board.lost)
+        self.assertFalse(board.won)
+
+    def test_chord(self):
+        board = Board.from_mines(LAYOUT)
+        board.reveal(0, 0)
+        # (3, 1) touches both mines; a chord needs both flags down.
+        self.assertEqual(board.chord(3, 1), [])
+        board.set_flag(4, 0)
+        self.assertEqual(board.chord(3, 1), [])
+        board.set_flag(3, 2)
+        self.assertEqual(sorted(board.chord(3, 1)), [(4, 1), (4, 2)])
+        self.assertEqual(board.chord(2, 2), [(3, 3)])
+        self.assertFalse(board.won)
+        board.reveal(4, 3)
+        self.assertTrue(board.won)
+
+    def test_running_counts_follow_set_state(self):
+        board = Board.from_mines(LAYOUT)
+        self.assertEqual((board.hidden_count, board.flagged_count, board.safe_left), (20, 0, 18))
+        self.assertTrue(board.set_flag(4, 0))
+        self.assertFalse(board.set_flag(4, 0))
+        self.assertTrue(board.toggle_flag(0, 0))
+        self.assertEqual((board.hidden_count, board.flagged_count, board.mines_left), (18, 2, 0))
+        board.set_state(0, 0, CellState.REVEALED)
+        self.assertEqual((board.hidden_count, board.flagged_count, board.safe_left), (18, 1, 17))
+        board.set_state(0, 0, CellState.HIDDEN)
+        board.set_state(4, 0, CellState.REVEALED)
+        self.assertEqual((board.hidden_count, board.flagged_count, board.safe_left), (19, 0, 18))
+        board.set_state(4, 0, CellState.HIDDEN)
+        cells = board.cell_grid()
+        cells[1][1].state = CellState.REVEALED
+        self.assertEqual((board.hidden_count, board.safe_left), (19, 17))
+        self.assertEqual(cells[2][3].is_mine, True)
+        self.assertEqual(cells[1][3].neighbor_mines, 2)
+
+    def test_reveal_mines_keeps_flags(self):
+        board = Board.from_mines(LAYOUT)
+        board.set_flag(4, 0)
+        self.assertEqual(board.reveal_mines(), [(3, 2)])
+        self.assertEqual(board.state(4, 0), CellState.FLAGGED)
+        self.assertEqual(board.hidden_count, 18)
+
+    def test_copy_and_pickle_round_trip(self):
+        board = Board(8, 8, 10, rng=random.Random(4))
+        board.reveal(3, 3)
+        board.set_flag(*next((x, y) for y in range(8) for x in range(8) if board.is_mine(x, y)))
+        for other in (board.copy(), pickle.loads(pickle.dumps(board)), copy.deepcopy(board)):
+            self.assertEqual(other.mines.tolist(), board.mines.tolist())
+            self.assertEqual(other.numbers.tolist(), board.numbers.tolist())
+            self.assertEqual(other.states.tolist(), board.states.tolist())
+            self.assertEqual(
+                (other.hidden_count, other.flagged_count, other.safe_left, other.mine_count),
+                (board.hidden_count, board.flagged_count, board.safe_left, board.mine_count),
+            )
+            # The copy shares no cells with the original.
+            x, y = next((x, y) for y in range(8) for x in range(8)
+                        if board.state(x, y) == CellState.HIDDEN and not board.is_mine(x, y))
+            other.reveal(x, y)
+            self.assertEqual(board.state(x, y), CellState.HIDDEN)
+
+
+class _SubscribedGame:
+    """The reveal / flag / unflag events of minesweeper_with_solver, without pygame."""
+
+    def __init__(self, board):
+        self.board = board
+        self.grid = board.cell_grid()
+        self.GRID_WIDTH, self.GRID_HEIGHT = board.width, board.height
+        self._listeners = []
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def _notify(self, event, x, y):
+        for listener in self._listeners:
+            listener(event, x, y)
+
+    def reveal(self, x, y):
+        for rx, ry in self.board.reveal(x, y):
+            self._notify("reveal", rx, ry)
+
+    def flag(self, x, y):
+        if self.board.set_flag(x, y, True):
+            self._notify("flag", x, y)
+
+    def unflag(self, x, y):
+        if self.board.set_flag(x, y, False):
+            self._notify("unflag", x, y)
+
+
+def _constraints(index):
+    return {key: (frozenset(cells), mines) for key, (cells, mines) in index.constraints.items()}
+
+
+class TestFrontierIndex(unittest.TestCase):
+    def test_events_keep_the_index_equal_to_a_rebuild(self):
+        game = _SubscribedGame(Board.from_mines(LAYOUT))
+        index = FrontierIndex(game)
+        self.assertFalse(index.polling)
+        index.sync()
+        index.take_dirty()
+        actions = [
+            (game.reveal, 0, 0), (game.flag, 4, 0), (game.flag, 4, 1),
+            (game.unflag, 4, 1), (game.reveal, 4, 1), (game.flag, 3, 2),
+            (game.unflag, 3, 2), (game.flag, 3, 2), (game.reveal, 4, 2),
+            (game.reveal, 3, 3), (game.reveal, 4, 3),
+        ]
+        for action, x, y in actions:
+            before = _constraints(index)
+            action(x, y)
+            after = _constraints(index)
+            rebuilt = FrontierIndex(SimpleNamespace(grid=game.grid, GRID_WIDTH=5, GRID_HEIGHT=4))
+            rebuilt.sync()
+            self.assertEqual(after, _constraints(rebuilt), (action.__name__, x, y))
+            self.assertEqual(index.hidden, rebuilt.hidden)
+            self.assertEqual(index.flagged, rebuilt.flagged)
+            touched = {key for key, value in after.items() if before.get(key) != value}
+            self.assertEqual(index.take_dirty(), touched, (action.__name__, x, y))
+        self.assertTrue(game.board.won)
+
+    def test_mines_left_uses_the_boards_mine_count(self):
+        board = Board(3, 3, 8, rng=random.Random(1))
+        board.reveal(1, 1)
+        game = SimpleNamespace(board=board, grid=board.cell_grid(),
+                               GRID_WIDTH=3, GRID_HEIGHT=3)
+        index = FrontierIndex(game)
+        index.sync()
+        self.assertEqual(index.mines_left(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
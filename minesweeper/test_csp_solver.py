@@ -0,0 +1,180 @@
+# test_csp_solver.py
+import itertools
+import random
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from board import Board, CellState
+from solvers import csp_solver
+from solvers.csp_solver import Solver, _Counter, _TooManyNodes
+
+A, B, C, D, E, F = [(x, 0) for x in range(6)]
+
+
+def brute_force_count(constraints):
+    """_Counter's buckets, by trying every assignment of the cells."""
+    cells = sorted({cell for cs, _ in constraints for cell in cs})
+    out = {}
+    for bits in itertools.product((0, 1), repeat=len(cells)):
+        mine = dict(zip(cells, bits))
+        if all(sum(mine[cell] for cell in cs) == m for cs, m in constraints):
+            n, counts = out.get(sum(bits), (0, {}))
+            for cell in cells:
+                if mine[cell]:
+                    counts[cell] = counts.get(cell, 0) + 1
+            out[sum(bits)] = (n + 1, counts)
+    return out
+
+
+def _plain(buckets):
+    return {k: (n, {cell: c for cell, c in counts.items() if c})
+            for k, (n, counts) in buckets.items()}
+
+
+class TestCounter(unittest.TestCase):
+    def assertCountsMatch(self, constraints):
+        self.assertEqual(_plain(_Counter().count(constraints)),
+                         brute_force_count(constraints), constraints)
+
+    def test_small_sets_match_brute_force(self):
+        # A chain, forced cells on both ends, and two independent pieces.
+        self.assertCountsMatch([((A, B), 1), ((B, C), 1), ((C, D), 1)])
+        self.assertCountsMatch([((A, B), 0), ((B, C, D), 2), ((D, E), 1), ((E, F), 2)])
+        self.assertCountsMatch([((A, B), 1), ((C, D, E), 2)])
+        self.assertCountsMatch([((A, B, C), 1), ((B, C, D), 2), ((C, D, E, F), 2)])
+
+    def test_random_sets_match_brute_force(self):
+        rng = random.Random(21)
+        cells = [(x, y) for x in range(4) for y in range(3)]
+        for _ in range(100):
+            mines = {cell for cell in cells if rng.random() < 0.4}
+            constraints = []
+            for _ in range(rng.randint(1, 8)):
+                cs = tuple(sorted(rng.sample(cells, rng.randint(1, 4))))
+                constraints.append((cs, sum(cell in mines for cell in cs)))
+            self.assertCountsMatch(constraints)
+
+    def test_contradiction_has_no_configurations(self):
+        self.assertEqual(_Counter().count([((A, B), 2), ((B, C), 0)]), {})
+        self.assertEqual(_Counter().count([((A, B), 1), ((B, C), 1), ((A, C), 1)]), {})
+
+    def test_memo_ignores_constraint_order(self):
+        constraints = [((A, B), 1), ((B, C), 1), ((C, D), 1)]
+        counter = _Counter()
+        first = counter.count(constraints)
+        nodes = counter.nodes
+        self.assertIs(counter.count(constraints[::-1]), first)
+        self.assertEqual(counter.nodes, nodes)
+
+    def test_too_many_nodes(self):
+        with self.assertRaises(_TooManyNodes):
+            _Counter(max_nodes=1).count([((A, B), 1), ((B, C), 1)])
+
+
+# Fixed 5x4 layouts (1 = mine) for the whole-board checks.
+LAYOUTS = [
+    [[0, 0, 0, 0, 1], [0, 0, 0, 0, 0], [0, 0, 0, 1, 0], [1, 0, 0, 0, 0]],
+    [[0, 0, 1, 0, 0], [0, 0, 0, 0, 1], [0, 0, 0, 0, 0], [1, 0, 0, 1, 0]],
+    [[0, 0, 0, 0, 0], [0, 0, 0, 0, 0], [1, 0, 1, 0, 1], [0, 1, 0, 0, 0]],
+    [[0, 0, 0, 1, 0], [1, 0, 0, 0, 0], [0, 0, 0, 0, 1], [0, 1, 0, 0, 0]],
+]
+
+# Positions (layout, cells revealed one by one) with one small component
+# and one that needs more than three search nodes.
+SKIPPED_POSITIONS = [
+    ([[0, 0, 1, 0, 0], [1, 0, 0, 0, 0], [0, 0, 1, 0, 0], [0, 0, 0, 1, 1]],
+     [(4, 1), (0, 0), (3, 0)]),
+    ([[1, 0, 0, 0, 0], [0, 0, 1, 0, 0], [0, 0, 1, 0, 1], [1, 0, 0, 0, 0]],
+     [(2, 0), (0, 1), (3, 3), (1, 0)]),
+]
+
+
+def _game(board):
+    return SimpleNamespace(board=board, grid=board.cell_grid(),
+                           GRID_WIDTH=board.width, GRID_HEIGHT=board.height)
+
+
+def brute_force_probabilities(board):
+    """P(mine) of every hidden cell, over every layout the revealed numbers allow."""
+    cells = [(x, y) for y in range(board.height) for x in range(board.width)]
+    hidden = [c for c in cells if board.state(*c) == CellState.HIDDEN]
+    flagged = {c for c in cells if board.state(*c) == CellState.FLAGGED}
+    numbered = [c for c in cells if board.state(*c) == CellState.REVEALED]
+    counts = dict.fromkeys(hidden, 0)
+    total = 0
+    for mines in itertools.combinations(hidden, board.mine_count - len(flagged)):
+        mines = set(mines) | flagged
+        if all(sum(n in mines for n in board.neighbors(*c)) == board.number(*c)
+               for c in numbered):
+            total += 1
+            for c in hidden:
+                counts[c] += c in mines
+    return {c: n / total for c, n in counts.items()}
+
+
+def _positions():
+    """Every position met while opening each layout's safe cells in row-major order."""
+    for layout in LAYOUTS:
+        board = Board.from_mines(layout)
+        for y in range(board.height):
+            for x in range(board.width):
+                if not board.is_mine(x, y) and board.reveal(x, y) and not board.won:
+                    yield board.copy()
+
+
+class TestSolverProbabilities(unittest.TestCase):
+    def _deduce(self, board):
+        solver = Solver(_game(board))
+        solver._resolve_cell_state()
+        mines, safes = solver._deduce()
+        probs = {c: solver._last_probs.get(c, solver._interior_prob)
+                 for c in solver.index.hidden}
+        return solver, probs, mines, safes
+
+    def test_probabilities_match_brute_force(self):
+        for board in _positions():
+            _, probs, mines, safes = self._deduce(board)
+            expected = brute_force_probabilities(board)
+            self.assertEqual(probs.keys(), expected.keys())
+            for cell, p in expected.items():
+                self.assertAlmostEqual(probs[cell], p, msg=cell)
+            self.assertEqual(mines, {c for c, p in expected.items() if p == 1})
+            self.assertEqual(safes, {c for c, p in expected.items() if p == 0})
+
+    def test_certainties_stay_right_with_skipped_components(self):
+        for layout, reveals in SKIPPED_POSITIONS:
+            board = Board.from_mines(layout)
+            for x, y in reveals:
+                board.reveal(x, y)
+            with mock.patch.object(csp_solver, 'MAX_NODES', 3):
+                solver, _, mines, safes = self._deduce(board)
+            self.assertTrue(solver._skipped)
+            self.assertTrue(mines and safes)
+            expected = brute_force_probabilities(board)
+            self.assertLessEqual(mines, {c for c, p in expected.items() if p == 1})
+            self.assertLessEqual(safes, {c for c, p in expected.items() if p == 0})
+
+    def test_flags_against_the_mine_count_weigh_components_alone(self):
+        board = Board.from_mines(LAYOUTS[0])
+        board.reveal(0, 0)
+        # The frontier needs all three mines; a wrong flag on the one
+        # interior cell leaves only two.
+        board.set_flag(4, 3)
+        with mock.patch.object(Solver, '_weigh_locally', autospec=True,
+                               side_effect=Solver._weigh_locally) as weigh_locally:
+            solver, _, mines, safes = self._deduce(board)
+        weigh_locally.assert_called_once()
+        self.assertEqual(solver.index.mines_left(), 2)
+        self.assertTrue(solver._last_components)
+        for cells, buckets in solver._last_components:
+            n_configs = sum(n for n, _ in buckets.values())
+            for cell in cells:
+                in_configs = sum(counts.get(cell, 0) for _, counts in buckets.values())
+                self.assertEqual(solver._last_probs[cell], in_configs / n_configs)
+        self.assertEqual(mines, {c for c, p in solver._last_probs.items() if p == 1})
+        self.assertEqual(safes, {c for c, p in solver._last_probs.items() if p == 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
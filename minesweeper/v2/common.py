@@ -1,13 +1,13 @@
 from os import environ
 environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
+import os
+import sys
 import pygame
-from enum import Enum
 from config import BLACK, BUTTON_COLOR, BUTTON_HOVER_COLOR, PAUSE_COLOR, WHITE
 
-class CellState(Enum):
-    HIDDEN = 0
-    REVEALED = 1
-    FLAGGED = 2
+# Cells live in the shared board model (../board.py).
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from board import Board, CellState, CellView  # noqa: E402,F401
 
 class Button:
     def __init__(self, x, y, text, height=30):
@@ -74,13 +74,13 @@ class InputBox:
         pygame.draw.rect(screen, self.color, self.rect, 2)
         screen.blit(self.txt_surface, (self.rect.x + 5, self.rect.y + 5))
 
-class Cell:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.is_mine = False
-        self.state = CellState.HIDDEN
-        self.neighbor_mines = 0
+class Cell(CellView):
+    def __init__(self, board, x, y):
+        super().__init__(board, x, y)
         self.was_clicked = False
-        self.is_flagged_in_game = False  # Add this line
-        self.number = 0
+        self.is_flagged_in_game = False
+        self.probability = 0
+
+    @property
+    def number(self):
+        return self.neighbor_mines
@@ -5,7 +5,7 @@ environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # Hide pygame support prompt
 import pygame
 import random
 from config import *
-from common import Cell,CellState, Button, InputBox
+from common import Board, Cell, CellState, Button, InputBox
 import sys
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -99,7 +99,8 @@ class Minesweeper:
         if self.filename:
             self.load_game_from_file(self.filename)
         else:
-            self.grid = [[Cell(x, y) for x in range(GRID_WIDTH)] for y in range(GRID_HEIGHT)]
+            self.board = Board(GRID_WIDTH, GRID_HEIGHT, MINE_COUNT)
+            self.grid = self.board.cell_grid(Cell)
             self.game_over = False
             self.victory = False
             self.mines_remaining = MINE_COUNT
@@ -201,65 +202,11 @@ class Minesweeper:
         self.game_over = True
 
     def place_mines(self, first_x, first_y):
-        safe_cells = [(first_x, first_y)]
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx, ny = first_x + dx, first_y + dy
-                if 0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT:
-                    safe_cells.append((nx, ny))
-        positions = [(x, y) for x in range(GRID_WIDTH) for y in range(GRID_HEIGHT) if (x, y) not in safe_cells]
-        mine_positions = random.sample(positions, MINE_COUNT)
-        for x, y in mine_positions:
-            self.grid[y][x].is_mine = True
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                if not self.grid[y][x].is_mine:
-                    count = sum(1 for dx in [-1, 0, 1] for dy in [-1, 0, 1] 
-                                if 0 <= x + dx < GRID_WIDTH and 0 <= y + dy < GRID_HEIGHT and self.grid[y + dy][x + dx].is_mine)
-                    self.grid[y][x].neighbor_mines = count
+        self.board.ensure_mines(first_x, first_y)
 
     def reveal_cell(self, x, y):
-        """Reveal a cell and calculate adjacent mines"""
-        cell = self.grid[y][x]
-        if cell.state != CellState.HIDDEN:
-            return
-            
-        # Set cell as revealed
-        cell.state = CellState.REVEALED
-        
-        # Calculate adjacent mines
-        adjacent_mines = 0
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                new_x, new_y = x + dx, y + dy
-                if (0 <= new_x < GRID_WIDTH and 
-                    0 <= new_y < GRID_HEIGHT and 
-                    self.grid[new_y][new_x].is_mine):
-                    adjacent_mines += 1
-        
-        # Set number of adjacent mines
-        cell.number = adjacent_mines
-        
-        # If no adjacent mines, reveal surrounding cells
-        if adjacent_mines == 0:
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
-                    new_x, new_y = x + dx, y + dy
-                    if (0 <= new_x < GRID_WIDTH and 
-                        0 <= new_y < GRID_HEIGHT and 
-                        self.grid[new_y][new_x].state == CellState.HIDDEN):
-                        self.reveal_cell(new_x, new_y)
-
-    def reveal_adjacent_cells(self, x, y):
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx, ny = x + dx, y + dy
-                if (dx != 0 or dy != 0) and (0 <= nx < GRID_WIDTH) and (0 <= ny < GRID_HEIGHT):
-                    self.reveal_cell(nx, ny)
+        """Reveal a cell, flooding out from cells with no adjacent mines"""
+        self.board.reveal(x, y)
 
     def handle_click(self, pos, right_click=False):
         if self.game_over or self.victory:
@@ -305,23 +252,14 @@ class Minesweeper:
             self.print_board()
 
     def reveal_all_mines(self):
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                if self.grid[y][x].is_mine:
-                    self.grid[y][x].state = CellState.REVEALED
+        self.board.reveal_mines()
 
     def check_victory(self) -> bool:
-        # Count various cell states
-        total_hidden = self.count_hidden()
-        total_mines = MINE_COUNT
-        total_flags = sum(1 for row in self.grid for cell in row if cell.state == CellState.FLAGGED)
-        
+        total_mines = self.board.mine_count
+        total_flags = self.board.flagged_count
+
         # Victory condition 1: All non-mine cells revealed
-        if total_hidden == total_mines:
-            for y in range(GRID_HEIGHT):
-                for x in range(GRID_WIDTH):
-                    if self.grid[y][x].state == CellState.HIDDEN and not self.grid[y][x].is_mine:
-                        return False
+        if self.board.won:
             self.handle_victory()
             return True
         
@@ -596,17 +534,16 @@ class Minesweeper:
         return (current_time - self.start_time - self.total_pause_time) // 1000
 
     def count_hidden(self) -> int:
-        return sum(
-            1 
-            for row in self.grid 
-            for cell in row 
-            if cell.state == CellState.HIDDEN
-        )
+        """
+        Count number of cells in HIDDEN state.
+        Returns:
+            int: Total number of hidden cells in the grid
+        """
+        return self.board.hidden_count
 
     def calculate_base_probability(self):
         """Calculate base probability for all unopened cells"""
-        unopened_cells = sum(1 for row in self.grid 
-                            for cell in row if cell.state == CellState.HIDDEN)
+        unopened_cells = self.board.hidden_count
         if unopened_cells == 0:
             return 0
         return self.mines_remaining / unopened_cells
@@ -733,11 +670,7 @@ class Minesweeper:
             x, y = clicked_pos
             self.grid[y][x].was_clicked = True
         
-        # Reveal all mines
-        for row in self.grid:
-            for cell in row:
-                if cell.is_mine:
-                    cell.state = CellState.REVEALED
+        self.reveal_all_mines()
 
         # Determine if victory or loss
         if self.victory:
@@ -746,8 +679,8 @@ class Minesweeper:
             result = "Clicked on mine"
 
         # Count total mines and hidden boxes
-        total_mines = sum(1 for row in self.grid for cell in row if cell.is_mine)
-        hidden_boxes = sum(1 for row in self.grid for cell in row if cell.state == CellState.HIDDEN)
+        total_mines = self.board.mine_count
+        hidden_boxes = self.board.hidden_count
 
         # Print game summary
         print(f"Game Over: {result}")
@@ -0,0 +1,97 @@
+"""Cached text rendering shared by the pygame front-ends.
+
+Looking up a system font and rasterizing a string are both slow. HUD
+labels, tile numbers and chess glyphs are drawn again every frame, yet
+almost none of them change from one frame to the next. This module keeps:
+
+* one ``pygame.font.Font`` per ``(face, size, bold)``, and
+* an LRU cache of rendered surfaces keyed by ``(text, font, color)``.
+
+So a string is rasterized once and then blitted from the cache. The
+cached surfaces are shared: blit them, but never draw on them or change
+their alpha. Call :func:`clear` after ``pygame.font.quit()``; fonts from
+before the quit can't be used again.
+
+The games run as scripts from their own folders, so they put the repository
+root on ``sys.path`` before importing this module.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+import pygame
+
+MAX_SURFACES = 1024
+
+Color = Union[Tuple[int, int, int], Tuple[int, int, int, int]]
+
+_fonts: Dict[Tuple[Optional[str], int, bool], pygame.font.Font] = {}
+_surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+# The 2048 frame writer and the server's /screenshot handlers render on
+# other threads. SDL_ttf is not thread-safe, so loading a font and
+# rasterizing text both happen under this lock, not just the cache updates.
+_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+
+def get_font(face: Optional[str], size: int, bold: bool = False) -> pygame.font.Font:
+    """The font for ``face`` at ``size``, loaded on first use.
+
+    ``face`` is a system font name (as for ``pygame.font.SysFont``), a path
+    to a font file, or ``None`` for pygame's default font.
+    """
+    key = (face, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        with _lock:
+            font = _fonts.get(key)
+            if font is None:
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                if face is not None and os.path.isfile(face):
+                    font = pygame.font.Font(face, size)
+                    font.set_bold(bold)
+                else:
+                    font = pygame.font.SysFont(face, size, bold=bold)
+                _fonts[key] = font
+    return font
+
+
+def render(text: str, font: pygame.font.Font, color: Color, antialias: bool = True) -> pygame.Surface:
+    """``font.render(text, antialias, color)``, served from the LRU cache."""
+    global _hits, _misses
+    key = (text, font, tuple(color), antialias)
+    with _lock:
+        surface = _surfaces.get(key)
+        if surface is not None:
+            _surfaces.move_to_end(key)
+            _hits += 1
+            return surface
+        surface = font.render(text, antialias, color)
+        _misses += 1
+        _surfaces[key] = surface
+        if len(_surfaces) > MAX_SURFACES:
+            _surfaces.popitem(last=False)
+    return surface
+
+
+def render_text(text, size: int, color: Color, face: Optional[str] = None,
+                bold: bool = False) -> pygame.Surface:
+    """Render ``str(text)`` with the cached font for ``(face, size, bold)``."""
+    return render(str(text), get_font(face, size, bold), color)
+
+
+def cache_info() -> Dict[str, int]:
+    return {"fonts": len(_fonts), "surfaces": len(_surfaces), "hits": _hits, "misses": _misses}
+
+
+def clear() -> None:
+    """Drop every cached font and surface."""
+    global _hits, _misses
+    with _lock:
+        _fonts.clear()
+        _surfaces.clear()
+        _hits = 0
+        _misses = 0